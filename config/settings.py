@@ -1,8 +1,12 @@
 """
 EchoLens Configuration Settings
+
+Works without Streamlit: secrets are only consulted when the process has
+already imported streamlit (i.e. runs the app), so CLIs and workers don't
+pay for importing the UI stack.
 """
 import os
-import streamlit as st
+import sys
 from dotenv import load_dotenv
 
 # Load environment variables for local development
@@ -10,23 +14,47 @@ load_dotenv()
 
 # Function to get config values from either environment or Streamlit secrets
 def get_config(key, default=None):
-    try:
-        # Try Streamlit secrets first (for deployed app)
-        return st.secrets[key]
-    except:
-        # Fall back to environment variables (for local development)
-        return os.getenv(key, default)
+    st = sys.modules.get('streamlit')
+    if st is not None:
+        try:
+            # Try Streamlit secrets first (for deployed app)
+            return st.secrets[key]
+        except Exception:
+            pass
+    # Fall back to environment variables (for local development, CLIs and workers)
+    return os.getenv(key, default)
 
 # OpenAI Configuration
 OPENAI_API_KEY = get_config('OPENAI_API_KEY')
+OPENAI_BASE_URL = get_config('OPENAI_BASE_URL') # OpenAI-compatible endpoint (proxies, local mocks); None for api.openai.com
 EMBEDDING_MODEL = get_config('EMBEDDING_MODEL', 'text-embedding-3-small')
 GPT_MODEL = get_config('GPT_MODEL', 'gpt-4')
 MAX_TOKENS = int(get_config('MAX_TOKENS', 4000))
+# Concurrent single-text embedding requests within this window share one API call (0 disables)
+EMBEDDING_BATCH_WINDOW_MS = float(get_config('EMBEDDING_BATCH_WINDOW_MS', 10))
+EMBEDDING_MAX_BATCH_SIZE = int(get_config('EMBEDDING_MAX_BATCH_SIZE', 64))
+# Embedding cache keys: case-fold texts, and reuse embeddings of texts within this SimHash distance.
+# Reuse returns a different text's embedding, so it is opt-in (0 disables; e.g. 3-6 to enable)
+EMBEDDING_LOWERCASE_KEYS = get_config('EMBEDDING_LOWERCASE_KEYS', 'False').lower() == 'true'
+EMBEDDING_NEAR_DUPLICATE_DISTANCE = int(get_config('EMBEDDING_NEAR_DUPLICATE_DISTANCE', 0))
+# TF-IDF scorer backend: "vocabulary" (fitted vocabulary) or "hashing" (no vocabulary; for large, growing corpora)
+TFIDF_MODE = get_config('TFIDF_MODE', 'vocabulary')
 
 # App Configuration
 DEBUG = get_config('DEBUG', 'False').lower() == 'true'
 LOG_LEVEL = get_config('LOG_LEVEL', 'INFO')
 
+# HTTP Service Configuration
+SERVICE_HOST = get_config('SERVICE_HOST', '127.0.0.1')
+SERVICE_PORT = int(get_config('SERVICE_PORT', 8080))
+SERVICE_WORKERS = int(get_config('SERVICE_WORKERS', 4))
+SERVICE_QUEUE_SIZE = int(get_config('SERVICE_QUEUE_SIZE', 64))
+
+# Metrics endpoint for the Streamlit app (Prometheus text at /metrics; 0 disables it).
+# The HTTP service always serves /metrics on its own port.
+METRICS_HOST = get_config('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(get_config('METRICS_PORT', 0))
+
 # Paths
 DATA_DIR = 'data'
 DIALECTS_DIR = os.path.join(DATA_DIR, 'dialects')
@@ -0,0 +1,87 @@
+"""
+Import-time budget check for EchoLens entry points
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter for
+each entry point, takes the best of several runs, and fails if a module
+exceeds its budget or loads a heavy dependency it should defer.
+
+Usage:
+    python scripts/check_import_time.py [--repeat 3] [--scale 1.0]
+"""
+import os
+import re
+import sys
+import argparse
+import subprocess
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ('streamlit', 'openai', 'tenacity', 'sklearn', 'pandas')
+
+# module -> (budget in ms, heavy modules that must not be imported)
+BUDGETS = {
+    'config.settings': (100, HEAVY_MODULES),
+    'src.analyzer': (50, HEAVY_MODULES),
+    'src.analyzer.pattern_analyzer': (400, HEAVY_MODULES),
+}
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module):
+    """Cumulative import time (ms) of `module` and the set of modules it imported"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=project_root, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+
+    cumulative_us = None
+    imported = set()
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        imported.add(name)
+        if name == module:
+            cumulative_us = int(match.group(2))
+    if cumulative_us is None:
+        raise RuntimeError(f"No importtime entry for {module} (already imported by site?)")
+    return cumulative_us / 1000, imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3, help="runs per module; the fastest counts")
+    parser.add_argument('--scale', type=float, default=1.0, help="multiply every budget (slow CI machines)")
+    args = parser.parse_args()
+
+    print("⏱️  Checking import-time budgets...")
+    failures = []
+    for module, (budget_ms, forbidden) in BUDGETS.items():
+        runs = [measure(module) for _ in range(max(1, args.repeat))]
+        best_ms = min(ms for ms, _ in runs)
+        imported = set().union(*(names for _, names in runs))
+        leaked = sorted(name for name in forbidden if name in imported)
+        limit_ms = budget_ms * args.scale
+
+        ok = best_ms <= limit_ms and not leaked
+        print(f"  {'✅' if ok else '❌'} {module}: {best_ms:.1f} ms (budget {limit_ms:.0f} ms)")
+        if best_ms > limit_ms:
+            failures.append(f"{module} took {best_ms:.1f} ms > {limit_ms:.0f} ms")
+        if leaked:
+            print(f"     imports heavy dependencies: {', '.join(leaked)}")
+            failures.append(f"{module} imports {', '.join(leaked)}")
+
+    if failures:
+        print("❌ Import-time budget exceeded:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("✅ All entry points within budget!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+"""
+Load test for EchoLens
+
+Drives N concurrent simulated sessions through PatternAnalyzer.analyze_text
+(or the HTTP service) against a local mock embedding server with
+configurable latency and error injection, then reports throughput, latency
+percentiles, cache hit rates and fallback rates.
+
+Everything runs in a temporary working directory holding a copy of the
+dialect samples, so the mock's vectors never reach the real caches.
+
+Usage:
+    python scripts/load_test.py [--sessions 16] [--requests 20] [--target analyzer|service]
+                                [--api-latency-ms 150] [--error-rate 0.05] [--json results.json]
+    python scripts/load_test.py --url http://127.0.0.1:8080 --sessions 32   # an already running service
+"""
+import os
+import re
+import sys
+import json
+import time
+import base64
+import random
+import shutil
+import asyncio
+import logging
+import argparse
+import tempfile
+import threading
+import http.client
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from config.settings import (
+    SAMPLES_DIR, MAX_TEXT_LENGTH, EMBEDDING_BATCH_WINDOW_MS, EMBEDDING_MAX_BATCH_SIZE,
+    EMBEDDING_NEAR_DUPLICATE_DISTANCE
+)
+from src.analyzer.fake_embeddings import FAKE_EMBEDDING_DIM, FakeEmbeddingsClient
+
+
+class MockEmbeddingServer:
+    """
+    Local OpenAI-compatible embeddings endpoint (POST /v1/embeddings)
+
+    Each request sleeps for a normally distributed latency and fails with
+    `error_status` at `error_rate`. Vectors come from the shared
+    FakeEmbeddingsClient, so they are deterministic and similar texts embed similarly.
+    """
+
+    def __init__(self, latency_ms: float = 150.0, jitter_ms: float = 30.0, error_rate: float = 0.0,
+                 error_status: int = 500, dim: int = FAKE_EMBEDDING_DIM, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.embedder = FakeEmbeddingsClient(dim)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = Counter()
+
+    def handle(self, payload: Dict[str, Any]):
+        """(status, response body) for one embeddings request, after the simulated latency"""
+        with self._lock:
+            delay = max(0.0, self._rng.gauss(self.latency_ms, self.jitter_ms)) / 1000
+            fail = self._rng.random() < self.error_rate
+        time.sleep(delay)
+
+        texts = payload.get('input') or []
+        if isinstance(texts, str):
+            texts = [texts]
+        with self._lock:
+            self.stats['requests'] += 1
+            if fail:
+                self.stats['injected_errors'] += 1
+            else:
+                self.stats['inputs'] += len(texts)
+                self.stats['max_batch'] = max(self.stats['max_batch'], len(texts))
+        if fail:
+            return self.error_status, {'error': {'message': "Injected failure", 'type': 'server_error'}}
+
+        data = []
+        for index, text in enumerate(texts):
+            vector = self.embedder.embed(text)
+            if payload.get('encoding_format') == 'base64':
+                embedding: Any = base64.b64encode(np.asarray(vector, dtype='<f4').tobytes()).decode('ascii')
+            else:
+                embedding = vector
+            data.append({'object': 'embedding', 'index': index, 'embedding': embedding})
+        tokens = sum(len(text.split()) for text in texts)
+        return 200, {'object': 'list', 'data': data, 'model': payload.get('model'),
+                     'usage': {'prompt_tokens': tokens, 'total_tokens': tokens}}
+
+    def start(self) -> str:
+        """Serve on an ephemeral port in a background thread; returns the base URL for the OpenAI client"""
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if self.path.rstrip('/') != '/v1/embeddings':
+                    status, response = 404, {'error': {'message': f"Unknown path {self.path}"}}
+                else:
+                    status, response = mock.handle(json.loads(body or b'{}'))
+                encoded = json.dumps(response).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="mock-embeddings", daemon=True).start()
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+# Simulated traffic
+
+def make_session_texts(sessions: int, requests: int, repeat_ratio: float, seed: int = 0) -> List[List[str]]:
+    """
+    Texts each session sends, built from sentences of the dialect samples
+
+    A `repeat_ratio` share of requests resend a text some session already
+    sent (re-submissions, shared snippets), which is what the caches serve.
+    """
+    from src.dialects.loader import load_dialect_exemplars
+    sentences = [
+        sentence.strip()
+        for passages in load_dialect_exemplars().values() for passage in passages
+        for sentence in re.split(r'(?<=[.!?])\s+', passage) if len(sentence.split()) >= 4
+    ]
+    if not sentences:
+        raise RuntimeError(f"No dialect samples found in {os.path.abspath(SAMPLES_DIR)}")
+
+    rng = random.Random(seed)
+    sent: List[str] = []
+    schedule = []
+    for _ in range(sessions):
+        texts = []
+        for _ in range(requests):
+            if sent and rng.random() < repeat_ratio:
+                texts.append(rng.choice(sent))
+            else:
+                text = " ".join(rng.choice(sentences) for _ in range(rng.randint(3, 8)))[:MAX_TEXT_LENGTH]
+                sent.append(text)
+                texts.append(text)
+        schedule.append(texts)
+    return schedule
+
+
+class AnalyzerTarget:
+    """Calls PatternAnalyzer.analyze_text in-process"""
+
+    def __init__(self, analyzer, method: Optional[str] = None):
+        self.analyzer = analyzer
+        self.method = method
+
+    def __call__(self, text: str) -> Dict[str, Any]:
+        from src.analyzer.timing import StageTimer
+        timer = StageTimer()
+        _, method_used = self.analyzer.analyze_text(text, method=self.method, timer=timer)
+        return {'status': 'ok', 'method_used': method_used, 'cache_hits': timer.cache_hits}
+
+
+class ServiceTarget:
+    """POSTs to a service's /analyze over one keep-alive connection per session thread"""
+
+    def __init__(self, url: str, method: Optional[str] = None, timeout: float = 120.0):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.method = method
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def __call__(self, text: str) -> Dict[str, Any]:
+        payload = {'text': text, 'timings': True}
+        if self.method:
+            payload['method'] = self.method
+        body = json.dumps(payload).encode()
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection(self.host, self.port,
+                                                                            timeout=self.timeout)
+        try:
+            connection.request('POST', '/analyze', body=body, headers={'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            data = json.loads(response.read() or b'{}')
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            connection.close()
+            self._local.connection = None
+            return {'status': 'error', 'error': type(e).__name__}
+        if response.status == 429:
+            return {'status': 'rejected'}
+        if response.status != 200:
+            return {'status': 'error', 'error': f"HTTP {response.status}"}
+        return {'status': 'ok', 'method_used': data.get('method_used'),
+                'cache_hits': (data.get('timings') or {}).get('cache_hits', {})}
+
+
+class InProcessService:
+    """AnalysisService on an ephemeral port, with its event loop on a background thread"""
+
+    def __init__(self, analyzer, workers: int, queue_size: int):
+        from src.service.server import AnalysisService
+        self.service = AnalysisService(analyzer, workers=workers, queue_size=queue_size)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="echolens-service-loop", daemon=True)
+
+    def start(self) -> str:
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self.service.start('127.0.0.1', 0), self.loop).result()
+        return f"http://127.0.0.1:{self.service.port}"
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.service.shutdown(grace=10), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+
+def run_sessions(target, schedule: List[List[str]], think_ms: float = 0.0) -> Dict[str, Any]:
+    """Run one thread per session, each sending its texts back to back (plus think time)"""
+    samples: List[Dict[str, Any]] = []
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(len(schedule))
+
+    def session(texts: List[str]):
+        start_barrier.wait()
+        for text in texts:
+            started = time.perf_counter()
+            try:
+                outcome = target(text)
+            except Exception as e:
+                outcome = {'status': 'error', 'error': type(e).__name__}
+            outcome['latency_ms'] = (time.perf_counter() - started) * 1000
+            with lock:
+                samples.append(outcome)
+            if think_ms:
+                time.sleep(think_ms / 1000)
+
+    threads = [threading.Thread(target=session, args=(texts,), name=f"session-{i}")
+               for i, texts in enumerate(schedule)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {'duration_s': time.perf_counter() - started, 'samples': samples}
+
+
+def summarize(run: Dict[str, Any], expected_method: str) -> Dict[str, Any]:
+    """Throughput, latency percentiles, cache hit and fallback rates of a run"""
+    samples = run['samples']
+    statuses = Counter(sample['status'] for sample in samples)
+    ok = [sample for sample in samples if sample['status'] == 'ok']
+    latencies = np.array([sample['latency_ms'] for sample in ok]) if ok else np.zeros(1)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+
+    cache = {}
+    for name in sorted({name for sample in ok for name in sample.get('cache_hits', {})}):
+        recorded = [sample['cache_hits'][name] for sample in ok if name in sample.get('cache_hits', {})]
+        cache[name] = {'hits': sum(recorded), 'lookups': len(recorded), 'hit_rate': sum(recorded) / len(recorded)}
+
+    methods = Counter(sample['method_used'] for sample in ok)
+    fallbacks = sum(count for method, count in methods.items() if method != expected_method)
+    return {
+        'requests': len(samples),
+        'statuses': dict(statuses),
+        'duration_s': run['duration_s'],
+        'throughput_rps': len(ok) / run['duration_s'] if run['duration_s'] else 0.0,
+        'latency_ms': {'p50': p50, 'p95': p95, 'p99': p99, 'max': float(latencies.max()),
+                       'mean': float(latencies.mean())},
+        'cache': cache,
+        'methods': dict(methods),
+        'fallback_rate': fallbacks / len(ok) if ok else 0.0,
+    }
+
+
+def print_report(summary: Dict[str, Any], api_stats: Optional[Dict[str, int]], label: str):
+    statuses = summary['statuses']
+    latency = summary['latency_ms']
+    print(f"\n📊 Load test results ({label})")
+    print(f"  Requests:    {summary['requests']} (ok {statuses.get('ok', 0)}, "
+          f"rejected {statuses.get('rejected', 0)}, errors {statuses.get('error', 0)})")
+    print(f"  Duration:    {summary['duration_s']:.2f} s")
+    print(f"  Throughput:  {summary['throughput_rps']:.1f} analyses/s")
+    print(f"  Latency:     p50 {latency['p50']:.1f} ms | p95 {latency['p95']:.1f} ms | "
+          f"p99 {latency['p99']:.1f} ms | max {latency['max']:.1f} ms")
+    for name, cache in summary['cache'].items():
+        print(f"  Cache:       {name} {cache['hit_rate']:.1%} ({cache['hits']}/{cache['lookups']})")
+    methods = ", ".join(f"{method} {count}" for method, count in sorted(summary['methods'].items()))
+    print(f"  Fallbacks:   {summary['fallback_rate']:.1%} (methods: {methods or 'none'})")
+    if api_stats is not None:
+        print(f"  Mock API:    {api_stats.get('requests', 0)} calls, {api_stats.get('inputs', 0)} texts embedded "
+              f"(largest batch {api_stats.get('max_batch', 0)}), {api_stats.get('injected_errors', 0)} injected errors")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test EchoLens with concurrent simulated sessions")
+    parser.add_argument('--sessions', type=int, default=16, help="concurrent simulated sessions")
+    parser.add_argument('--requests', type=int, default=20, help="analyses per session")
+    parser.add_argument('--repeat-ratio', type=float, default=0.3, help="share of requests resending a seen text")
+    parser.add_argument('--think-ms', type=float, default=0.0, help="pause between a session's requests")
+    parser.add_argument('--target', choices=('analyzer', 'service'), default='analyzer',
+                        help="call PatternAnalyzer.analyze_text directly, or go through the HTTP service")
+    parser.add_argument('--url', default=None, help="load an already running service instead (implies --target service)")
+    parser.add_argument('--method', default=None, help="analysis method to request (default: embeddings)")
+    parser.add_argument('--api-latency-ms', type=float, default=150.0, help="mock embedding API latency (mean)")
+    parser.add_argument('--api-jitter-ms', type=float, default=30.0, help="mock embedding API latency (std dev)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="share of mock API calls that fail")
+    parser.add_argument('--error-status', type=int, default=500, help="HTTP status of injected failures (e.g. 429)")
+    parser.add_argument('--batch-window-ms', type=float, default=EMBEDDING_BATCH_WINDOW_MS,
+                        help="embedding micro-batch window (0 disables)")
+    parser.add_argument('--service-workers', type=int, default=4, help="workers of the in-process service")
+    parser.add_argument('--queue-size', type=int, default=64, help="queue size of the in-process service")
+    parser.add_argument('--cold', action='store_true', help="skip the warm-up that embeds the dialect profiles")
+    parser.add_argument('--seed', type=int, default=0, help="seed for texts, latencies and failures")
+    parser.add_argument('--json', default=None, help="also write the results to this JSON file")
+    parser.add_argument('--verbose', action='store_true', help="show analyzer logs (noisy under error injection)")
+    args = parser.parse_args()
+
+    # Before importing the analyzer, whose module configures INFO logging
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL)
+    json_path = os.path.abspath(args.json) if args.json else None
+    samples_dir = os.path.join(project_root, SAMPLES_DIR)
+    expected_method = args.method or 'embeddings'
+
+    print(f"🚦 Load testing EchoLens: {args.sessions} sessions x {args.requests} analyses")
+    with tempfile.TemporaryDirectory(prefix='echolens-load-') as workdir:
+        shutil.copytree(samples_dir, os.path.join(workdir, SAMPLES_DIR))
+        os.chdir(workdir)
+        schedule = make_session_texts(args.sessions, args.requests, args.repeat_ratio, args.seed)
+
+        mock = service = None
+        try:
+            if args.url:
+                target, label = ServiceTarget(args.url, args.method), f"service at {args.url}"
+            else:
+                from src.analyzer.embeddings import create_embeddings_manager
+                from src.analyzer.pattern_analyzer import PatternAnalyzer
+                from src.analyzer.result_cache import ResultCache
+
+                mock = MockEmbeddingServer(args.api_latency_ms, args.api_jitter_ms, args.error_rate,
+                                           args.error_status, seed=args.seed)
+                base_url = mock.start()
+                print(f"🧪 Mock embedding API at {base_url} ({args.api_latency_ms:.0f}±{args.api_jitter_ms:.0f} ms, "
+                      f"{args.error_rate:.0%} errors)")
+                embeddings_manager = create_embeddings_manager(
+                    "load-test", base_url=base_url, batch_window_ms=args.batch_window_ms,
+                    max_batch_size=EMBEDDING_MAX_BATCH_SIZE, near_duplicate_distance=EMBEDDING_NEAR_DUPLICATE_DISTANCE
+                )
+                if not embeddings_manager:
+                    print("❌ Could not create the embeddings manager (is the openai package installed?)")
+                    sys.exit(1)
+                analyzer = PatternAnalyzer(embeddings_manager, result_cache=ResultCache())
+                if not args.cold:
+                    print("🔥 Warming up dialect profiles...")
+                    analyzer.analyze_text(" ".join(schedule[0][0].split()[:40]) + " warm-up", method=args.method)
+                    mock.reset_stats()
+
+                if args.target == 'service':
+                    service = InProcessService(analyzer, args.service_workers, args.queue_size)
+                    url = service.start()
+                    target, label = ServiceTarget(url, args.method), f"{args.service_workers}-worker service"
+                else:
+                    target, label = AnalyzerTarget(analyzer, args.method), "PatternAnalyzer.analyze_text"
+
+            print("⏱️  Running sessions...")
+            run = run_sessions(target, schedule, args.think_ms)
+            api_stats = dict(mock.stats) if mock else None
+        finally:
+            os.chdir(project_root)
+            if service:
+                service.stop()
+            if mock:
+                mock.stop()
+
+    summary = summarize(run, expected_method)
+    label = f"{args.sessions} sessions, {label}"
+    print_report(summary, api_stats, label)
+    if json_path:
+        with open(json_path, 'w') as f:
+            json.dump({'config': vars(args), 'summary': summary, 'mock_api': api_stats}, f, indent=2, default=float)
+        print(f"💾 Results written to {json_path}")
+
+
+if __name__ == "__main__":
+    main()
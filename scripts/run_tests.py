@@ -1,18 +1,58 @@
 """
-Simple test runner for EchoLens
+Test runner for EchoLens
+
+Runs the pytest suite under tests/ (including the hot-path benchmarks, which
+also check their results against reference implementations), writes benchmark
+results as JSON for comparison between commits, and checks the import-time
+budgets of the entry points (scripts/check_import_time.py).
+
+Usage:
+    python scripts/run_tests.py [--full] [--output bench_results.json] [--compare BASELINE.json]
+                                [--skip-import-time]
 """
 import os
 import sys
+import json
+import argparse
+import subprocess
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
 
 def main():
+    parser = argparse.ArgumentParser(description="Run the EchoLens test and benchmark suite")
+    parser.add_argument('--full', action='store_true', help="full benchmark grid (up to 10k dialects)")
+    parser.add_argument('--output', default='bench_results.json', help="benchmark results JSON")
+    parser.add_argument('--compare', default=None, help="baseline benchmark results to compare against")
+    parser.add_argument('--threshold', type=float, default=1.25, help="slowdown ratio counted as a regression")
+    parser.add_argument('--skip-import-time', action='store_true', help="don't check import-time budgets")
+    args = parser.parse_args()
+
     print("🧪 Running EchoLens tests...")
-    
-    # Add src to path
-    sys.path.insert(0, 'src')
-    
-    # TODO: Implement basic tests
-    print("⏳ Tests will be implemented as modules are built")
-    print("✅ Test setup complete!")
+    output = os.path.abspath(args.output)
+    command = [sys.executable, '-m', 'pytest', 'tests', '-q', '--bench-json', output]
+    if args.full:
+        command.append('--bench-full')
+    result = subprocess.run(command, cwd=project_root)
+    if result.returncode != 0:
+        print("❌ Tests failed")
+        sys.exit(result.returncode)
+    print(f"✅ All tests passed! Benchmark results: {output}")
+
+    if not args.skip_import_time:
+        result = subprocess.run([sys.executable, os.path.join(project_root, 'scripts', 'check_import_time.py')],
+                                cwd=project_root)
+        if result.returncode != 0:
+            sys.exit(result.returncode)
+
+    if args.compare:
+        from tests.benchmarks.harness import print_comparison
+        with open(output) as f:
+            current = json.load(f)
+        regressions = print_comparison(args.compare, current, args.threshold)
+        if regressions:
+            print(f"❌ {regressions} benchmarks slowed down by more than {args.threshold:.2f}x")
+            sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -1,15 +1,46 @@
-"""
-EchoLens Analyzer Module
-Core analysis functionality for linguistic pattern detection
-"""
-
-from .embeddings import EmbeddingsManager, create_embeddings_manager, simple_word_similarity
-from .pattern_analyzer import PatternAnalyzer, analyze_text_patterns
-
-__all__ = [
-    'EmbeddingsManager',
-    'create_embeddings_manager', 
-    'simple_word_similarity',
-    'PatternAnalyzer',
-    'analyze_text_patterns'
-]
+"""
+EchoLens Analyzer Module
+Core analysis functionality for linguistic pattern detection
+
+Exports are resolved on first access (PEP 562), so importing the package
+doesn't pull in submodules or their heavy dependencies until they are used.
+"""
+
+import importlib
+
+# Public name -> defining submodule
+_EXPORTS = {
+    'EmbeddingsManager': '.embeddings',
+    'create_embeddings_manager': '.embeddings',
+    'simple_word_similarity': '.embeddings',
+    'EmbeddingMicroBatcher': '.embedding_batcher',
+    'METRICS': '.metrics',
+    'MetricsRegistry': '.metrics',
+    'start_metrics_server': '.metrics',
+    'PatternAnalyzer': '.pattern_analyzer',
+    'analyze_text_patterns': '.pattern_analyzer',
+    'IncrementalAnalyzer': '.incremental',
+    'CascadePlanner': '.cascade',
+    'register_scorer': '.scorers',
+    'SCORER_REGISTRY': '.scorers',
+    'VectorIndex': '.vector_index',
+    'BruteForceIndex': '.vector_index',
+    'IVFIndex': '.vector_index',
+    'create_vector_index': '.vector_index',
+    'load_vector_index': '.vector_index',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,134 @@
+"""
+EchoLens Batch Module
+Streaming multi-document analysis with bounded memory and incremental CSV/Parquet output
+"""
+
+import io
+import os
+import csv
+import logging
+from itertools import islice
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Tuple
+from .pattern_analyzer import PatternAnalyzer
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = ('.txt', '.md', '.csv')
+RESULT_COLUMNS = ['document', 'method', 'top_dialect', 'top_score']
+_TEXT_COLUMNS = frozenset(RESULT_COLUMNS[:3])
+
+
+def iter_documents(name: str, stream: BinaryIO, csv_column: str = 'text') -> Iterator[Tuple[str, str]]:
+    """
+    Yield (document id, text) pairs from one uploaded file
+
+    .txt/.md files are a single document. CSV files yield one document per
+    row, read incrementally from `stream`, so large files are never held in
+    memory as a whole.
+    """
+    extension = os.path.splitext(name)[1].lower()
+    if extension not in SUPPORTED_EXTENSIONS:
+        raise ValueError(f"Unsupported file type '{extension}' for {name}")
+
+    if extension != '.csv':
+        yield name, stream.read().decode('utf-8', errors='replace')
+        return
+
+    text_stream = io.TextIOWrapper(stream, encoding='utf-8', errors='replace', newline='')
+    try:
+        reader = csv.DictReader(text_stream)
+        if csv_column not in (reader.fieldnames or []):
+            raise ValueError(f"{name} has no column '{csv_column}' (columns: {reader.fieldnames})")
+        for row_number, row in enumerate(reader, start=1):
+            yield f"{name}#{row_number}", row.get(csv_column) or ""
+    finally:
+        text_stream.detach() # Leave the caller's stream open
+
+
+def result_row(document: str, scores: Dict[str, float], method_used: str,
+               dialect_names: List[str]) -> Dict[str, Any]:
+    """One flat table row: document, method, top dialect/score and a column per dialect"""
+    top_dialect, top_score = max(scores.items(), key=lambda item: item[1]) if scores else (None, None)
+    row = {'document': document, 'method': method_used, 'top_dialect': top_dialect, 'top_score': top_score}
+    for name in dialect_names:
+        row[name] = scores.get(name)
+    return row
+
+
+def analyze_documents(analyzer: PatternAnalyzer, documents: Iterable[Tuple[str, str]],
+                      batch_size: int = 16, max_workers: int = 4,
+                      use_embeddings: bool = True) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Analyze a stream of (document id, text) pairs batch by batch
+
+    Only one batch of texts is in memory at a time; each batch's result rows
+    are yielded as soon as it finishes, so callers can show partial results.
+    """
+    dialect_names = list(analyzer.load_dialect_samples().keys())
+    documents = iter(documents)
+    while True:
+        batch = list(islice(documents, batch_size))
+        if not batch:
+            return
+        results = analyzer.analyze_batch(
+            [text for _, text in batch], use_embeddings=use_embeddings, max_workers=max_workers
+        )
+        yield [
+            result_row(document, scores, method_used, dialect_names)
+            for (document, _), (scores, method_used) in zip(batch, results)
+        ]
+
+
+class ResultTableWriter:
+    """
+    Appends result rows to a CSV file as they arrive
+
+    The full score table lives on disk, not in memory; to_parquet converts it
+    in chunks.
+    """
+
+    def __init__(self, path: str, columns: List[str]):
+        self.path = path
+        self.columns = columns
+        self.rows_written = 0
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=columns, extrasaction='ignore')
+        self._writer.writeheader()
+
+    def write(self, rows: List[Dict[str, Any]]):
+        self._writer.writerows(rows)
+        self._file.flush()
+        self.rows_written += len(rows)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> "ResultTableWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def to_parquet(self, path: str, chunksize: int = 10000) -> str:
+        """Convert the CSV table to Parquet chunk by chunk (requires pyarrow)"""
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self._file.closed:
+            self._file.flush()
+        # Fixed dtypes, so every chunk has the same schema even when a column is empty in it
+        dtypes = {column: ('string' if column in _TEXT_COLUMNS else 'float64') for column in self.columns}
+        writer = None
+        try:
+            for chunk in pd.read_csv(self.path, chunksize=chunksize, dtype=dtypes):
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        return path
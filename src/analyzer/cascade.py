@@ -0,0 +1,124 @@
+"""
+EchoLens Cascade Module
+Runs cheap scorers first and escalates to costlier ones only when results are ambiguous
+"""
+
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+from .scorers import scorers_by_cost
+
+logger = logging.getLogger(__name__)
+
+
+def top_margin(scores: Dict[str, float]) -> float:
+    """
+    Relative margin between the top two dialects: (top - second) / top
+
+    Relative rather than absolute so it is comparable across scorers whose
+    score ranges differ (Jaccard vs. cosine vs. rescaled cosine).
+    """
+    if len(scores) < 2:
+        return 1.0
+    first, second = sorted(scores.values(), reverse=True)[:2]
+    if first <= 0:
+        return 0.0
+    return (first - second) / first
+
+
+def top_gap(scores: Dict[str, float]) -> Tuple[float, float]:
+    """(top score, absolute gap between the top two scores)"""
+    if not scores:
+        return 0.0, 0.0
+    ranked = sorted(scores.values(), reverse=True)
+    return ranked[0], ranked[0] - (ranked[1] if len(ranked) > 1 else 0.0)
+
+
+class CascadePlanner:
+    """
+    Cost-aware scorer cascade
+
+    Scorers run cheapest first. A result is decisive when the relative margin
+    between the top two dialects reaches the threshold and the evidence is
+    not noise: the top score and the absolute top-two gap must also reach
+    their minimums (a relative margin of 0.36 between Jaccard scores of 0.085
+    and 0.055 means nothing). Decisive results skip costlier scorers;
+    otherwise the cascade escalates and returns the last successful result.
+    """
+
+    def __init__(self, stages: Optional[List[str]] = None, margin_threshold: float = 0.25,
+                 stage_thresholds: Optional[Dict[str, float]] = None,
+                 min_top_score: float = 0.1, min_gap: float = 0.05):
+        """
+        Args:
+            stages: Scorer names to consider (default: every registered scorer)
+            margin_threshold: Relative top-two margin at which a result is decisive
+            stage_thresholds: Per-scorer overrides of margin_threshold
+            min_top_score: Minimum absolute top score for a decisive result
+            min_gap: Minimum absolute gap between the top two scores for a decisive result
+        """
+        self.stages = stages
+        self.margin_threshold = margin_threshold
+        self.stage_thresholds = stage_thresholds or {}
+        self.min_top_score = min_top_score
+        self.min_gap = min_gap
+
+    @property
+    def fingerprint(self) -> str:
+        """Identifies the stages and thresholds, so cached cascade results follow planner changes"""
+        settings = (self.stages, self.margin_threshold, sorted(self.stage_thresholds.items()),
+                    self.min_top_score, self.min_gap)
+        return hashlib.md5(repr(settings).encode()).hexdigest()[:12]
+
+    def threshold_for(self, scorer_name: str) -> float:
+        return self.stage_thresholds.get(scorer_name, self.margin_threshold)
+
+    def is_decisive(self, scores: Dict[str, float], scorer_name: str) -> bool:
+        """Whether `scores` separate the top dialect clearly enough to stop escalating"""
+        top, gap = top_gap(scores)
+        return (top_margin(scores) >= self.threshold_for(scorer_name)
+                and top >= self.min_top_score and gap >= self.min_gap)
+
+    def run(self, analyzer, user_text: str, dialects: Dict[str, str],
+            exemplars: Optional[Dict[str, List[str]]] = None) -> Tuple[Dict[str, float], str, List[Dict[str, Any]]]:
+        """
+        Run the cascade
+
+        Returns:
+            scores, name of the scorer that produced them, and a record per stage
+            ({'scorer', 'cost', 'ran', 'margin', 'top_score', 'gap', 'decisive', 'error', 'skipped'})
+        """
+        stages: List[Dict[str, Any]] = []
+        best: Tuple[Dict[str, float], str] = ({}, "not_analyzed_no_scorer")
+
+        decided = False
+        for scorer in scorers_by_cost(self.stages):
+            record: Dict[str, Any] = {'scorer': scorer.name, 'cost': scorer.cost, 'ran': False}
+            stages.append(record)
+            if decided:
+                record['skipped'] = 'not_needed'
+                continue
+            if not scorer.is_available(analyzer):
+                record['skipped'] = 'unavailable'
+                continue
+
+            record['ran'] = True
+            try:
+                scores = scorer.score(analyzer, user_text, dialects, exemplars)
+            except Exception as e:
+                logger.warning(f"Scorer {scorer.name} failed: {e}")
+                scores = None
+            if not scores:
+                record['error'] = True
+                continue
+
+            margin = top_margin(scores)
+            record['margin'] = margin
+            record['top_score'], record['gap'] = top_gap(scores)
+            record['decisive'] = self.is_decisive(scores, scorer.name)
+            best = (scores, scorer.name)
+            if record['decisive']:
+                logger.info(f"Cascade stopped at {scorer.name} (margin {margin:.2f})")
+                decided = True
+
+        return best[0], best[1], stages
@@ -0,0 +1,146 @@
+"""
+EchoLens Embedding Batcher Module
+Coalesces concurrent single-text embedding requests into shared multi-input API calls
+"""
+
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EmbedManyFn = Callable[[List[str]], List[List[float]]]
+
+
+class EmbeddingMicroBatcher:
+    """
+    Dynamic micro-batcher in front of a multi-input embedding call
+
+    Callers submit one text each and block on its embedding. A dispatcher
+    thread collects pending texts until `window_ms` has passed since the
+    oldest arrived or `max_batch_size` distinct texts are waiting, then sends
+    them in one `embed_many` call and fans the embeddings back out. A text
+    that is already pending or in flight joins that request instead of being
+    sent again. The latency a request gains is bounded by the window (plus
+    the wait for a free API slot when `max_concurrent_batches` calls are
+    already in flight).
+    """
+
+    def __init__(self, embed_many: EmbedManyFn, window_ms: float = 10.0, max_batch_size: int = 64,
+                 max_concurrent_batches: int = 4):
+        """
+        Args:
+            embed_many: Function embedding a list of texts, returning embeddings in input order
+            window_ms: How long the oldest pending text may wait for others to join its batch
+            max_batch_size: Distinct texts per call; a full batch is sent without waiting
+            max_concurrent_batches: API calls allowed in flight at once
+        """
+        self.embed_many = embed_many
+        self.window_ms = window_ms
+        self.max_batch_size = max_batch_size
+        self._pending: "OrderedDict[str, Tuple[Future, float]]" = OrderedDict() # text -> (future, arrival)
+        self._in_flight: Dict[str, Future] = {}
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_batches,
+                                            thread_name_prefix="echolens-embed-batch")
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.requests = 0 # Texts submitted
+        self.inputs = 0 # Texts actually sent (after coalescing duplicates)
+        self.batches = 0 # API calls made
+
+    def submit(self, text: str) -> Future:
+        """Queue `text` for the next batch; the future resolves to its embedding"""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("EmbeddingMicroBatcher is closed")
+            self.requests += 1
+            entry = self._pending.get(text)
+            if entry is not None:
+                return entry[0]
+            if text in self._in_flight:
+                return self._in_flight[text]
+            future: Future = Future()
+            self._pending[text] = (future, time.monotonic())
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="echolens-embed-batcher", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+            return future
+
+    def embed(self, text: str, timeout: Optional[float] = None) -> List[float]:
+        """Embedding of `text`, computed in whichever batch it joins (raises if that call failed)"""
+        return self.submit(text).result(timeout)
+
+    def _next_batch(self) -> List[Tuple[str, Future]]:
+        """Block until a batch is due, then take it off the pending queue"""
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            while len(self._pending) < self.max_batch_size and not self._closed:
+                oldest_arrival = next(iter(self._pending.values()))[1]
+                remaining = oldest_arrival + self.window_ms / 1000 - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = []
+            while self._pending and len(batch) < self.max_batch_size:
+                text, (future, _) = self._pending.popitem(last=False)
+                self._in_flight[text] = future
+                batch.append((text, future))
+            if batch:
+                self.batches += 1
+                self.inputs += len(batch)
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch: # Closed and drained
+                return
+            self._executor.submit(self._dispatch, batch)
+
+    def _dispatch(self, batch: List[Tuple[str, Future]]):
+        texts = [text for text, _ in batch]
+        try:
+            embeddings = self.embed_many(texts)
+            if len(embeddings) != len(texts):
+                raise ValueError(f"Expected {len(texts)} embeddings, got {len(embeddings)}")
+        except Exception as e:
+            logger.error(f"Batched embedding call for {len(texts)} texts failed: {e}")
+            outcomes = [(future, None, e) for _, future in batch]
+        else:
+            logger.debug(f"Embedded a micro-batch of {len(texts)} texts")
+            outcomes = [(future, embedding, None) for (_, future), embedding in zip(batch, embeddings)]
+
+        with self._cond:
+            for text in texts:
+                self._in_flight.pop(text, None)
+        for future, embedding, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(embedding)
+
+    def stats(self) -> Dict[str, float]:
+        """Requests submitted, inputs sent, API calls made and the average batch size"""
+        with self._cond:
+            return {
+                'requests': self.requests,
+                'inputs': self.inputs,
+                'batches': self.batches,
+                'avg_batch_size': self.inputs / self.batches if self.batches else 0.0,
+            }
+
+    def close(self):
+        """Send whatever is pending, wait for in-flight calls and stop the dispatcher"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self._executor.shutdown(wait=True)
@@ -5,73 +5,253 @@ Handles OpenAI embeddings generation and caching for improved analysis
 
 import os
 import json
+import time
 import hashlib
+import functools
+import threading
 import numpy as np
-from typing import List, Dict, Optional, Union
-from tenacity import retry, wait_random_exponential, stop_after_attempt
-from openai import OpenAI
-from sklearn.metrics.pairwise import cosine_similarity
+from typing import Any, List, Dict, NamedTuple, Optional, Tuple, Union
 import logging
+from .embedding_batcher import EmbeddingMicroBatcher
+from .metrics import METRICS
+from .simhash import SimHashIndex, simhash
+from .tokenizer import canonicalize, token_set
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+CACHE_LOOKUPS = METRICS.counter('echolens_embedding_cache_lookups_total',
+                                "Embedding cache lookups by result (hit, near_duplicate, miss)", ['result'])
+API_REQUESTS = METRICS.counter('echolens_embedding_api_requests_total',
+                               "Embedding API calls by outcome (every retry attempt counts)", ['outcome'])
+API_LATENCY = METRICS.histogram('echolens_embedding_api_latency_seconds',
+                                "Duration of embedding API calls by outcome", ['outcome'])
+API_RETRIES = METRICS.counter('echolens_embedding_api_retries_total',
+                              "Embedding API calls retried with backoff after a failure")
+API_HTTP_RESPONSES = METRICS.counter('echolens_embedding_api_http_responses_total',
+                                     "HTTP responses from the embedding API by status, "
+                                     "including attempts the OpenAI client retried itself", ['status'])
+API_TEXTS = METRICS.counter('echolens_embedding_api_texts_total', "Texts embedded by the API")
+API_TOKENS = METRICS.counter('echolens_embedding_api_tokens_total', "Tokens the API reported for embedding calls")
+API_BATCH_SIZE = METRICS.histogram('echolens_embedding_api_batch_size', "Texts per successful embedding API call",
+                                   buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256))
+EMBEDDING_FAILURES = METRICS.counter('echolens_embedding_failures_total',
+                                     "Texts left without an embedding after retries were exhausted")
+
+
+def _count_retry(retry_state):
+    API_RETRIES.inc()
+
+
+def _count_http_response(response):
+    API_HTTP_RESPONSES.inc(status=response.status_code)
+
+
+def _retry_with_backoff(fn):
+    """
+    Retry `fn` with random exponential backoff (tenacity)
+    
+    tenacity is only imported on the first call, so importing this module
+    stays cheap for processes that never call the API.
+    """
+    retrying = None
+    
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        nonlocal retrying
+        if retrying is None:
+            from tenacity import retry, wait_random_exponential, stop_after_attempt
+            retrying = retry(wait=wait_random_exponential(min=1, max=20), stop=stop_after_attempt(6),
+                             before_sleep=_count_retry)(fn)
+        return retrying(*args, **kwargs)
+    return wrapper
+
+
+class CachedEmbedding(NamedTuple):
+    """An embedding found in the cache, and how it was found"""
+    embedding: List[float]
+    near_duplicate: bool = False # Reused from a different but near-identical text
+    distance: int = 0 # SimHash Hamming distance to that text
+    source_preview: str = "" # Start of the text the embedding was computed for
+    
+    def reuse_info(self) -> Dict[str, Any]:
+        """Summary recorded in analysis results when a near-duplicate's embedding was reused"""
+        return {'near_duplicate': True, 'hamming_distance': self.distance, 'source_preview': self.source_preview}
+
+
 class EmbeddingsManager:
     """
     Manages OpenAI embeddings with caching and retry logic
+    
+    Texts are canonicalized (Unicode NFKC, ASCII quotes/dashes, collapsed
+    whitespace, optionally case-folded) before keying and embedding, so
+    cosmetic differences share one cached embedding. With
+    `near_duplicate_distance`, a cache miss may also reuse the embedding of a
+    previously embedded text whose SimHash is within that many bits.
     """
     
-    def __init__(self, api_key: str, model: str = "text-embedding-3-small"):
+    SIMHASH_INDEX_FILE = 'simhash_index.jsonl'
+    
+    def __init__(self, api_key: str, model: str = "text-embedding-3-small", base_url: Optional[str] = None,
+                 batch_window_ms: float = 0.0, max_batch_size: int = 64,
+                 lowercase_keys: bool = False, near_duplicate_distance: int = 0):
         """
         Initialize the embeddings manager
         
         Args:
             api_key: OpenAI API key
             model: Embedding model to use (default: text-embedding-3-small)
+            base_url: OpenAI-compatible API endpoint (default: the client's, i.e. OPENAI_BASE_URL or api.openai.com)
+            batch_window_ms: When > 0, uncached single-text requests arriving within this
+                             window of each other share one multi-input API call
+            max_batch_size: Maximum texts per micro-batched call
+            lowercase_keys: Case-fold texts when canonicalizing (case-only differences share an embedding)
+            near_duplicate_distance: When > 0, reuse the cached embedding of a text whose
+                                     SimHash is within this Hamming distance (0 disables)
         """
-        self.client = OpenAI(api_key=api_key)
+        from openai import DefaultHttpxClient, OpenAI # Imported on first use; heavy and only needed with an API key
+        self.client = OpenAI(api_key=api_key, base_url=base_url,
+                             http_client=DefaultHttpxClient(event_hooks={'response': [_count_http_response]}))
         self.model = model
         self.cache_dir = os.path.join('data', 'embeddings_cache')
         self._ensure_cache_dir()
+        self.lowercase_keys = lowercase_keys
+        self.near_duplicate_distance = near_duplicate_distance
+        self._simhash_index: Optional[SimHashIndex] = None # Loaded on first near-duplicate lookup
+        self._simhash_lock = threading.Lock()
+        self.batcher: Optional[EmbeddingMicroBatcher] = None
+        if batch_window_ms > 0:
+            self.batcher = EmbeddingMicroBatcher(self._get_embeddings_from_api, window_ms=batch_window_ms,
+                                                 max_batch_size=max_batch_size)
         
     def _ensure_cache_dir(self):
         """Create cache directory if it doesn't exist"""
         os.makedirs(self.cache_dir, exist_ok=True)
         
+    def canonical_text(self, text: str) -> str:
+        """The form of `text` that is keyed and embedded"""
+        return canonicalize(text, lowercase=self.lowercase_keys)
+        
     def _get_cache_key(self, text: str) -> str:
-        """Generate a cache key for the text"""
-        return hashlib.md5(text.encode()).hexdigest()
+        """Generate a cache key for the text (canonicalized first)"""
+        return hashlib.md5(self.canonical_text(text).encode()).hexdigest()
         
     def _get_cache_path(self, cache_key: str) -> str:
         """Get the full path for a cache file"""
         return os.path.join(self.cache_dir, f"{cache_key}.json")
         
-    def _load_from_cache(self, text: str) -> Optional[List[float]]:
-        """Load embedding from cache if it exists"""
-        cache_key = self._get_cache_key(text)
+    def _read_cache_file(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Cache entry for this model under `cache_key`, if any"""
         cache_path = self._get_cache_path(cache_key)
-        
         if os.path.exists(cache_path):
             try:
                 with open(cache_path, 'r') as f:
                     cached_data = json.load(f)
-                    if cached_data.get('model') == self.model:
-                        logger.debug(f"Cache hit for text: {text[:50]}...")
-                        return cached_data['embedding']
+                if cached_data.get('model') == self.model:
+                    return cached_data
             except Exception as e:
                 logger.warning(f"Failed to load cache: {e}")
+        return None
         
+    def _load_from_cache(self, text: str) -> Optional[List[float]]:
+        """Load embedding from cache if it exists"""
+        cached_data = self._read_cache_file(self._get_cache_key(text))
+        if cached_data is None:
+            # Entries written before keys were canonicalized are keyed by the raw text
+            cached_data = self._read_cache_file(hashlib.md5(text.encode()).hexdigest())
+        if cached_data is not None:
+            logger.debug(f"Cache hit for text: {text[:50]}...")
+            return cached_data['embedding']
         return None
         
+    def lookup_cached_embedding(self, text: str) -> Optional[CachedEmbedding]:
+        """
+        Cached embedding for text, exact or (if enabled) from a near-duplicate; never calls the API
+        """
+        embedding = self._load_from_cache(text)
+        if embedding:
+            CACHE_LOOKUPS.inc(result='hit')
+            return CachedEmbedding(embedding)
+        cached = self._load_near_duplicate(text)
+        CACHE_LOOKUPS.inc(result='near_duplicate' if cached else 'miss')
+        return cached
+        
+    def load_cached_embedding(self, text: str) -> Optional[List[float]]:
+        """Cached embedding for text, or None (never calls the API)"""
+        cached = self.lookup_cached_embedding(text)
+        return cached.embedding if cached else None
+        
+    def _get_simhash_index(self) -> SimHashIndex:
+        """Fingerprints of cached texts, read from the index file on first use"""
+        if self._simhash_index is None:
+            with self._simhash_lock:
+                if self._simhash_index is None:
+                    index = SimHashIndex(self.near_duplicate_distance)
+                    index_path = os.path.join(self.cache_dir, self.SIMHASH_INDEX_FILE)
+                    if os.path.exists(index_path):
+                        try:
+                            for entry in self._compact_simhash_file(index_path):
+                                if entry.get('model') == self.model:
+                                    index.add(entry['simhash'], entry['key'])
+                        except Exception as e:
+                            logger.warning(f"Failed to load SimHash index: {e}")
+                    self._simhash_index = index
+        return self._simhash_index
+    
+    def _compact_simhash_file(self, index_path: str) -> List[Dict[str, Any]]:
+        """
+        Live entries of the SimHash index file, rewriting it without the rest
+
+        Duplicate and unreadable lines, and entries whose cache file no longer
+        exists, are dropped; the file is only rewritten when there were any.
+        """
+        lines = 0
+        live: Dict[Tuple[Any, str], Dict[str, Any]] = {} # (model, key) -> entry
+        with open(index_path, 'r') as f:
+            for line in f:
+                lines += 1
+                try:
+                    entry = json.loads(line)
+                    live[(entry.get('model'), entry['key'])] = entry
+                except (ValueError, KeyError, TypeError):
+                    continue # Partially written line
+        entries = [entry for entry in live.values() if os.path.exists(self._get_cache_path(entry['key']))]
+        if len(entries) < lines:
+            tmp_path = f"{index_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in entries)
+            os.replace(tmp_path, index_path)
+            logger.info(f"Compacted SimHash index: {lines} lines -> {len(entries)} entries")
+        return entries
+        
+    def _load_near_duplicate(self, text: str) -> Optional[CachedEmbedding]:
+        """Embedding of the closest cached near-duplicate of `text`, if near-duplicate reuse is enabled"""
+        if self.near_duplicate_distance <= 0:
+            return None
+        fingerprint = simhash(self.canonical_text(text))
+        if fingerprint is None:
+            return None
+        match = self._get_simhash_index().query(fingerprint)
+        if match is None:
+            return None
+        key, distance = match
+        cached_data = self._read_cache_file(key)
+        if cached_data is None:
+            return None
+        logger.info(f"Reusing embedding of a near-duplicate text (Hamming distance {distance})")
+        return CachedEmbedding(cached_data['embedding'], near_duplicate=True, distance=distance,
+                               source_preview=cached_data.get('text_preview', ''))
+        
     def _save_to_cache(self, text: str, embedding: List[float]):
         """Save embedding to cache"""
+        canonical = self.canonical_text(text)
         cache_key = self._get_cache_key(text)
         cache_path = self._get_cache_path(cache_key)
         
         try:
             cache_data = {
-                'text_preview': text[:100],  # Store first 100 chars for debugging
+                'text_preview': canonical[:100],  # Store first 100 chars for debugging
                 'model': self.model,
                 'embedding': embedding
             }
@@ -80,30 +260,87 @@ class EmbeddingsManager:
             logger.debug(f"Cached embedding for text: {text[:50]}...")
         except Exception as e:
             logger.warning(f"Failed to save cache: {e}")
+            return
+        
+        if self.near_duplicate_distance > 0:
+            fingerprint = simhash(canonical)
+            if fingerprint is not None:
+                if not self._get_simhash_index().add(fingerprint, cache_key):
+                    return # Already indexed; appending again would only grow the file
+                try:
+                    with self._simhash_lock, open(os.path.join(self.cache_dir, self.SIMHASH_INDEX_FILE), 'a') as f:
+                        f.write(json.dumps({'key': cache_key, 'simhash': fingerprint, 'model': self.model}) + "\n")
+                except Exception as e:
+                    logger.warning(f"Failed to update SimHash index: {e}")
     
-    @retry(wait=wait_random_exponential(min=1, max=20), stop=stop_after_attempt(6))
+    def _create_embeddings(self, texts: List[str]):
+        """One embeddings API call, recorded in the API metrics"""
+        start = time.perf_counter()
+        try:
+            response = self.client.embeddings.create(
+                input=texts,
+                model=self.model
+            )
+        except Exception:
+            API_LATENCY.observe(time.perf_counter() - start, outcome='error')
+            API_REQUESTS.inc(outcome='error')
+            raise
+        API_LATENCY.observe(time.perf_counter() - start, outcome='success')
+        API_REQUESTS.inc(outcome='success')
+        API_TEXTS.inc(len(texts))
+        API_BATCH_SIZE.observe(len(texts))
+        usage = getattr(response, 'usage', None)
+        if usage is not None and getattr(usage, 'total_tokens', None):
+            API_TOKENS.inc(usage.total_tokens)
+        return response
+    
+    @_retry_with_backoff
     def _get_embedding_from_api(self, text: str) -> List[float]:
         """
         Get embedding from OpenAI API with retry logic
         Uses exponential backoff to handle rate limits gracefully
         """
         try:
-            response = self.client.embeddings.create(
-                input=[text],
-                model=self.model
-            )
+            response = self._create_embeddings([text])
             return response.data[0].embedding
         except Exception as e:
             logger.error(f"API error getting embedding: {e}")
             raise
     
-    def get_embedding(self, text: str, use_cache: bool = True) -> Optional[List[float]]:
+    @_retry_with_backoff
+    def _get_embeddings_from_api(self, texts: List[str]) -> List[List[float]]:
+        """
+        Get embeddings for several texts in a single multi-input API call
+        """
+        try:
+            response = self._create_embeddings(texts)
+            # The API reports an index per input; don't rely on response ordering
+            ordered = sorted(response.data, key=lambda item: item.index)
+            return [item.embedding for item in ordered]
+        except Exception as e:
+            logger.error(f"API error getting batch embeddings: {e}")
+            raise
+    
+    def _embed_uncached(self, text: str) -> List[float]:
+        """
+        Embed one text via the API, micro-batched with concurrent requests when enabled
+
+        A failed micro-batch has already been retried with backoff, so its error is
+        raised to every text that joined it rather than retrying each one alone.
+        """
+        if self.batcher is not None:
+            return self.batcher.embed(text)
+        return self._get_embedding_from_api(text)
+    
+    def get_embedding(self, text: str, use_cache: bool = True, skip_lookup: bool = False) -> Optional[List[float]]:
         """
         Get embedding for text, using cache if available
         
         Args:
             text: Text to embed
             use_cache: Whether to use caching (default: True)
+            skip_lookup: Don't check the cache first, e.g. when the caller's own lookup
+                         just missed; the new embedding is still saved when use_cache is set
             
         Returns:
             List of floats representing the embedding, or None if failed
@@ -113,14 +350,14 @@ class EmbeddingsManager:
             return None
             
         # Check cache first
-        if use_cache:
-            cached_embedding = self._load_from_cache(text)
+        if use_cache and not skip_lookup:
+            cached_embedding = self.load_cached_embedding(text)
             if cached_embedding:
                 return cached_embedding
         
         # Get from API
         try:
-            embedding = self._get_embedding_from_api(text)
+            embedding = self._embed_uncached(self.canonical_text(text))
             
             # Save to cache
             if use_cache:
@@ -131,47 +368,84 @@ class EmbeddingsManager:
             
         except Exception as e:
             logger.error(f"Failed to get embedding: {e}")
+            EMBEDDING_FAILURES.inc()
             return None
     
-    def get_embeddings_batch(self, texts: List[str], use_cache: bool = True) -> Dict[str, Optional[List[float]]]:
+    def get_embeddings_batch(self, texts: List[str], use_cache: bool = True,
+                             batch_size: int = 256, allow_near_duplicates: bool = True,
+                             trace: Optional[Dict[str, Any]] = None) -> Dict[str, Optional[List[float]]]:
         """
         Get embeddings for multiple texts efficiently
         
+        Uncached texts are sent in multi-input API calls of up to `batch_size`
+        texts; texts with the same canonical form are sent once. A batch call
+        is already retried with backoff, so if it still fails its texts map to
+        None instead of being retried one by one against a failing API.
+        
         Args:
             texts: List of texts to embed
             use_cache: Whether to use caching
+            batch_size: Maximum number of texts per API call
+            allow_near_duplicates: Whether cache misses may reuse a near-duplicate's
+                                   embedding (when enabled on the manager)
+            trace: Optional dict that receives 'cache_hits' (texts served from the cache,
+                   near-duplicates included), 'embedded' (distinct texts the API embedded),
+                   'failed' (texts left without one) and 'near_duplicates' ({text: reuse info}
+                   for texts that reused a near-duplicate's embedding)
             
         Returns:
             Dictionary mapping text to embedding
         """
         results = {}
-        texts_to_process = []
+        pending: Dict[str, List[str]] = {} # Canonical text -> original texts
+        near_duplicates: Dict[str, Dict[str, Any]] = {} # Text -> reuse info
+        cache_hits = embedded = failed = 0
         
-        # Check cache for all texts first
-        for text in texts:
+        # Check cache for all texts first (and drop duplicates / unembeddable texts)
+        for text in dict.fromkeys(texts):
+            if not text or len(text.strip()) < 3:
+                results[text] = None
+                continue
             if use_cache:
                 cached_embedding = self._load_from_cache(text)
+                result = 'hit' if cached_embedding else 'miss'
+                if not cached_embedding and allow_near_duplicates:
+                    near_duplicate = self._load_near_duplicate(text)
+                    if near_duplicate:
+                        cached_embedding, result = near_duplicate.embedding, 'near_duplicate'
+                        near_duplicates[text] = near_duplicate.reuse_info()
+                CACHE_LOOKUPS.inc(result=result)
                 if cached_embedding:
                     results[text] = cached_embedding
+                    cache_hits += 1
                     continue
-            texts_to_process.append(text)
+            pending.setdefault(self.canonical_text(text), []).append(text)
+        texts_to_process = list(pending)
         
         # Process remaining texts
         if texts_to_process:
             logger.info(f"Processing {len(texts_to_process)} texts via API")
-            try:
-                # For small batches, process individually to handle errors gracefully
-                for text in texts_to_process:
-                    embedding = self.get_embedding(text, use_cache=use_cache)
-                    results[text] = embedding
-                    
-            except Exception as e:
-                logger.error(f"Batch processing failed: {e}")
-                # Fill remaining with None
-                for text in texts_to_process:
-                    if text not in results:
-                        results[text] = None
+            for start in range(0, len(texts_to_process), batch_size):
+                chunk = texts_to_process[start:start + batch_size]
+                try:
+                    embeddings = self._get_embeddings_from_api(chunk)
+                except Exception as e:
+                    logger.error(f"Batch processing failed after retries: {e}. {len(chunk)} texts left unembedded.")
+                    EMBEDDING_FAILURES.inc(len(chunk))
+                    embeddings = [None] * len(chunk)
+                    failed += len(chunk)
+                else:
+                    embedded += len(chunk)
+                    if use_cache:
+                        for canonical, embedding in zip(chunk, embeddings):
+                            self._save_to_cache(canonical, embedding)
+                
+                for canonical, embedding in zip(chunk, embeddings):
+                    for text in pending[canonical]:
+                        results[text] = embedding
         
+        if trace is not None:
+            trace.update(cache_hits=cache_hits, embedded=embedded, failed=failed, near_duplicates=near_duplicates)
         return results
     
     def calculate_similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
@@ -189,12 +463,12 @@ class EmbeddingsManager:
             return 0.0
             
         try:
-            # Reshape for sklearn
-            emb1 = np.array(embedding1).reshape(1, -1)
-            emb2 = np.array(embedding2).reshape(1, -1)
+            emb1 = np.asarray(embedding1, dtype=np.float64)
+            emb2 = np.asarray(embedding2, dtype=np.float64)
             
             # Calculate cosine similarity
-            similarity = cosine_similarity(emb1, emb2)[0][0]
+            norms = np.linalg.norm(emb1) * np.linalg.norm(emb2)
+            similarity = float(emb1 @ emb2 / norms) if norms > 0 else 0.0
             
             # Convert from [-1, 1] to [0, 1] range
             normalized_similarity = (similarity + 1) / 2
@@ -212,6 +486,7 @@ class EmbeddingsManager:
             if os.path.exists(self.cache_dir):
                 shutil.rmtree(self.cache_dir)
             self._ensure_cache_dir()
+            self._simhash_index = None
             logger.info("Embedding cache cleared")
         except Exception as e:
             logger.error(f"Failed to clear cache: {e}")
@@ -231,18 +506,19 @@ class EmbeddingsManager:
             return {'cached_embeddings': 0, 'cache_size_mb': 0}
 
 
-def create_embeddings_manager(api_key: str) -> Optional[EmbeddingsManager]:
+def create_embeddings_manager(api_key: str, **kwargs) -> Optional[EmbeddingsManager]:
     """
     Factory function to create an EmbeddingsManager
     
     Args:
         api_key: OpenAI API key
+        **kwargs: Further EmbeddingsManager options (model, base_url, batch_window_ms, max_batch_size, ...)
         
     Returns:
         EmbeddingsManager instance or None if creation fails
     """
     try:
-        manager = EmbeddingsManager(api_key)
+        manager = EmbeddingsManager(api_key, **kwargs)
         logger.info("EmbeddingsManager created successfully")
         return manager
     except Exception as e:
@@ -256,10 +532,10 @@ def simple_word_similarity(text1: str, text2: str) -> float:
     Fallback similarity calculation using word overlap
     Used when embeddings are not available
     """
-    words1 = set(text1.lower().split())
-    words2 = set(text2.lower().split())
+    words1 = token_set(text1)
+    words2 = token_set(text2)
     
-    intersection = len(words1.intersection(words2))
-    union = len(words1.union(words2))
+    intersection = len(words1 & words2)
+    union = len(words1) + len(words2) - intersection
     
     return intersection / union if union > 0 else 0.0
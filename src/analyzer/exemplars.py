@@ -0,0 +1,140 @@
+"""
+EchoLens Exemplars Module
+Multi-passage dialect profiles scored by centroid and nearest-exemplar similarity
+"""
+
+import hashlib
+import logging
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Sequence
+from .vector_index import _normalize_rows
+
+logger = logging.getLogger(__name__)
+
+
+def exemplars_fingerprint(passages: Sequence[str]) -> str:
+    """Content fingerprint for a dialect's passages (matches a plain md5 for one passage)"""
+    return hashlib.md5("\x1e".join(passages).encode()).hexdigest()
+
+
+class DialectProfile:
+    """
+    Embedding profile for one dialect
+
+    Holds the dialect's exemplar embeddings as a contiguous, L2-normalized
+    float32 matrix plus their normalized centroid.
+    """
+
+    def __init__(self, name: str, embeddings: Sequence[Sequence[float]], fingerprint: str = ""):
+        self.name = name
+        self.fingerprint = fingerprint
+        self.exemplars = np.ascontiguousarray(
+            _normalize_rows(np.asarray(embeddings, dtype=np.float32).reshape(len(embeddings), -1))
+        )
+        centroid = self.exemplars.mean(axis=0)
+        norm = np.linalg.norm(centroid)
+        self.centroid = centroid / norm if norm > 0 else centroid
+
+    def __len__(self) -> int:
+        return self.exemplars.shape[0]
+
+
+class ExemplarScorer:
+    """
+    Scores a user embedding against many dialect profiles at once
+
+    All exemplars are packed into one contiguous matrix, so scoring every
+    dialect costs two matrix-vector products regardless of how many passages
+    each profile holds; `offsets` locate each dialect's rows in it, and
+    `padded_rows` lays them out as one row of exemplar indices per dialect
+    (padded with -1) so the top-k of every dialect is a single partition.
+    The profiles passed in are only read. A dialect's score blends its
+    centroid similarity with the mean of its top-k exemplar similarities
+    (k=1 is nearest-exemplar).
+    """
+
+    def __init__(self, profiles: Dict[str, DialectProfile], top_k: int = 5, centroid_weight: float = 0.5):
+        self.top_k = max(1, top_k)
+        self.centroid_weight = centroid_weight
+        self.names: List[str] = list(profiles.keys())
+        self._name_to_pos = {name: i for i, name in enumerate(self.names)}
+
+        sizes = np.array([len(profiles[name]) for name in self.names], dtype=np.int64)
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        dim = profiles[self.names[0]].exemplars.shape[1] if self.names else 0
+        self.exemplars = np.empty((int(self.offsets[-1]), dim), dtype=np.float32)
+        self.centroids = np.empty((len(self.names), dim), dtype=np.float32)
+
+        for i, name in enumerate(self.names):
+            profile = profiles[name]
+            start, end = self.offsets[i], self.offsets[i + 1]
+            self.exemplars[start:end] = profile.exemplars
+            self.centroids[i] = profile.centroid
+
+        width = int(sizes.max()) if len(sizes) else 0
+        columns = np.arange(width)
+        self._padding = columns >= sizes[:, None]
+        self.padded_rows = np.where(self._padding, -1, self.offsets[:-1, None] + columns)
+        self._top_counts = np.minimum(sizes, self.top_k)
+
+    def score_components(self, user_embedding: Sequence[float],
+                         names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Return raw cosine components per dialect
+
+        Args:
+            user_embedding: Query embedding
+            names: Restrict scoring to these dialects (default: all)
+
+        Returns:
+            {dialect: {'centroid', 'max', 'top_k', 'combined'}} cosine values
+        """
+        if not self.names:
+            return {}
+        query = np.asarray(user_embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        if names is None:
+            positions = np.arange(len(self.names))
+        else:
+            positions = np.array([self._name_to_pos[n] for n in names if n in self._name_to_pos], dtype=np.int64)
+        if not len(positions):
+            return {}
+        centroid_sims = self.centroids[positions] @ query
+
+        padding = self._padding[positions]
+        rows = self.padded_rows[positions]
+        if names is None:
+            sims = (self.exemplars @ query)[rows]
+        else:
+            sims = np.empty(rows.shape, dtype=np.float32)
+            sims[~padding] = self.exemplars[rows[~padding]] @ query
+        sims[padding] = -np.inf
+
+        # Each row's k best similarities land in its last k columns; padding sorts first
+        k = min(self.top_k, sims.shape[1])
+        top = np.partition(sims, sims.shape[1] - k, axis=1)[:, sims.shape[1] - k:]
+        maxima = top.max(axis=1)
+        top_k_means = np.where(np.isfinite(top), top, 0.0).sum(axis=1) / self._top_counts[positions]
+        combined = self.centroid_weight * centroid_sims + (1 - self.centroid_weight) * top_k_means
+
+        return {
+            self.names[pos]: {
+                'centroid': float(centroid_sims[j]),
+                'max': float(maxima[j]),
+                'top_k': float(top_k_means[j]),
+                'combined': float(combined[j]),
+            }
+            for j, pos in enumerate(positions)
+        }
+
+    def score(self, user_embedding: Sequence[float], names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """
+        Score dialects, mapped from cosine [-1, 1] to [0, 1] like EmbeddingsManager.calculate_similarity
+        """
+        return {
+            name: (parts['combined'] + 1) / 2
+            for name, parts in self.score_components(user_embedding, names).items()
+        }
@@ -0,0 +1,48 @@
+"""
+EchoLens Fake Embeddings Module
+Deterministic, offline stand-in for the OpenAI embeddings client (benchmarks, tests, load tests)
+"""
+
+import hashlib
+from types import SimpleNamespace
+from typing import Dict, List
+import numpy as np
+
+FAKE_EMBEDDING_DIM = 256
+
+
+class FakeEmbeddingsClient:
+    """
+    Stand-in for `OpenAI().embeddings` returning deterministic vectors without network calls
+
+    Each text maps to the L2-normalized sum of per-token pseudo-random vectors,
+    so similar texts get similar embeddings and results are reproducible.
+    """
+
+    def __init__(self, dim: int = FAKE_EMBEDDING_DIM):
+        self.dim = dim
+        self.calls = 0
+        self.inputs = 0
+        self._token_vectors: Dict[str, np.ndarray] = {}
+
+    def _token_vector(self, token: str) -> np.ndarray:
+        vector = self._token_vectors.get(token)
+        if vector is None:
+            seed = int.from_bytes(hashlib.md5(token.encode()).digest()[:4], 'little')
+            vector = np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+            self._token_vectors[token] = vector
+        return vector
+
+    def embed(self, text: str) -> List[float]:
+        total = np.zeros(self.dim, dtype=np.float32)
+        for token in text.lower().split():
+            total += self._token_vector(token)
+        norm = np.linalg.norm(total)
+        return (total / norm if norm > 0 else total).tolist()
+
+    def create(self, input: List[str], model: str) -> SimpleNamespace:
+        self.calls += 1
+        self.inputs += len(input)
+        return SimpleNamespace(data=[
+            SimpleNamespace(index=i, embedding=self.embed(text)) for i, text in enumerate(input)
+        ])
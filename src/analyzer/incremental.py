@@ -0,0 +1,226 @@
+"""
+EchoLens Incremental Analysis Module
+Segment-level caching so re-analysing an edited draft only embeds what changed
+"""
+
+import re
+import time
+import hashlib
+import logging
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from .pattern_analyzer import (
+    ANALYSES, ANALYSIS_DURATION, ANALYSIS_FALLBACKS, RESULT_CACHE_LOOKUPS, PatternAnalyzer
+)
+from .timing import NULL_TIMER, StageTimer
+from .tokenizer import tokenize
+from ..dialects.loader import flatten_exemplars
+
+logger = logging.getLogger(__name__)
+
+_PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_segments(text: str, min_chars: int = 40) -> List[str]:
+    """
+    Split text into paragraph/sentence segments
+
+    Sentences shorter than `min_chars` are merged into the following sentence
+    of the same paragraph, so tiny fragments don't become separate API inputs.
+    """
+    segments: List[str] = []
+    for paragraph in _PARAGRAPH_SPLIT.split(text):
+        pending = ""
+        for sentence in _SENTENCE_SPLIT.split(paragraph.strip()):
+            sentence = " ".join(sentence.split())
+            if not sentence:
+                continue
+            pending = f"{pending} {sentence}" if pending else sentence
+            if len(pending) >= min_chars:
+                segments.append(pending)
+                pending = ""
+        if pending:
+            segments.append(pending)
+    return segments
+
+
+class IncrementalAnalyzer:
+    """
+    Session-scoped wrapper around PatternAnalyzer for iterative editing
+
+    Each segment's embedding is cached by content hash. On re-analysis only
+    new or changed segments are embedded (in one batch call); the document
+    vector is rebuilt as the length-weighted mean of the cached segment
+    vectors and scored like a regular user embedding.
+    
+    The segment cache is guarded by a lock, so background analyses started
+    from the same session may overlap.
+    """
+
+    def __init__(self, analyzer: PatternAnalyzer, max_segments: int = 2000, min_segment_chars: int = 40):
+        """
+        Args:
+            analyzer: PatternAnalyzer used for dialect loading and scoring
+            max_segments: Maximum number of cached segments (least recently used are evicted)
+            min_segment_chars: Minimum segment length before sentences are merged
+        """
+        self.analyzer = analyzer
+        self.max_segments = max_segments
+        self.min_segment_chars = min_segment_chars
+        self.segment_vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._near_duplicate_distances: Dict[str, int] = {} # Segment key -> SimHash distance of the reused text
+        self.last_stats: Dict[str, int] = {}
+        self.last_reuse: Optional[Dict[str, Any]] = None # Near-duplicate reuse in the last embed_document
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _segment_key(segment: str) -> str:
+        return hashlib.md5(segment.encode()).hexdigest()
+
+    def _evict(self):
+        while len(self.segment_vectors) > self.max_segments:
+            key, _ = self.segment_vectors.popitem(last=False)
+            self._near_duplicate_distances.pop(key, None)
+
+    def embed_document(self, user_text: str) -> Optional[np.ndarray]:
+        """
+        Return the document vector, embedding only uncached segments
+
+        last_stats afterwards counts the segments, how many were reused from this
+        session, served by the persistent embedding cache, and sent to the API, plus
+        how many carry a near-duplicate's embedding; last_reuse describes that reuse.
+
+        Returns:
+            Normalized document embedding, or None if no segment could be embedded
+        """
+        segments = split_segments(user_text, self.min_segment_chars)
+        keys = [self._segment_key(segment) for segment in segments]
+        missing = [seg for seg, key in zip(segments, keys) if key not in self.segment_vectors]
+        batch_trace: Dict[str, Any] = {}
+
+        if missing:
+            embeddings = self.analyzer.embeddings_manager.get_embeddings_batch(list(dict.fromkeys(missing)),
+                                                                               trace=batch_trace)
+            near_duplicates = batch_trace.get('near_duplicates', {})
+            for segment in missing:
+                embedding = embeddings.get(segment)
+                if embedding:
+                    key = self._segment_key(segment)
+                    self.segment_vectors[key] = np.asarray(embedding, dtype=np.float32)
+                    if segment in near_duplicates:
+                        self._near_duplicate_distances[key] = near_duplicates[segment]['hamming_distance']
+
+        vectors, weights = [], []
+        for segment, key in zip(segments, keys):
+            vector = self.segment_vectors.get(key)
+            if vector is not None:
+                self.segment_vectors.move_to_end(key)
+                vectors.append(vector)
+                weights.append(max(1, len(tokenize(segment))))
+
+        # Segments kept from earlier runs still carry a near-duplicate's embedding
+        reused_distances = [self._near_duplicate_distances[key] for key in dict.fromkeys(keys)
+                            if key in self._near_duplicate_distances]
+        self.last_stats = {
+            'segments': len(segments),
+            'reused_segments': len(segments) - len(missing),
+            'cached_segments': batch_trace.get('cache_hits', 0),
+            'embedded_segments': batch_trace.get('embedded', 0),
+            'failed_segments': batch_trace.get('failed', 0),
+            'near_duplicate_segments': len(reused_distances),
+        }
+        self.last_reuse = {
+            'near_duplicate': True,
+            'segments': len(reused_distances),
+            'hamming_distance': max(reused_distances),
+        } if reused_distances else None
+        self._evict()
+
+        if not vectors:
+            return None
+        document = np.average(np.vstack(vectors), axis=0, weights=weights)
+        norm = np.linalg.norm(document)
+        return document / norm if norm > 0 else document
+
+    def analyze_text(self, user_text: str, timer: Optional[StageTimer] = None,
+                     trace: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, float], str]:
+        """
+        Incremental counterpart of PatternAnalyzer.analyze_text
+
+        Falls back to the analyzer's regular pipeline when embeddings aren't available.
+        `trace` receives 'embedding_reuse' when segments reused near-duplicate embeddings.
+        Incremental embeddings analyses are counted in the same metrics as regular ones.
+        """
+        if len(user_text.strip()) < 10 or not self.analyzer.embeddings_manager:
+            return self.analyzer.analyze_text(user_text, timer=timer)
+
+        with self.analyzer.timing(timer):
+            with self.analyzer.timer.stage('load_dialects'):
+                exemplars = self.analyzer.load_dialect_exemplars()
+                dialects = flatten_exemplars(exemplars)
+        if not dialects:
+            return self.analyzer.analyze_text(user_text, timer=timer)
+
+        start = time.perf_counter()
+        with self._lock:
+            try:
+                with (timer or NULL_TIMER).stage('incremental.embed_document'):
+                    document_vector = self.embed_document(user_text)
+            except Exception as e:
+                logger.error(f"Incremental embedding failed: {e}")
+                document_vector = None
+            stats = dict(self.last_stats)
+            reuse = self.last_reuse
+        if document_vector is None:
+            logger.warning("Failed to embed user text segments - falling back to local scorers")
+            scores, method_used = self.analyzer.analyze_text(user_text, use_embeddings=False, timer=timer)
+            if scores:
+                ANALYSIS_FALLBACKS.inc(requested="embeddings", method=method_used)
+            return scores, method_used
+
+        if timer:
+            # A hit means no segment needed the API
+            timer.record_cache('segment_embeddings', stats['embedded_segments'] + stats['failed_segments'] == 0)
+        logger.info(
+            f"Incremental analysis: embedded {stats['embedded_segments']} of "
+            f"{stats['segments']} segments"
+        )
+        with self.analyzer.timing(timer):
+            scores = self.analyzer.score_embedding(document_vector, user_text, dialects, exemplars)
+        ANALYSIS_DURATION.observe(time.perf_counter() - start, method="embeddings")
+        ANALYSES.inc(method="embeddings")
+        if trace is not None and reuse:
+            trace['embedding_reuse'] = reuse
+        return scores, "embeddings"
+
+    def analyze_with_details(self, user_text: str,
+                             collect_timings: bool = False) -> Tuple[Dict[str, float], str, Dict[str, Any]]:
+        """
+        Incremental counterpart of PatternAnalyzer.analyze_with_details (memoized via the result cache)
+        """
+        if not self.analyzer.embeddings_manager:
+            return self.analyzer.analyze_with_details(user_text, collect_timings=collect_timings)
+
+        timer = StageTimer() if collect_timings else None
+        with (timer or NULL_TIMER).stage('result_cache.lookup'):
+            key = self.analyzer.result_cache_key(user_text, "embeddings_incremental")
+            cached = self.analyzer.load_cached_result(key)
+        if key:
+            RESULT_CACHE_LOOKUPS.inc(result='hit' if cached else 'miss')
+        if timer and key:
+            timer.record_cache('result', cached is not None)
+        if cached:
+            logger.info("Result cache hit")
+            if timer:
+                cached[2]['timings'] = timer.to_dict()
+            return cached
+
+        trace: Dict[str, Any] = {}
+        scores, method_used = self.analyze_text(user_text, timer=timer, trace=trace)
+        detailed = self.analyzer.get_detailed_analysis(user_text, scores, method_used, trace=trace, timer=timer)
+        if method_used == "embeddings":
+            self.analyzer.store_result(key, scores, method_used, detailed)
+        return scores, method_used, detailed
@@ -3,122 +3,385 @@ Pattern Analyzer - Enhanced version using OpenAI embeddings
 """
 
 import os
+import time
 import logging
-from typing import Dict, List, Tuple, Optional, Any # Updated Tuple and Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, List, Tuple, Optional, Any # Updated Tuple and Any
 from .embeddings import EmbeddingsManager, simple_word_similarity
+from .exemplars import DialectProfile, ExemplarScorer, exemplars_fingerprint
+from .metrics import METRICS
+from .cascade import CascadePlanner
+from .result_cache import ResultCache
+from .scorers import get_scorer, scorers_by_cost
+from .stylometry import StylometryModel
+from .timing import NULL_TIMER, StageTimer
+from .tokenizer import tokenize
+from .vector_index import VectorIndex, create_vector_index, load_vector_index
+from ..dialects.loader import load_dialect_exemplars, flatten_exemplars, dialect_corpus_version
+
+if TYPE_CHECKING:
+    from .term_matrix import DialectTermMatrix # scipy is imported on first use
 
 logger = logging.getLogger(__name__)
 
+INDEX_DIR = os.path.join('data', 'dialects', 'embeddings')
+
+# When a scorer can't score, the cheaper scorers of this chain are tried in turn
+FALLBACK_CHAIN = ("embeddings", "tfidf", "word_similarity")
+
+ANALYSES = METRICS.counter('echolens_analyses_total', "analyze_text calls by the method actually used", ['method'])
+ANALYSIS_DURATION = METRICS.histogram('echolens_analysis_duration_seconds',
+                                      "analyze_text wall-clock time by the method actually used", ['method'])
+ANALYSIS_FALLBACKS = METRICS.counter('echolens_analysis_fallbacks_total',
+                                     "Analyses answered by a cheaper scorer than the one requested",
+                                     ['requested', 'method'])
+DIALECT_WORD_FALLBACKS = METRICS.counter('echolens_dialect_word_fallbacks_total',
+                                         "Dialects scored by word similarity because their embedding was unavailable")
+RESULT_CACHE_LOOKUPS = METRICS.counter('echolens_result_cache_lookups_total',
+                                       "Result cache lookups by result (hit, miss)", ['result'])
+
+# Used when no sample files exist or the samples directory is empty
+FALLBACK_DIALECT_SAMPLES = {
+    "Silicon Valley Optimist": "We're building something truly transformative here. This could fundamentally reshape how people think about this space. We need to move fast and capture this opportunity while maintaining our core values.",
+    "Wellness Influencer": "I'm really holding space for this new chapter in my journey. The universe has been conspiring to bring me exactly what I need. I can feel my vibration shifting toward my highest self.",
+    "Fitness Enthusiast": "I'm absolutely crushing my goals right now. Hit a new PR yesterday and my nutrition is completely dialed in. The grind mindset is everything - you have to level up every single day.",
+    "Academic Researcher": "The theoretical framework employs post-structuralist discourse analysis to examine the underlying assumptions embedded within these linguistic patterns and their sociocultural implications.",
+    "Faith Community Leader": "I've been seeking wisdom on this decision and feel called to this new season. It's about walking in purpose and trusting the process, even when the path isn't completely clear."
+}
+
 class PatternAnalyzer:
     """
     Advanced pattern analyzer using OpenAI embeddings
+    
+    Safe to share between threads (e.g. one instance per process behind
+    st.cache_resource). Dialect state is published as copy-on-write
+    snapshots: readers use whichever dicts/models were current when they
+    started, and writers build replacements under a lock and swap them in.
     """
     
-    def __init__(self, embeddings_manager: Optional[EmbeddingsManager] = None):
+    def __init__(self, embeddings_manager: Optional[EmbeddingsManager] = None,
+                 index_kind: str = "ivf", top_k: Optional[int] = None,
+                 exemplar_top_k: int = 5, centroid_weight: float = 0.5,
+                 result_cache: Optional[ResultCache] = None,
+                 cascade_planner: Optional[CascadePlanner] = None,
+                 tfidf_mode: str = "vocabulary"):
         """
         Initialize the pattern analyzer
         
         Args:
             embeddings_manager: EmbeddingsManager instance (optional)
+            index_kind: Vector index backend for dialect embeddings ("ivf" or "brute_force")
+            top_k: Only score the k nearest dialects in embedding mode (default: score all)
+            exemplar_top_k: Number of nearest exemplars averaged into a dialect's score
+            centroid_weight: Weight of centroid similarity vs. nearest-exemplar similarity
+            result_cache: ResultCache for memoizing complete analyses (optional)
+            cascade_planner: Planner used for method="cascade" (default: CascadePlanner())
+            tfidf_mode: TF-IDF backend of the tfidf scorer ("vocabulary" or "hashing")
         """
         self.embeddings_manager = embeddings_manager
-        self.dialect_embeddings_cache: Dict[str, Optional[List[float]]] = {} # Type hint for clarity
+        self.dialect_embeddings_cache: Dict[str, Optional[List[float]]] = {} # Dialect centroids
+        self.dialect_profiles: Dict[str, Optional[DialectProfile]] = {}
+        self.index_kind = index_kind
+        self.top_k = top_k
+        self.exemplar_top_k = exemplar_top_k
+        self.centroid_weight = centroid_weight
+        self.dialect_index: Optional[VectorIndex] = None
+        # (profiles snapshot it was packed from, scorer)
+        self._exemplar_scorer: Optional[Tuple[Dict[str, Optional[DialectProfile]], ExemplarScorer]] = None
+        self.result_cache = result_cache
+        self.cascade_planner = cascade_planner or CascadePlanner()
+        self.tfidf_mode = tfidf_mode
+        self._term_matrix: Optional[Tuple[Tuple, "DialectTermMatrix"]] = None # (dialects key, matrix)
+        self._stylometry_model: Optional[Tuple[Tuple, StylometryModel]] = None # (exemplars key, model)
+        self._exemplars_snapshot: Optional[Tuple[str, Dict[str, List[str]]]] = None # (corpus version, exemplars)
+        self._fingerprint_memo: Dict[str, Tuple[List[str], str]] = {} # name -> (passages, fingerprint)
+        self._lock = threading.RLock() # Serializes writers of the shared dialect state
+        self._local = threading.local() # Per-thread active StageTimer and embedding reuse of the current analysis
+        
+    @property
+    def timer(self):
+        """StageTimer of the analysis running in this thread (a no-op timer if none)"""
+        return getattr(self._local, 'timer', NULL_TIMER)
+    
+    @contextmanager
+    def timing(self, timer: Optional[StageTimer]):
+        """Make `timer` the active timer for this thread while the block runs"""
+        if timer is None:
+            yield
+            return
+        previous = getattr(self._local, 'timer', None)
+        self._local.timer = timer
+        try:
+            yield
+        finally:
+            self._local.timer = previous if previous is not None else NULL_TIMER
+    
+    def load_dialect_exemplars(self) -> Dict[str, List[str]]:
+        """
+        Load example passages per dialect (single files or per-dialect directories)
+        
+        Files are only re-read when the corpus version (names, sizes and mtimes
+        of the sample files) changes; otherwise the same dicts are returned.
+        """
+        version = dialect_corpus_version()
+        cached = self._exemplars_snapshot
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        exemplars = load_dialect_exemplars()
+        if not exemplars: # Fallback samples if files don't exist or directory is empty
+            exemplars = {name: [text] for name, text in FALLBACK_DIALECT_SAMPLES.items()}
         
+        self._exemplars_snapshot = (version, exemplars)
+        return exemplars
+    
     def load_dialect_samples(self) -> Dict[str, str]:
         """Load dialect samples from files"""
-        samples: Dict[str, str] = {}
-        samples_dir = os.path.join('data', 'dialects', 'samples')
-        
-        if os.path.exists(samples_dir):
-            for filename in os.listdir(samples_dir):
-                if filename.endswith('.txt'):
-                    dialect_name = filename.replace('.txt', '').replace('_', ' ').title()
-                    try:
-                        with open(os.path.join(samples_dir, filename), 'r', encoding='utf-8') as f:
-                            content = f.read().strip()
-                            if content:  # Only add non-empty files
-                                samples[dialect_name] = content
-                    except Exception as e:
-                        logger.warning(f"Failed to load {filename}: {e}")
-        
-        if not samples: # Fallback samples if files don't exist or directory is empty
-            samples = {
-                "Silicon Valley Optimist": "We're building something truly transformative here. This could fundamentally reshape how people think about this space. We need to move fast and capture this opportunity while maintaining our core values.",
-                "Wellness Influencer": "I'm really holding space for this new chapter in my journey. The universe has been conspiring to bring me exactly what I need. I can feel my vibration shifting toward my highest self.",
-                "Fitness Enthusiast": "I'm absolutely crushing my goals right now. Hit a new PR yesterday and my nutrition is completely dialed in. The grind mindset is everything - you have to level up every single day.",
-                "Academic Researcher": "The theoretical framework employs post-structuralist discourse analysis to examine the underlying assumptions embedded within these linguistic patterns and their sociocultural implications.",
-                "Faith Community Leader": "I've been seeking wisdom on this decision and feel called to this new season. It's about walking in purpose and trusting the process, even when the path isn't completely clear."
-            }
-            
+        samples = flatten_exemplars(self.load_dialect_exemplars())
         logger.info(f"Loaded {len(samples)} dialect samples")
         return samples
     
-    def _prepare_dialect_embeddings(self, dialects: Dict[str, str]) -> Dict[str, Optional[List[float]]]:
+    def _prepare_dialect_profiles(self, exemplars: Dict[str, List[str]]) -> Dict[str, Optional[DialectProfile]]:
         """
-        Generate and cache embeddings for all dialects
+        Embed every dialect's passages in bulk and cache a profile per dialect
         
         Args:
-            dialects: Dictionary of dialect names to sample texts
+            exemplars: Dictionary of dialect names to lists of passages
             
         Returns:
-            Dictionary of dialect names to embeddings
+            Dictionary of dialect names to profiles (None if no passage could be embedded)
         """
         if not self.embeddings_manager:
             logger.warning("No embeddings manager available for preparing dialect embeddings.")
-            return {name: None for name in dialects.keys()} # Return None for all if no manager
+            return {name: None for name in exemplars.keys()} # Return None for all if no manager
         
-        missing_dialects = [name for name in dialects.keys() if name not in self.dialect_embeddings_cache]
+        fingerprints = self._fingerprints(exemplars)
         
-        if missing_dialects:
-            logger.info(f"Generating embeddings for {len(missing_dialects)} dialects")
-            
-            texts_to_embed = [dialects[name] for name in missing_dialects]
-            # Assuming get_embeddings_batch returns a Dict[str_text, Optional[List[float]]]
-            embeddings_result_map = self.embeddings_manager.get_embeddings_batch(texts_to_embed)
+        if self._missing_profiles(exemplars, fingerprints):
+            with self._lock:
+                # Another thread may have embedded them while we waited
+                missing_dialects = self._missing_profiles(exemplars, fingerprints)
+                if missing_dialects:
+                    self._embed_profiles(missing_dialects, exemplars, fingerprints)
+        
+        current = self.dialect_profiles
+        return {name: current.get(name) for name in exemplars.keys()}
+    
+    def _fingerprints(self, exemplars: Dict[str, List[str]]) -> Dict[str, str]:
+        """Content fingerprint per dialect, hashed once per loaded passage list"""
+        memo = self._fingerprint_memo
+        fingerprints = {}
+        for name, passages in exemplars.items():
+            entry = memo.get(name)
+            if entry is None or entry[0] is not passages:
+                entry = memo[name] = (passages, exemplars_fingerprint(passages))
+            fingerprints[name] = entry[1]
+        return fingerprints
+    
+    def _missing_profiles(self, exemplars: Dict[str, List[str]], fingerprints: Dict[str, str]) -> List[str]:
+        """Dialects never profiled, or whose passages changed since they were"""
+        current = self.dialect_profiles
+        return [
+            name for name in exemplars.keys()
+            if name not in current
+            or (current[name] is not None and current[name].fingerprint != fingerprints[name])
+        ]
+    
+    def _embed_profiles(self, missing_dialects: List[str], exemplars: Dict[str, List[str]],
+                        fingerprints: Dict[str, str]):
+        """Embed the missing dialects and publish new profile snapshots (caller holds the lock)"""
+        logger.info(f"Generating embeddings for {len(missing_dialects)} dialects")
+        
+        texts_to_embed = [text for name in missing_dialects for text in exemplars[name]]
+        # Reference passages are always embedded exactly, never borrowed from a near-duplicate
+        embeddings_result_map = self.embeddings_manager.get_embeddings_batch(texts_to_embed,
+                                                                             allow_near_duplicates=False)
+        
+        profiles = dict(self.dialect_profiles)
+        centroids = dict(self.dialect_embeddings_cache)
+        for dialect_name in missing_dialects:
+            embeddings = [
+                embeddings_result_map[text] for text in exemplars[dialect_name]
+                if embeddings_result_map.get(text)
+            ]
+            profile = DialectProfile(dialect_name, embeddings, fingerprints[dialect_name]) if embeddings else None
+            profiles[dialect_name] = profile
+            centroids[dialect_name] = profile.centroid.tolist() if profile else None
             
-            for dialect_name in missing_dialects:
-                dialect_text_content = dialects[dialect_name]
-                embedding = embeddings_result_map.get(dialect_text_content)
-                self.dialect_embeddings_cache[dialect_name] = embedding
-                
-                if embedding:
-                    logger.debug(f"Cached embedding for {dialect_name}")
-                else:
-                    logger.warning(f"Failed to get embedding for {dialect_name}")
+            if profile:
+                logger.debug(f"Cached {len(profile)} exemplar embeddings for {dialect_name}")
+            else:
+                logger.warning(f"Failed to get embedding for {dialect_name}")
         
+        # Swap in the new snapshots; readers holding the old dicts are unaffected
+        self.dialect_embeddings_cache = centroids
+        self.dialect_profiles = profiles
+    
+    def _prepare_dialect_embeddings(self, dialects: Dict[str, str]) -> Dict[str, Optional[List[float]]]:
+        """
+        Generate and cache embeddings for all dialects (one passage each)
+        
+        Args:
+            dialects: Dictionary of dialect names to sample texts
+            
+        Returns:
+            Dictionary of dialect names to embeddings
+        """
+        self._prepare_dialect_profiles({name: [text] for name, text in dialects.items()})
         return self.dialect_embeddings_cache
     
-    def analyze_with_embeddings(self, user_text: str, dialects: Dict[str, str]) -> Tuple[Dict[str, float], str]:
+    def _get_exemplar_scorer(self) -> ExemplarScorer:
+        """Pack all cached profiles into a single scorer (rebuilt only when profiles change)"""
+        cached = self._exemplar_scorer
+        if cached is not None and cached[0] is self.dialect_profiles:
+            return cached[1]
+        
+        with self._lock:
+            profiles = self.dialect_profiles
+            cached = self._exemplar_scorer
+            if cached is None or cached[0] is not profiles:
+                scorer = ExemplarScorer(
+                    {name: profile for name, profile in profiles.items() if profile},
+                    top_k=self.exemplar_top_k, centroid_weight=self.centroid_weight
+                )
+                cached = (profiles, scorer)
+                self._exemplar_scorer = cached
+            return cached[1]
+    
+    def _index_path(self) -> str:
+        """Location of the persisted dialect index, stored next to the dialect embeddings"""
+        model = getattr(self.embeddings_manager, 'model', 'default')
+        return os.path.join(INDEX_DIR, f"{self.index_kind}_{model}.npz")
+    
+    def _get_dialect_index(self, profiles: Dict[str, Optional[DialectProfile]]) -> VectorIndex:
+        """
+        Load (or build) the index of dialect centroids and insert any new or changed dialects
+        
+        The index is mutated in place, so callers must hold self._lock.
+        """
+        if self.dialect_index is None:
+            index = load_vector_index(self._index_path())
+            if index is None or index.kind != self.index_kind:
+                index = create_vector_index(self.index_kind)
+            self.dialect_index = index
+        
+        stale = [
+            name for name, profile in profiles.items()
+            if profile and self.dialect_index.fingerprint(name) != profile.fingerprint
+        ]
+        if stale:
+            self.dialect_index.add(
+                stale,
+                [profiles[name].centroid for name in stale],
+                fingerprints=[profiles[name].fingerprint for name in stale]
+            )
+            try:
+                self.dialect_index.save(self._index_path())
+            except Exception as e:
+                logger.warning(f"Failed to persist dialect index: {e}")
+        
+        return self.dialect_index
+    
+    def _score_with_index(self, user_embedding: List[float],
+                          profiles: Dict[str, Optional[DialectProfile]]) -> Dict[str, float]:
+        """
+        Select the top-k candidate dialects through the centroid index, then score
+        them against their exemplars
+        
+        Without top_k every dialect is scored exactly: an approximate index only
+        returns the dialects in its probed cells.
+        """
+        if self.top_k is None:
+            return self._score_brute_force(user_embedding, profiles)
+        
+        with self._lock:
+            index = self._get_dialect_index(profiles)
+            # Over-fetch by the number of indexed entries that aren't in the current dialect set
+            k = self.top_k + max(0, len(index) - len(profiles))
+            neighbours = index.query(user_embedding, k=k)
+        
+        candidates: List[str] = []
+        for dialect_name, _ in neighbours:
+            if profiles.get(dialect_name):
+                candidates.append(dialect_name)
+                if len(candidates) >= self.top_k:
+                    break
+        
+        scorer = self._get_exemplar_scorer()
+        if len(candidates) == len(scorer.names):
+            return scorer.score(user_embedding)
+        return scorer.score(user_embedding, names=candidates)
+    
+    def _score_brute_force(self, user_embedding: List[float],
+                           profiles: Dict[str, Optional[DialectProfile]]) -> Dict[str, float]:
+        """Exact scoring of every dialect (no top_k, or the index is unavailable)"""
+        scorer = self._get_exemplar_scorer()
+        names = [name for name, profile in profiles.items() if profile]
+        if len(names) == len(scorer.names):
+            return scorer.score(user_embedding)
+        return scorer.score(user_embedding, names=names)
+    
+    def analyze_with_embeddings(self, user_text: str, dialects: Dict[str, str],
+                                exemplars: Optional[Dict[str, List[str]]] = None) -> Tuple[Dict[str, float], str]:
         """
         Analyze user text using OpenAI embeddings.
         Returns scores and the analysis method string ("embeddings" or "word_similarity" if fallback).
+        
+        If `exemplars` is given, each dialect is scored against all of its passages
+        (centroid plus nearest exemplars); otherwise each sample text is one passage.
         """
         if not self.embeddings_manager:
             logger.warning("No embeddings manager - falling back to word similarity")
             return self.analyze_with_word_similarity(user_text, dialects)
         
-        user_embedding = self.embeddings_manager.get_embedding(user_text)
+        timer = self.timer
+        with timer.stage('embeddings.cache_lookup'):
+            cached = self.embeddings_manager.lookup_cached_embedding(user_text)
+        timer.record_cache('user_embedding', cached is not None)
+        user_embedding = cached.embedding if cached else None
+        if cached and cached.near_duplicate:
+            self._local.embedding_reuse = cached.reuse_info()
+        if user_embedding is None:
+            with timer.stage('embeddings.api'):
+                # The lookup above already missed; don't count a second one
+                user_embedding = self.embeddings_manager.get_embedding(user_text, skip_lookup=True)
         if not user_embedding:
             logger.warning("Failed to get user text embedding - falling back to word similarity")
             return self.analyze_with_word_similarity(user_text, dialects)
         
-        dialect_embeddings = self._prepare_dialect_embeddings(dialects)
+        return self.score_embedding(user_embedding, user_text, dialects, exemplars), "embeddings"
+    
+    def score_embedding(self, user_embedding: List[float], user_text: str, dialects: Dict[str, str],
+                        exemplars: Optional[Dict[str, List[str]]] = None) -> Dict[str, float]:
+        """
+        Score an already-computed user embedding against the dialects
         
-        similarities: Dict[str, float] = {}
-        for dialect_name, dialect_embedding in dialect_embeddings.items():
-            if dialect_embedding:
-                similarity_score = self.embeddings_manager.calculate_similarity(
-                    user_embedding, dialect_embedding
-                )
-                similarities[dialect_name] = similarity_score
-                logger.debug(f"{dialect_name} (embeddings): {similarity_score:.3f}")
-            else:
+        Dialects whose own embeddings are unavailable are scored by word similarity on `user_text`.
+        """
+        if exemplars is None:
+            exemplars = {name: [text] for name, text in dialects.items()}
+        timer = self.timer
+        with timer.stage('embeddings.dialect_profiles'):
+            profiles = self._prepare_dialect_profiles({name: exemplars[name] for name in dialects if name in exemplars})
+        
+        with timer.stage('embeddings.similarity'):
+            try:
+                similarities = self._score_with_index(user_embedding, profiles)
+            except Exception as e:
+                logger.warning(f"Vector index search failed: {e}. Using brute-force scoring.")
+                similarities = self._score_brute_force(user_embedding, profiles)
+        
+        for dialect_name in dialects:
+            if not profiles.get(dialect_name):
                 # Fallback to word similarity for this specific dialect if its embedding failed
                 word_similarity_score = simple_word_similarity(user_text, dialects[dialect_name])
                 similarities[dialect_name] = word_similarity_score
+                DIALECT_WORD_FALLBACKS.inc()
                 logger.debug(f"{dialect_name} (word fallback for dialect): {word_similarity_score:.3f}")
         
-        return similarities, "embeddings"
+        return similarities
     
     def analyze_with_word_similarity(self, user_text: str, dialects: Dict[str, str]) -> Tuple[Dict[str, float], str]:
         """
@@ -133,41 +396,143 @@ class PatternAnalyzer:
         logger.info("Used word similarity analysis (full fallback or direct call)")
         return similarities, "word_similarity"
     
-    def analyze_text(self, user_text: str, use_embeddings: bool = True) -> Tuple[Dict[str, float], str]:
+    def analyze_text(self, user_text: str, use_embeddings: bool = True, method: Optional[str] = None,
+                     trace: Optional[Dict[str, Any]] = None,
+                     timer: Optional[StageTimer] = None) -> Tuple[Dict[str, float], str]:
         """
-        Main analysis function - tries embeddings first, falls back to word similarity.
+        Main analysis function - tries embeddings first, falls back to TF-IDF, then word similarity.
         Returns scores and the actual analysis method string used.
+        
+        Args:
+            user_text: Text to analyze
+            use_embeddings: Use embeddings when available (ignored when `method` is given)
+            method: "cascade", or a registered scorer name such as "word_similarity",
+                    "stylometry", "tfidf" or "embeddings" (default: embeddings when
+                    available, otherwise TF-IDF; see FALLBACK_CHAIN)
+            trace: Optional dict that receives a 'stages' list recording which scorers ran, and
+                   'embedding_reuse' when the text's embedding was reused from a near-duplicate
+            timer: Optional StageTimer collecting per-stage timings and cache hits;
+                   when given with `trace`, trace['timings'] receives its summary
         """
+        self._local.embedding_reuse = None
+        start = time.perf_counter()
+        with self.timing(timer):
+            scores, actual_method_used, stages = self._analyze_text(user_text, use_embeddings, method)
+        ANALYSIS_DURATION.observe(time.perf_counter() - start, method=actual_method_used)
+        ANALYSES.inc(method=actual_method_used)
+        
+        if trace is not None:
+            trace['stages'] = stages
+            if self._local.embedding_reuse and actual_method_used == "embeddings":
+                trace['embedding_reuse'] = self._local.embedding_reuse
+            if timer is not None:
+                trace['timings'] = timer.to_dict()
+        return scores, actual_method_used
+    
+    def _analyze_text(self, user_text: str, use_embeddings: bool,
+                      method: Optional[str]) -> Tuple[Dict[str, float], str, List[Dict[str, Any]]]:
         scores: Dict[str, float] = {}
         actual_method_used: str = "unknown"
+        stages: List[Dict[str, Any]] = []
 
         if len(user_text.strip()) < 10: # Minimum length for meaningful analysis
             logger.warning("Text too short for analysis")
-            return scores, "not_analyzed_too_short"
-        
-        dialects = self.load_dialect_samples()
-        if not dialects:
-            logger.error("No dialect samples available for analysis")
-            return scores, "not_analyzed_no_dialects"
+            actual_method_used = "not_analyzed_too_short"
+        else:
+            with self.timer.stage('load_dialects'):
+                exemplars = self.load_dialect_exemplars()
+                dialects = flatten_exemplars(exemplars)
+            if not dialects:
+                logger.error("No dialect samples available for analysis")
+                actual_method_used = "not_analyzed_no_dialects"
+            elif method == "cascade":
+                scores, actual_method_used, stages = self.cascade_planner.run(self, user_text, dialects, exemplars)
+            else:
+                if method is None:
+                    if not self.embeddings_manager and use_embeddings:
+                        logger.info("Embeddings analysis requested but manager not available. Using local scorers.")
+                    method = self.default_method(use_embeddings)
+                scores, actual_method_used, stages = self._run_scorer(method, user_text, dialects, exemplars)
         
+        return scores, actual_method_used, stages
+    
+    def default_method(self, use_embeddings: bool = True) -> str:
+        """Method analyze_text runs when none is given"""
         if use_embeddings and self.embeddings_manager:
+            return "embeddings"
+        return "tfidf" if get_scorer("tfidf").is_available(self) else "word_similarity"
+    
+    def _run_scorer(self, method: str, user_text: str, dialects: Dict[str, str],
+                    exemplars: Dict[str, List[str]]) -> Tuple[Dict[str, float], str, List[Dict[str, Any]]]:
+        """Run a registered scorer, falling back to the cheaper scorers of FALLBACK_CHAIN if it can't score"""
+        scorer = get_scorer(method)
+        fallbacks = [fallback for fallback in scorers_by_cost(list(FALLBACK_CHAIN)) if fallback.cost < scorer.cost]
+        stages: List[Dict[str, Any]] = []
+        
+        for candidate in [scorer] + fallbacks[::-1]:
+            record: Dict[str, Any] = {'scorer': candidate.name, 'cost': candidate.cost, 'ran': False}
+            stages.append(record)
+            if not candidate.is_available(self):
+                record['skipped'] = 'unavailable'
+                continue
+            
+            record['ran'] = True
             try:
-                scores, actual_method_used = self.analyze_with_embeddings(user_text, dialects)
+                scores = candidate.score(self, user_text, dialects, exemplars)
             except Exception as e:
-                logger.error(f"Embeddings analysis failed: {e}. Falling back to word similarity.")
-                scores, actual_method_used = self.analyze_with_word_similarity(user_text, dialects)
-        else:
-            if not self.embeddings_manager and use_embeddings:
-                logger.info("Embeddings analysis requested but manager not available. Using word similarity.")
-            scores, actual_method_used = self.analyze_with_word_similarity(user_text, dialects)
+                logger.error(f"{candidate.name} analysis failed: {e}. Falling back to a cheaper scorer.")
+                scores = None
+            if scores:
+                if candidate is not scorer:
+                    ANALYSIS_FALLBACKS.inc(requested=scorer.name, method=candidate.name)
+                return scores, candidate.name, stages
+            record['error'] = True
         
-        return scores, actual_method_used
+        return {}, "not_analyzed_scorer_failed", stages
     
-    def get_detailed_analysis(self, user_text: str, dialect_scores: Dict[str, float], actual_method_used: str) -> Dict[str, Any]:
+    def get_term_matrix(self, dialects: Dict[str, str]) -> "DialectTermMatrix":
+        """Sparse dialect x term matrix, rebuilt only when the dialect texts change"""
+        from .term_matrix import DialectTermMatrix
+        key = tuple(sorted((name, hash(text)) for name, text in dialects.items()))
+        cached = self._term_matrix
+        if cached is None or cached[0] != key:
+            with self._lock:
+                cached = self._term_matrix
+                if cached is None or cached[0] != key:
+                    cached = (key, DialectTermMatrix(dialects))
+                    self._term_matrix = cached
+        return cached[1]
+    
+    def get_stylometry_model(self, exemplars: Dict[str, List[str]]) -> StylometryModel:
+        """Dialect style profiles, recomputed only when the dialect passages change"""
+        key = tuple(sorted((name, hash(tuple(passages))) for name, passages in exemplars.items()))
+        cached = self._stylometry_model
+        if cached is None or cached[0] != key:
+            with self._lock:
+                cached = self._stylometry_model
+                if cached is None or cached[0] != key:
+                    cached = (key, StylometryModel(exemplars))
+                    self._stylometry_model = cached
+        return cached[1]
+    
+    def get_detailed_analysis(self, user_text: str, dialect_scores: Dict[str, float], actual_method_used: str,
+                              trace: Optional[Dict[str, Any]] = None,
+                              timer: Optional[StageTimer] = None) -> Dict[str, Any]:
         """
         Get detailed analysis including word patterns and insights.
         Now takes actual_method_used as an argument.
+        Entries of `trace` (e.g. 'stages' from analyze_text) are copied into the result.
+        With a `timer`, the result's 'timings' field summarizes every stage it recorded.
         """
+        trace = dict(trace or {})
+        with self.timing(timer):
+            detailed = self._get_detailed_analysis(user_text, dialect_scores, actual_method_used, trace)
+        if timer is not None:
+            detailed['timings'] = timer.to_dict()
+        return detailed
+    
+    def _get_detailed_analysis(self, user_text: str, dialect_scores: Dict[str, float], actual_method_used: str,
+                               trace: Dict[str, Any]) -> Dict[str, Any]:
         if not dialect_scores: # No scores to analyze
             return {
                 'top_dialect': None,
@@ -176,27 +541,22 @@ class PatternAnalyzer:
                 'avg_score': 0.0,
                 'uniqueness': 100.0, # Max uniqueness if no scores
                 'meaningful_words': [],
-                'word_count': len(user_text.split()),
-                'analysis_method': actual_method_used # Still report the method attempted/used
+                'explanations': {},
+                'word_count': len(tokenize(user_text)),
+                'analysis_method': actual_method_used, # Still report the method attempted/used
+                **trace
             }
         
         sorted_scores_list = sorted(dialect_scores.items(), key=lambda x: x[1], reverse=True)
         top_dialect, top_score = sorted_scores_list[0]
         
-        dialects = self.load_dialect_samples() # For word analysis consistency
+        with self.timer.stage('details.load_dialects'):
+            dialects = self.load_dialect_samples() # For word analysis consistency
         
-        user_words = set(user_text.lower().split())
-        dialect_words = set(dialects.get(top_dialect, "").lower().split()) # Safe get
-        common_words = user_words.intersection(dialect_words)
-        
-        stop_words = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 
-                     'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 
-                     'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 
-                     'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 
-                     'we', 'they', 'me', 'him', 'her', 'us', 'them', 'my', 'your', 'his', 
-                     'hers', 'its', 'our', 'their'}
-        
-        meaningful_words = common_words - stop_words
+        # Shared-term explanations for every dialect in one sparse pass
+        with self.timer.stage('details.explain'):
+            explanations = self.get_term_matrix(dialects).explain(user_text)
+        meaningful_words = explanations.get(top_dialect, {}).get('shared_terms', []) # Safe get
         
         # Calculate metrics (already correct)
         avg_score_val = sum(dialect_scores.values()) / len(dialect_scores)
@@ -208,11 +568,124 @@ class PatternAnalyzer:
             'sorted_scores': sorted_scores_list,
             'avg_score': avg_score_val,
             'uniqueness': uniqueness_val,
-            'meaningful_words': sorted(list(meaningful_words)), # Sort for consistent output
-            'word_count': len(user_text.split()),
-            'analysis_method': actual_method_used # Use the passed-in method
+            'meaningful_words': meaningful_words, # Already sorted for consistent output
+            'explanations': explanations,
+            'word_count': len(tokenize(user_text)),
+            'analysis_method': actual_method_used, # Use the passed-in method
+            **trace
         }
 
+    def result_cache_key(self, user_text: str, method: str) -> Optional[str]:
+        """
+        Cache key for a complete analysis of `user_text` with the requested method
+        
+        Returns None when no result cache is configured.
+        """
+        if not self.result_cache:
+            return None
+        parts = []
+        embedded = method.startswith('embeddings')
+        if embedded or method == "cascade":
+            # A cascade can escalate to embeddings, so its results depend on the model
+            # and the exemplar/index settings too
+            parts.append(getattr(self.embeddings_manager, 'model', None))
+            parts.append(f"exemplars-{self.exemplar_top_k}-{self.centroid_weight}"
+                         f"-index-{self.index_kind}-{self.top_k}")
+        if self.tfidf_mode != "vocabulary" and method in ("tfidf", "cascade"):
+            # Hashed TF-IDF scores differ from the fitted ones; default-mode keys are unchanged
+            parts.append(f"tfidf-{self.tfidf_mode}")
+        if method == "cascade":
+            parts.append(f"planner-{self.cascade_planner.fingerprint}")
+        model = "+".join(part for part in parts if part) or None
+        # Embeddings score the canonical text; every other scorer (including a cascade's
+        # cheap stages) sees the exact characters, so only embedding keys are canonicalized
+        return ResultCache.make_key(user_text, dialect_corpus_version(), method, model, canonical=embedded)
+    
+    def load_cached_result(self, key: Optional[str]) -> Optional[Tuple[Dict[str, float], str, Dict[str, Any]]]:
+        """Return (scores, method_used, detailed_analysis) from the result cache, if present"""
+        if not key:
+            return None
+        cached = self.result_cache.get(key)
+        if not cached:
+            return None
+        detailed = cached['detailed']
+        detailed['sorted_scores'] = [tuple(item) for item in detailed.get('sorted_scores', [])]
+        return cached['scores'], cached['method_used'], detailed
+    
+    def store_result(self, key: Optional[str], scores: Dict[str, float], method_used: str,
+                     detailed: Dict[str, Any]):
+        """Save a complete analysis in the result cache (timings describe one run and aren't stored)"""
+        if key:
+            detailed = {name: value for name, value in detailed.items() if name != 'timings'}
+            self.result_cache.put(key, {'scores': scores, 'method_used': method_used, 'detailed': detailed})
+    
+    def analyze_with_details(self, user_text: str, use_embeddings: bool = True, method: Optional[str] = None,
+                             collect_timings: bool = False) -> Tuple[Dict[str, float], str, Dict[str, Any]]:
+        """
+        Run analyze_text and get_detailed_analysis, memoized through the result cache.
+        Returns scores, the actual method used and the detailed analysis dict.
+        
+        Results are only cached when the requested method actually ran, so a
+        transient embeddings failure doesn't pin a word-similarity result.
+        With collect_timings, the detailed analysis carries a 'timings' field.
+        """
+        timer = StageTimer() if collect_timings else None
+        requested_method = method or self.default_method(use_embeddings)
+        with (timer or NULL_TIMER).stage('result_cache.lookup'):
+            key = self.result_cache_key(user_text, requested_method)
+            cached = self.load_cached_result(key)
+        if key:
+            RESULT_CACHE_LOOKUPS.inc(result='hit' if cached else 'miss')
+        if timer and key:
+            timer.record_cache('result', cached is not None)
+        if cached:
+            logger.info("Result cache hit")
+            if timer:
+                cached[2]['timings'] = timer.to_dict()
+            return cached
+        
+        trace: Dict[str, Any] = {}
+        scores, method_used = self.analyze_text(user_text, use_embeddings=use_embeddings, method=method,
+                                                trace=trace, timer=timer)
+        detailed = self.get_detailed_analysis(user_text, scores, method_used, trace, timer=timer)
+        if self._is_cacheable(requested_method, method_used, trace):
+            self.store_result(key, scores, method_used, detailed)
+        return scores, method_used, detailed
+    
+    def analyze_batch(self, user_texts: List[str], use_embeddings: bool = True, method: Optional[str] = None,
+                      max_workers: int = 4) -> List[Tuple[Dict[str, float], str]]:
+        """
+        Analyze several texts, in parallel, returning (scores, method used) per text in input order
+        
+        When the batch will be scored with embeddings, all of its texts are embedded
+        up front in multi-input API calls (warming the embedding cache), so the
+        per-text analyses don't each make their own round trip.
+        """
+        requested_method = method or self.default_method(use_embeddings)
+        if requested_method == "embeddings" and self.embeddings_manager:
+            texts_to_embed = [text for text in user_texts if len(text.strip()) >= 10]
+            if texts_to_embed:
+                try:
+                    self.embeddings_manager.get_embeddings_batch(texts_to_embed)
+                except Exception as e:
+                    logger.warning(f"Batch embedding failed: {e}. Texts will be embedded individually.")
+        
+        if max_workers <= 1 or len(user_texts) <= 1:
+            return [self.analyze_text(text, use_embeddings=use_embeddings, method=method) for text in user_texts]
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="echolens-batch") as pool:
+            return list(pool.map(
+                lambda text: self.analyze_text(text, use_embeddings=use_embeddings, method=method), user_texts
+            ))
+    
+    @staticmethod
+    def _is_cacheable(requested_method: str, method_used: str, trace: Dict[str, Any]) -> bool:
+        """A result is cacheable if analysis ran and no stage failed along the way"""
+        if method_used.startswith("not_analyzed"):
+            return False
+        if requested_method == "cascade":
+            return not any(stage.get('error') for stage in trace.get('stages', []))
+        return method_used == requested_method
+
 # Convenience function for backward compatibility or other uses
 # Note: The main Streamlit app will likely call methods on an analyzer instance.
 def analyze_text_patterns(user_text: str, dialects: Dict[str, str] = None, 
@@ -0,0 +1,129 @@
+"""
+EchoLens Progressive Analysis Module
+Quick local result immediately, refined (embedding-based) result from a background worker
+"""
+
+import time
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .pattern_analyzer import PatternAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# scores, method_used, detailed analysis
+AnalysisResult = Tuple[Dict[str, float], str, Dict[str, Any]]
+
+BACKGROUND_WORKERS = 4
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_background_executor() -> ThreadPoolExecutor:
+    """Process-wide worker pool for background analyses"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS,
+                                               thread_name_prefix="echolens-analysis")
+    return _executor
+
+
+class ProgressiveAnalysis:
+    """
+    An analysis that improves over time
+
+    `quick` is available as soon as the object exists; `refine`, if given, runs
+    on a background worker. result() returns the refined result once it has
+    finished successfully and the quick one until then (or if refining fails).
+    """
+
+    def __init__(self, quick: AnalysisResult, refine: Optional[Callable[[], AnalysisResult]] = None,
+                 quick_ms: float = 0.0, executor: Optional[ThreadPoolExecutor] = None):
+        self.quick = quick
+        self.quick_ms = quick_ms
+        self.started = time.perf_counter()
+        self.refined_ms: Optional[float] = None
+        self.future: Optional[Future] = None
+        self._refined: Optional[Tuple[Optional[AnalysisResult]]] = None # Memoized once the future is done
+        if refine is not None:
+            self.future = (executor or get_background_executor()).submit(self._run_refine, refine)
+
+    def _run_refine(self, refine: Callable[[], AnalysisResult]) -> AnalysisResult:
+        try:
+            return refine()
+        finally:
+            self.refined_ms = (time.perf_counter() - self.started) * 1000
+
+    @property
+    def done(self) -> bool:
+        """True once no further refinement is coming"""
+        return self.future is None or self.future.done()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait up to `timeout` seconds for refinement; returns done"""
+        if self.future is not None:
+            try:
+                self.future.result(timeout=timeout)
+            except Exception:
+                pass
+        return self.done
+
+    def refined(self) -> Optional[AnalysisResult]:
+        """The refined result, if it finished and actually analyzed the text"""
+        if self.future is None or not self.future.done():
+            return None
+        if self._refined is None:
+            try:
+                result = self.future.result()
+            except Exception as e:
+                logger.error(f"Background analysis failed: {e}")
+                result = None
+            if result and (not result[0] or result[1].startswith("not_analyzed")):
+                result = None
+            self._refined = (result,)
+        return self._refined[0]
+
+    def result(self) -> AnalysisResult:
+        """Best result available right now"""
+        return self.refined() or self.quick
+
+    @property
+    def stages(self) -> List[Dict[str, Any]]:
+        """One record per phase: {'stage', 'method', 'status', 'ms'}"""
+        stages = [{'stage': 'quick', 'method': self.quick[1], 'status': 'complete', 'ms': self.quick_ms}]
+        if self.future is not None:
+            if not self.future.done():
+                status, method = 'running', None
+            else:
+                refined = self.refined()
+                status = 'complete' if refined else 'failed'
+                method = refined[1] if refined else None
+            stages.append({'stage': 'refine', 'method': method, 'status': status, 'ms': self.refined_ms})
+        return stages
+
+
+def start_progressive_analysis(analyzer: PatternAnalyzer, user_text: str,
+                               refine: Optional[Callable[[], AnalysisResult]] = None,
+                               collect_timings: bool = False) -> ProgressiveAnalysis:
+    """
+    Analyze with local scorers now and, when embeddings are available, refine in the background
+
+    Args:
+        analyzer: Analyzer used for both passes
+        user_text: Text to analyze
+        refine: Callable producing the refined result (default: analyzer.analyze_with_details)
+        collect_timings: Collect per-stage timings in both passes
+    """
+    started = time.perf_counter()
+    quick = analyzer.analyze_with_details(user_text, use_embeddings=False, collect_timings=collect_timings)
+    quick_ms = (time.perf_counter() - started) * 1000
+
+    if not analyzer.embeddings_manager:
+        return ProgressiveAnalysis(quick, quick_ms=quick_ms)
+    if refine is None:
+        refine = lambda: analyzer.analyze_with_details(user_text, collect_timings=collect_timings)
+    return ProgressiveAnalysis(quick, refine, quick_ms=quick_ms)
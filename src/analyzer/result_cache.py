@@ -0,0 +1,169 @@
+"""
+EchoLens Result Cache Module
+Memoizes complete analysis results in memory and on disk
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from .tokenizer import canonicalize
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for cache keying
+
+    Uses the same canonical form as embedding cache keys (NFKC, ASCII
+    quotes/dashes, collapsed whitespace), so texts that share an embedding
+    also share a result.
+    """
+    return canonicalize(text)
+
+
+class ResultCache:
+    """
+    Two-level cache for final analysis results
+
+    A bounded in-memory LRU sits in front of a SQLite file holding
+    zlib-compressed JSON payloads. The disk store is trimmed to
+    `max_disk_entries` by least-recent access. Safe to share across threads.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_memory_entries: int = 512,
+                 max_disk_entries: int = 50000, persist: bool = True):
+        """
+        Args:
+            path: SQLite file (default: data/results_cache/results.sqlite3)
+            max_memory_entries: Entries kept in the in-memory LRU
+            max_disk_entries: Entries kept on disk before the least recently used are evicted
+            persist: Set to False for a memory-only cache
+        """
+        self.path = path or os.path.join('data', 'results_cache', 'results.sqlite3')
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes_since_trim = 0
+        self.hits = 0
+        self.misses = 0
+
+        if persist:
+            self._open()
+
+    def _open(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, payload BLOB NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+            self._conn.commit()
+        except Exception as e:
+            logger.warning(f"Result cache running memory-only: {e}")
+            self._conn = None
+
+    @staticmethod
+    def make_key(text: str, corpus_version: str, method: str, model: Optional[str],
+                 canonical: bool = True) -> str:
+        """
+        Build a cache key from the text, dialect corpus version, method and model
+
+        With `canonical`, the text is normalized first; only do that for methods
+        that score the canonical text (embeddings), since the others measure the
+        raw characters.
+        """
+        text_hash = hashlib.sha256((normalize_text(text) if canonical else text).encode()).hexdigest()
+        return f"{text_hash}:{corpus_version}:{method}:{model or '-'}"
+
+    def _remember(self, key: str, encoded: bytes):
+        self._memory[key] = encoded
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for a key, or None"""
+        with self._lock:
+            encoded = self._memory.get(key)
+            if encoded is not None:
+                self._memory.move_to_end(key)
+            elif self._conn is not None:
+                try:
+                    row = self._conn.execute("SELECT payload FROM results WHERE key = ?", (key,)).fetchone()
+                    if row:
+                        encoded = zlib.decompress(row[0])
+                        self._conn.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+                        self._conn.commit()
+                        self._remember(key, encoded)
+                except Exception as e:
+                    logger.warning(f"Failed to read result cache: {e}")
+
+            if encoded is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(encoded)
+
+    def put(self, key: str, value: Dict[str, Any]):
+        """Store a JSON-serializable result"""
+        encoded = json.dumps(value, separators=(',', ':'), default=float).encode()
+        with self._lock:
+            self._remember(key, encoded)
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO results (key, payload, accessed) VALUES (?, ?, ?)",
+                    (key, zlib.compress(encoded), time.time())
+                )
+                self._writes_since_trim += 1
+                if self._writes_since_trim >= 100:
+                    self._trim()
+                self._conn.commit()
+            except Exception as e:
+                logger.warning(f"Failed to write result cache: {e}")
+
+    def _trim(self):
+        """Evict least recently accessed rows beyond max_disk_entries (lock held)"""
+        self._writes_since_trim = 0
+        count = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        excess = count - self.max_disk_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY accessed LIMIT ?)",
+                (excess,)
+            )
+            logger.info(f"Evicted {excess} cached results")
+
+    def clear(self):
+        """Remove all cached results"""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM results")
+                self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics about the cache"""
+        with self._lock:
+            disk_entries = 0
+            if self._conn is not None:
+                disk_entries = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            return {
+                'memory_entries': len(self._memory),
+                'disk_entries': disk_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
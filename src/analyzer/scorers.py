@@ -0,0 +1,110 @@
+"""
+EchoLens Scorers Module
+Registry of dialect scorers, each declaring its relative cost
+"""
+
+import importlib.util
+import logging
+from typing import Callable, Dict, List, Optional
+from .timing import NULL_TIMER
+
+logger = logging.getLogger(__name__)
+
+# Relative cost tiers; a cascade runs cheaper scorers first
+COST_LEXICAL = 1        # set overlap on cached tokens
+COST_SPARSE = 5         # sparse vector models (TF-IDF)
+COST_LOCAL_VECTORS = 20 # dense vectors computed locally
+COST_API = 1000         # paid, network-bound embedding calls
+
+# score_fn(analyzer, user_text, dialects, exemplars) -> {dialect: score} or None on failure
+ScoreFn = Callable[..., Optional[Dict[str, float]]]
+
+
+class Scorer:
+    """
+    A named dialect scoring strategy with a declared cost
+
+    Args:
+        name: Method name reported in results
+        cost: Relative cost (see COST_* tiers)
+        score_fn: Callable returning dialect scores, or None if it could not score
+        is_available: Optional callable(analyzer) -> bool, e.g. requires an API key
+        label: Display name shown with results (default: the name)
+    """
+
+    def __init__(self, name: str, cost: float, score_fn: ScoreFn,
+                 is_available: Optional[Callable[..., bool]] = None, label: Optional[str] = None):
+        self.name = name
+        self.cost = cost
+        self.score_fn = score_fn
+        self.is_available = is_available or (lambda analyzer: True)
+        self.label = label or name.replace('_', ' ').title()
+
+    def score(self, analyzer, user_text: str, dialects: Dict[str, str],
+              exemplars: Optional[Dict[str, List[str]]] = None) -> Optional[Dict[str, float]]:
+        timer = getattr(analyzer, 'timer', NULL_TIMER)
+        with timer.stage(f"scorer.{self.name}"):
+            return self.score_fn(analyzer, user_text, dialects, exemplars)
+
+
+SCORER_REGISTRY: Dict[str, Scorer] = {}
+
+
+def register_scorer(name: str, cost: float, is_available: Optional[Callable[..., bool]] = None,
+                    label: Optional[str] = None):
+    """
+    Decorator registering a score function under `name`
+
+    Example:
+        @register_scorer("my_model", cost=COST_LOCAL_VECTORS, label="🧪 My Model")
+        def score_my_model(analyzer, user_text, dialects, exemplars):
+            ...
+    """
+    def decorator(score_fn: ScoreFn) -> ScoreFn:
+        SCORER_REGISTRY[name] = Scorer(name, cost, score_fn, is_available, label)
+        return score_fn
+    return decorator
+
+
+def get_scorer(name: str) -> Scorer:
+    if name not in SCORER_REGISTRY:
+        raise ValueError(f"Unknown scorer '{name}'. Available: {sorted(SCORER_REGISTRY)}")
+    return SCORER_REGISTRY[name]
+
+
+def scorers_by_cost(names: Optional[List[str]] = None) -> List[Scorer]:
+    """Registered scorers (optionally a subset), cheapest first"""
+    selected = [get_scorer(name) for name in names] if names else list(SCORER_REGISTRY.values())
+    return sorted(selected, key=lambda scorer: scorer.cost)
+
+
+@register_scorer("word_similarity", cost=COST_LEXICAL, label="📝 Word Pattern Analysis")
+def _score_word_similarity(analyzer, user_text, dialects, exemplars):
+    return analyzer.analyze_with_word_similarity(user_text, dialects)[0]
+
+
+@register_scorer("stylometry", cost=COST_LOCAL_VECTORS, label="✍️ Writing Style Analysis (Stylometry)")
+def _score_stylometry(analyzer, user_text, dialects, exemplars):
+    exemplars = exemplars or {name: [text] for name, text in dialects.items()}
+    return analyzer.get_stylometry_model(exemplars).score(user_text)
+
+
+def _tfidf_available(analyzer) -> bool:
+    # find_spec checks installability without paying for the import
+    return importlib.util.find_spec("sklearn") is not None
+
+
+@register_scorer("tfidf", cost=COST_SPARSE, is_available=_tfidf_available,
+                 label="🔤 Vocabulary Analysis (TF-IDF)")
+def _score_tfidf(analyzer, user_text, dialects, exemplars):
+    from .similarity_analyzer import get_shared_analyzer
+    mode = getattr(analyzer, 'tfidf_mode', 'vocabulary')
+    return get_shared_analyzer(dialects, mode=mode).analyze(user_text)[0]
+
+
+@register_scorer("embeddings", cost=COST_API,
+                 is_available=lambda analyzer: analyzer.embeddings_manager is not None,
+                 label="🤖 AI Semantic Analysis")
+def _score_embeddings(analyzer, user_text, dialects, exemplars):
+    scores, method = analyzer.analyze_with_embeddings(user_text, dialects, exemplars)
+    return scores if method == "embeddings" else None
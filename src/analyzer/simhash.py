@@ -0,0 +1,92 @@
+"""
+EchoLens SimHash Module
+64-bit SimHash fingerprints and a Hamming-distance index for near-duplicate texts
+"""
+
+import hashlib
+import logging
+import threading
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from .tokenizer import tokenize
+
+logger = logging.getLogger(__name__)
+
+SIMHASH_BITS = 64
+SHINGLE_SIZE = 2
+MIN_SIMHASH_TOKENS = 8 # Shorter texts are too sparse for a meaningful fingerprint
+
+_BIT_POSITIONS = np.arange(SIMHASH_BITS, dtype=np.uint64)
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def simhash(text: str, shingle_size: int = SHINGLE_SIZE) -> Optional[int]:
+    """
+    64-bit SimHash of a text's word shingles, or None if it has too few words
+
+    Texts that differ in a small fraction of their shingles (whitespace,
+    punctuation, a changed greeting or signature line) get fingerprints a
+    few bits apart; unrelated texts differ in about half their bits.
+    """
+    tokens = tokenize(text)
+    if len(tokens) < MIN_SIMHASH_TOKENS:
+        return None
+    shingles = {" ".join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)}
+    hashes = np.fromiter((_feature_hash(shingle) for shingle in shingles), dtype=np.uint64, count=len(shingles))
+    bits = (hashes[:, None] >> _BIT_POSITIONS) & np.uint64(1)
+    votes = 2 * bits.sum(axis=0).astype(np.int64) - len(shingles)
+    return sum(1 << int(position) for position in np.flatnonzero(votes > 0))
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+class SimHashIndex:
+    """
+    Finds a stored fingerprint within `max_distance` bits of a query
+
+    Fingerprints are split into max_distance + 1 blocks; by the pigeonhole
+    principle two fingerprints within the distance agree exactly on at least
+    one block, so only entries sharing a block are compared. Thread-safe.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        if not 0 <= max_distance < SIMHASH_BITS:
+            raise ValueError(f"max_distance must be in [0, {SIMHASH_BITS})")
+        self.max_distance = max_distance
+        block_count = max_distance + 1
+        edges = [round(i * SIMHASH_BITS / block_count) for i in range(block_count + 1)]
+        self._blocks = [(start, (1 << (end - start)) - 1) for start, end in zip(edges, edges[1:])]
+        self._tables: List[Dict[int, List[Tuple[int, str]]]] = [{} for _ in self._blocks]
+        self._keys: Dict[int, str] = {} # fingerprint -> key (first one wins)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, fingerprint: int, key: str) -> bool:
+        """Store `fingerprint` under `key`; False if it was already stored"""
+        with self._lock:
+            if fingerprint in self._keys:
+                return False
+            self._keys[fingerprint] = key
+            for table, (shift, mask) in zip(self._tables, self._blocks):
+                table.setdefault((fingerprint >> shift) & mask, []).append((fingerprint, key))
+            return True
+
+    def query(self, fingerprint: int) -> Optional[Tuple[str, int]]:
+        """(key, distance) of the closest stored fingerprint within max_distance, or None"""
+        with self._lock:
+            if fingerprint in self._keys:
+                return self._keys[fingerprint], 0
+            best: Optional[Tuple[str, int]] = None
+            for table, (shift, mask) in zip(self._tables, self._blocks):
+                for candidate, key in table.get((fingerprint >> shift) & mask, ()):
+                    distance = hamming_distance(fingerprint, candidate)
+                    if distance <= self.max_distance and (best is None or distance < best[1]):
+                        best = (key, distance)
+            return best
@@ -1,63 +1,476 @@
+import os
+import glob
+import hashlib
+import logging
+import tempfile
+import threading
 import numpy as np
-import pandas as pd
-from typing import Dict, Tuple
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from scipy import sparse
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+
+logger = logging.getLogger(__name__)
+
+TFIDF_DIR = os.path.join('data', 'dialects', 'embeddings')
+# Persisted fits kept per cache directory; the least recently used ones are pruned
+TFIDF_FITS_MAX = 8
+# "vocabulary": fitted TfidfVectorizer; "hashing": HashingSimilarityAnalyzer, for large or growing corpora
+TFIDF_MODES = ('vocabulary', 'hashing')
+
+# Fitted analyzers shared by every session and thread in the process
+SHARED_ANALYZERS_MAX = 4
+_shared_analyzers: Dict[Tuple, Union["SimilarityAnalyzer", "HashingSimilarityAnalyzer"]] = {}
+_shared_lock = threading.Lock()
+
+
+class TopTerm(NamedTuple):
+    """A user-text term and its TF-IDF weight"""
+    term: str
+    weight: float
+
 
 class SimilarityAnalyzer:
     """
     Simple TF-IDF + cosine-similarity based influence detector.
+
+    The vectorizer is fitted once on the dialect corpus (or loaded from a
+    persisted fit); each request only transforms the user text. Everything
+    stays in CSR form: rows are L2-normalized, so one sparse product gives
+    the cosine similarity to every dialect.
     """
 
     def __init__(
         self,
         dialects: Dict[str, str],
         ngram_range: Tuple[int,int] = (1,2),
-        max_features: int = 5000
+        max_features: int = 5000,
+        fit: bool = True
     ):
         self.dialect_names = list(dialects.keys())
         self.dialect_texts = list(dialects.values())
+        self.ngram_range = tuple(ngram_range)
+        self.max_features = max_features
 
-        # Configure a single TF-IDF vectorizer for both dialects + user text
+        # Vocabulary and IDF come from the dialect corpus only
         self.vectorizer = TfidfVectorizer(
             ngram_range=ngram_range,
             stop_words='english',
             max_features=max_features
         )
+        self.dialect_matrix = None
+        self.feature_names: Optional[np.ndarray] = None
+
+        if fit:
+            self.fit()
+
+    @property
+    def fingerprint(self) -> str:
+        """Identifies the dialect corpus and vectorizer parameters a fit belongs to"""
+        digest = hashlib.md5(repr((self.ngram_range, self.max_features)).encode())
+        for name, text in zip(self.dialect_names, self.dialect_texts):
+            digest.update(name.encode())
+            digest.update(text.encode())
+        return digest.hexdigest()
+
+    def fit(self) -> "SimilarityAnalyzer":
+        """Fit vocabulary and IDF on the dialect corpus"""
+        self.dialect_matrix = self.vectorizer.fit_transform(self.dialect_texts)
+        self.feature_names = np.array(self.vectorizer.get_feature_names_out())
+        return self
+
+    def transform(self, user_texts: List[str]):
+        """TF-IDF vectors (sparse, L2-normalized rows) for a batch of user texts"""
+        return self.vectorizer.transform(user_texts)
+
+    def _top_terms(self, user_matrix, row: int, top_n_terms: int) -> List[TopTerm]:
+        """Highest-weighted terms of one user row, selected among its nonzeros only"""
+        start, end = user_matrix.indptr[row], user_matrix.indptr[row + 1]
+        indices = user_matrix.indices[start:end]
+        weights = user_matrix.data[start:end]
+        k = min(top_n_terms, len(weights))
+        if k == 0:
+            return []
+        top = np.argpartition(-weights, k - 1)[:k]
+        top = top[np.argsort(-weights[top], kind='stable')]
+        return [TopTerm(str(self.feature_names[indices[i]]), float(weights[i])) for i in top]
+
+    def analyze_batch(
+        self,
+        user_texts: List[str],
+        top_n_terms: int = 10
+    ) -> List[Tuple[Dict[str, float], List[TopTerm]]]:
+        """
+        Score several user texts against the fitted dialect corpus in one sparse product
+        """
+        user_matrix = self.transform(user_texts).tocsr()
+        similarities = (user_matrix @ self.dialect_matrix.T).tocsr()
+
+        results = []
+        for row in range(user_matrix.shape[0]):
+            influence_scores = dict.fromkeys(self.dialect_names, 0.0)
+            start, end = similarities.indptr[row], similarities.indptr[row + 1]
+            for col, value in zip(similarities.indices[start:end], similarities.data[start:end]):
+                influence_scores[self.dialect_names[col]] = float(value)
+            results.append((influence_scores, self._top_terms(user_matrix, row, top_n_terms)))
+        return results
+
+    def analyze(
+        self,
+        user_text: str,
+        top_n_terms: int = 10
+    ) -> Tuple[Dict[str, float], List[TopTerm]]:
+        """
+        Returns:
+          - influence_scores: cosine similarity between user_text and each dialect
+          - top_terms: up to top_n_terms (term, weight) pairs from user_text by TF-IDF weight
+        """
+        return self.analyze_batch([user_text], top_n_terms)[0]
+
+    def save(self, path: str):
+        """
+        Persist the fitted vocabulary and IDF as plain arrays (npz, no pickled objects)
+        """
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        vocabulary = self.vectorizer.vocabulary_
+        terms = np.array(sorted(vocabulary, key=vocabulary.get), dtype=str)
+        # A temp file of its own per writer, so processes fitting the same corpus can't clobber each other
+        tmp = tempfile.NamedTemporaryFile(dir=directory, prefix=f"{os.path.basename(path)}.",
+                                          suffix='.tmp.npz', delete=False)
+        try:
+            with tmp:
+                np.savez_compressed(
+                    tmp,
+                    fingerprint=np.array(self.fingerprint),
+                    terms=terms,
+                    idf=self.vectorizer.idf_
+                )
+            os.replace(tmp.name, path)
+        except BaseException:
+            if os.path.exists(tmp.name):
+                os.remove(tmp.name)
+            raise
+
+    def _restore(self, path: str) -> bool:
+        """Rebuild the fit from a saved vocabulary and IDF; False if the file belongs to another corpus"""
+        with np.load(path, allow_pickle=False) as state:
+            if str(state['fingerprint']) != self.fingerprint:
+                return False
+            terms, idf = state['terms'], state['idf']
+        self.vectorizer.vocabulary_ = {str(term): i for i, term in enumerate(terms)}
+        self.vectorizer.idf_ = idf
+        self.feature_names = terms.astype(object)
+        self.dialect_matrix = self.vectorizer.transform(self.dialect_texts)
+        return True
+
+    @staticmethod
+    def _prune_stale(cache_dir: str, keep: str):
+        """
+        Delete legacy pickled fits and all but the TFIDF_FITS_MAX most recently used ones
+
+        The cache directory may hold fits of other corpora that are still in use
+        (other analyzers or processes), so fits are only pruned by age, never
+        just for not matching this corpus. Loading a fit refreshes its mtime.
+        """
+        keep = os.path.abspath(keep)
+        fits = []
+        for path in glob.glob(os.path.join(cache_dir, 'tfidf_*')):
+            if os.path.abspath(path) == keep or path.endswith('.tmp.npz'):
+                continue
+            if path.endswith('.npz'):
+                try:
+                    fits.append((os.path.getmtime(path), path))
+                except OSError:
+                    pass
+                continue
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning(f"Failed to remove legacy TF-IDF fit {path}: {e}")
+
+        fits.sort(reverse=True)
+        for _, path in fits[max(0, TFIDF_FITS_MAX - 1):]:
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning(f"Failed to remove stale TF-IDF fit {path}: {e}")
+
+    @classmethod
+    def load_or_fit(
+        cls,
+        dialects: Dict[str, str],
+        cache_dir: Optional[str] = None,
+        **kwargs
+    ) -> "SimilarityAnalyzer":
+        """
+        Load a persisted fit for this exact dialect corpus, or fit and persist one
+        """
+        analyzer = cls(dialects, fit=False, **kwargs)
+        cache_dir = cache_dir or TFIDF_DIR
+        path = os.path.join(cache_dir, f"tfidf_{analyzer.fingerprint}.npz")
+
+        if os.path.exists(path):
+            try:
+                restored = analyzer._restore(path)
+            except Exception as e:
+                logger.warning(f"Failed to load TF-IDF fit from {path}: {e}")
+                restored = False
+            if restored:
+                try:
+                    os.utime(path) # Mark as recently used for _prune_stale
+                except OSError:
+                    pass
+                return analyzer
+
+        analyzer.fit()
+        try:
+            analyzer.save(path)
+            cls._prune_stale(cache_dir, keep=path)
+        except Exception as e:
+            logger.warning(f"Failed to persist TF-IDF fit: {e}")
+        return analyzer
+
+
+def get_shared_analyzer(
+    dialects: Dict[str, str],
+    mode: str = 'vocabulary',
+    **kwargs
+) -> Union["SimilarityAnalyzer", "HashingSimilarityAnalyzer"]:
+    """
+    Process-wide fitted TF-IDF analyzer for this dialect corpus
+
+    Mode "vocabulary" loads or fits a SimilarityAnalyzer per corpus via load_or_fit;
+    a changed corpus needs a new fit. Mode "hashing" keeps one long-lived
+    HashingSimilarityAnalyzer per set of kwargs and brings it up to date with the
+    corpus it is called with: new or edited dialects are hashed with partial_fit
+    and dropped ones removed, so a corpus change never rebuilds the others.
+    Either way the returned instance is safe to share across threads.
+
+    Args:
+        dialects: {name: text} dialect corpus
+        mode: One of TFIDF_MODES
+        **kwargs: Passed to the analyzer class
+    """
+    if mode not in TFIDF_MODES:
+        raise ValueError(f"Unknown TF-IDF mode '{mode}'. Available: {list(TFIDF_MODES)}")
+    if mode == 'hashing':
+        return _shared_hashing_analyzer(dialects, **kwargs)
+
+    key = (mode, tuple((name, hash(text)) for name, text in dialects.items()), tuple(sorted(kwargs.items())))
+    analyzer = _shared_analyzers.get(key)
+    if analyzer is not None:
+        return analyzer
+
+    with _shared_lock:
+        analyzer = _shared_analyzers.get(key)
+        if analyzer is None:
+            analyzer = SimilarityAnalyzer.load_or_fit(dialects, **kwargs)
+            if len(_shared_analyzers) >= SHARED_ANALYZERS_MAX:
+                _shared_analyzers.pop(next(iter(_shared_analyzers))) # Oldest corpus
+            _shared_analyzers[key] = analyzer
+    return analyzer
+
+
+def _shared_hashing_analyzer(dialects: Dict[str, str], **kwargs) -> "HashingSimilarityAnalyzer":
+    """The long-lived hashing analyzer for these kwargs, synced to `dialects`"""
+    key = ('hashing', tuple(sorted(kwargs.items())))
+    corpus = {name: hash(text) for name, text in dialects.items()}
+    analyzer = _shared_analyzers.get(key)
+    if analyzer is not None and analyzer.corpus == corpus:
+        return analyzer
+
+    with _shared_lock:
+        analyzer = _shared_analyzers.get(key)
+        if analyzer is None:
+            analyzer = HashingSimilarityAnalyzer(**kwargs)
+            if len(_shared_analyzers) >= SHARED_ANALYZERS_MAX:
+                _shared_analyzers.pop(next(iter(_shared_analyzers)))
+            _shared_analyzers[key] = analyzer
+        if analyzer.corpus != corpus:
+            analyzer.sync(dialects)
+    return analyzer
+
+
+class HashingSimilarityAnalyzer:
+    """
+    TF-IDF + cosine-similarity detector over hashed features, for growing dialect corpora
+
+    Terms are hashed into a fixed number of columns, so memory does not depend
+    on vocabulary size and there is no vocabulary to refit. Raw term counts are
+    kept per dialect and document frequencies are maintained incrementally as
+    dialects are added, extended, replaced or removed; IDF weighting is applied
+    at scoring time, so an update never requires a refit of the other dialects.
+    """
+
+    def __init__(
+        self,
+        dialects: Optional[Dict[str, str]] = None,
+        ngram_range: Tuple[int, int] = (1, 2),
+        n_features: int = 2 ** 18
+    ):
+        self.ngram_range = tuple(ngram_range)
+        self.n_features = n_features
+
+        # norm=None and no sign flipping: rows hold raw term counts
+        self.vectorizer = HashingVectorizer(
+            ngram_range=ngram_range,
+            stop_words='english',
+            n_features=n_features,
+            alternate_sign=False,
+            norm=None
+        )
+        # Same hashing as the vectorizer, used to map user terms back to columns
+        self._hasher = FeatureHasher(n_features=n_features, input_type='string', alternate_sign=False)
+        self._analyzer = self.vectorizer.build_analyzer()
+
+        self.document_frequency = np.zeros(n_features, dtype=np.int64)
+        self._counts: Dict[str, sparse.csr_matrix] = {}
+        # {name: hash(text)} of the text each dialect was last hashed from; appended
+        # dialects are left out, so sync replaces them
+        self.corpus: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # (names, stacked counts, squared counts), rebuilt lazily after updates
+        self._stacked: Optional[Tuple[List[str], sparse.csr_matrix, sparse.csr_matrix]] = None
+
+        if dialects:
+            self.partial_fit(dialects)
+
+    @property
+    def dialect_names(self) -> List[str]:
+        return list(self._counts.keys())
+
+    def partial_fit(
+        self,
+        dialects: Union[Dict[str, str], Iterable[Tuple[str, str]]],
+        append: bool = False,
+        batch_size: int = 256
+    ) -> "HashingSimilarityAnalyzer":
+        """
+        Add or update dialects from a mapping or a stream of (name, text) pairs
+
+        Args:
+            dialects: {name: text} or any iterable of (name, text), consumed in batches
+            append: Add the text to an existing dialect's counts instead of replacing them
+            batch_size: Texts hashed per vectorizer call
+        """
+        items = dialects.items() if isinstance(dialects, dict) else dialects
+        batch: List[Tuple[str, str]] = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                self._ingest(batch, append)
+                batch = []
+        if batch:
+            self._ingest(batch, append)
+        return self
+
+    def remove_dialect(self, name: str):
+        """Drop a dialect and its contribution to document frequencies"""
+        with self._lock:
+            old = self._counts.pop(name, None)
+            self.corpus.pop(name, None)
+            if old is not None:
+                self.document_frequency[old.indices] -= 1
+                self._stacked = None
+
+    def _ingest(self, batch: List[Tuple[str, str]], append: bool):
+        counts = self.vectorizer.transform([text for _, text in batch]).tocsr()
+        with self._lock:
+            for row, (name, _) in enumerate(batch):
+                new = counts[row]
+                old = self._counts.get(name)
+                if old is not None:
+                    if append:
+                        new = (old + new).tocsr()
+                    self.document_frequency[old.indices] -= 1
+                self.document_frequency[new.indices] += 1
+                self._counts[name] = new
+                if append:
+                    self.corpus.pop(name, None)
+                else:
+                    self.corpus[name] = hash(batch[row][1])
+            self._stacked = None
+
+    def sync(self, dialects: Dict[str, str]) -> "HashingSimilarityAnalyzer":
+        """
+        Make the corpus exactly `dialects`: hash new or changed dialects, remove dropped ones
+        """
+        changed = {name: text for name, text in dialects.items() if self.corpus.get(name) != hash(text)}
+        for name in [name for name in self._counts if name not in dialects]:
+            self.remove_dialect(name)
+        if changed:
+            self.partial_fit(changed)
+        return self
+
+    def _snapshot(self) -> Tuple[List[str], sparse.csr_matrix, sparse.csr_matrix, np.ndarray]:
+        """Dialect names, stacked counts, squared counts and current IDF, consistent with each other"""
+        with self._lock:
+            if self._stacked is None:
+                names = list(self._counts.keys())
+                matrix = (sparse.vstack([self._counts[n] for n in names], format='csr')
+                          if names else sparse.csr_matrix((0, self.n_features)))
+                self._stacked = (names, matrix, sparse.csr_matrix(matrix.multiply(matrix)))
+            names, matrix, squared = self._stacked
+            # Smoothed IDF, as TfidfVectorizer computes it; columns no dialect
+            # uses get zero weight, like terms outside a fitted vocabulary
+            df = self.document_frequency
+            idf = np.where(df > 0, np.log((1 + len(names)) / (1 + df)) + 1, 0.0)
+        return names, matrix, squared, idf
+
+    def analyze_batch(
+        self,
+        user_texts: List[str],
+        top_n_terms: int = 10
+    ) -> List[Tuple[Dict[str, float], List[TopTerm]]]:
+        """
+        Score several user texts against the current dialect corpus in one sparse product
+        """
+        names, counts, squared_counts, idf = self._snapshot()
+
+        user_matrix = sparse.csr_matrix(self.vectorizer.transform(user_texts).multiply(idf))
+        user_norms = np.sqrt(np.asarray(user_matrix.multiply(user_matrix).sum(axis=1)).ravel())
+        dialect_norms = np.sqrt(squared_counts @ idf ** 2)
+
+        # <u*idf, d*idf> without materializing the IDF-weighted dialect matrix
+        dots = (sparse.csr_matrix(user_matrix.multiply(idf)) @ counts.T).tocsr()
+
+        results = []
+        for row in range(user_matrix.shape[0]):
+            influence_scores = dict.fromkeys(names, 0.0)
+            start, end = dots.indptr[row], dots.indptr[row + 1]
+            for col, value in zip(dots.indices[start:end], dots.data[start:end]):
+                denominator = user_norms[row] * dialect_norms[col]
+                if denominator > 0:
+                    influence_scores[names[col]] = float(value / denominator)
+            top_terms = self._top_terms(user_texts[row], user_matrix, row, user_norms[row], top_n_terms)
+            results.append((influence_scores, top_terms))
+        return results
+
+    def _top_terms(self, user_text: str, user_matrix, row: int, norm: float,
+                   top_n_terms: int) -> List[TopTerm]:
+        """Highest-weighted user terms; hashing has no vocabulary, so terms come from the text"""
+        terms = list(dict.fromkeys(self._analyzer(user_text)))
+        if not terms or norm == 0:
+            return []
+        columns = self._hasher.transform([[term] for term in terms]).indices
+        weights = np.asarray(user_matrix[row, columns].todense()).ravel() / norm
+        known = np.flatnonzero(weights)
+        k = min(top_n_terms, len(known))
+        if k == 0:
+            return []
+        top = known[np.argpartition(-weights[known], k - 1)[:k]]
+        top = top[np.argsort(-weights[top], kind='stable')]
+        return [TopTerm(terms[i], float(weights[i])) for i in top]
 
     def analyze(
         self,
         user_text: str,
         top_n_terms: int = 10
-    ) -> Tuple[Dict[str, float], pd.DataFrame]:
+    ) -> Tuple[Dict[str, float], List[TopTerm]]:
         """
         Returns:
           - influence_scores: cosine similarity between user_text and each dialect
-          - top_terms_df: top_n_terms from user_text by TF-IDF weight
-        """
-        # Fit TF-IDF on all dialects + the user text
-        corpus = self.dialect_texts + [user_text]
-        tfidf_matrix = self.vectorizer.fit_transform(corpus)
-        feature_names = np.array(self.vectorizer.get_feature_names_out())
-
-        # Split out dialect vectors vs user vector
-        dialect_vecs = tfidf_matrix[:-1].toarray()
-        user_vec     = tfidf_matrix[-1].toarray().ravel()
-
-        # Cosine similarities
-        influence_scores = {
-            name: float(cosine_similarity(
-                user_vec.reshape(1,-1), 
-                vec.reshape(1,-1)
-            )[0,0])
-            for name, vec in zip(self.dialect_names, dialect_vecs)
-        }
-
-        # Top TF-IDF terms in user text
-        top_indices = user_vec.argsort()[::-1][:top_n_terms]
-        top_terms_df = pd.DataFrame({
-            "term":   feature_names[top_indices],
-            "weight": user_vec[top_indices]
-        })
-
-        return influence_scores, top_terms_df
+          - top_terms: up to top_n_terms (term, weight) pairs from user_text by TF-IDF weight
+        """
+        return self.analyze_batch([user_text], top_n_terms)[0]
@@ -0,0 +1,157 @@
+"""
+EchoLens Stylometry Module
+Fixed-length style features (sentence shape, punctuation, function words, character n-grams)
+"""
+
+import unicodedata
+import numpy as np
+from typing import Dict, List
+from .tokenizer import STOP_WORDS, tokenize
+
+# Punctuation marks whose per-character rates are features
+PUNCTUATION = ".,;:!?'\"-()/"
+
+# Function words whose per-token rates are features
+FUNCTION_WORDS = tuple(sorted(STOP_WORDS))
+_FUNCTION_WORD_INDEX = {word: i for i, word in enumerate(FUNCTION_WORDS)}
+
+CHAR_NGRAM_SIZE = 3
+CHAR_NGRAM_BUCKETS = 256
+
+SHAPE_FEATURES = (
+    'mean_sentence_words', 'sentence_words_cv', 'mean_word_chars', 'long_word_rate',
+    'type_token_ratio', 'uppercase_rate', 'digit_rate', 'whitespace_rate',
+)
+
+# (name, length, weight); each block is normalized separately so none dominates by size
+FEATURE_BLOCKS = (
+    ('shape', len(SHAPE_FEATURES), 1.0),
+    ('punctuation', len(PUNCTUATION), 1.0),
+    ('function_words', len(FUNCTION_WORDS), 1.0),
+    ('char_ngrams', CHAR_NGRAM_BUCKETS, 1.0),
+)
+FEATURE_DIM = sum(length for _, length, _ in FEATURE_BLOCKS)
+
+# ASCII lookup tables: punctuation slot (-1 if none), character classes
+_PUNCT_SLOT = np.full(128, -1, dtype=np.int64)
+for _slot, _char in enumerate(PUNCTUATION):
+    _PUNCT_SLOT[ord(_char)] = _slot
+_ASCII = np.arange(128)
+_IS_UPPER = (_ASCII >= ord('A')) & (_ASCII <= ord('Z'))
+_IS_DIGIT = (_ASCII >= ord('0')) & (_ASCII <= ord('9'))
+_IS_WORD = _IS_UPPER | _IS_DIGIT | ((_ASCII >= ord('a')) & (_ASCII <= ord('z'))) | (_ASCII == ord("'"))
+_IS_SPACE = np.isin(_ASCII, [ord(c) for c in ' \t\n\r\f\v'])
+_IS_TERMINATOR = np.isin(_ASCII, [ord(c) for c in '.!?'])
+
+
+def extract_features(text: str) -> np.ndarray:
+    """
+    Fixed-length style feature vector (FEATURE_DIM floats) for a text
+
+    Character-level features come from one vectorized pass over the text's
+    code points; word-level features reuse the shared (cached) tokenizer.
+    """
+    features = np.zeros(FEATURE_DIM, dtype=np.float64)
+    codes = np.frombuffer(unicodedata.normalize('NFKC', text).encode('utf-32-le'), dtype='<u4').astype(np.int64)
+    n_chars = len(codes)
+    if n_chars == 0:
+        return features
+
+    ascii_codes = np.where(codes < 128, codes, 0)
+    non_ascii = codes >= 128
+    # Non-ASCII code points count as word characters (accented letters, CJK, ...)
+    is_word = _IS_WORD[ascii_codes] | non_ascii
+
+    # Sentence shape: word starts counted per sentence (sentences end at . ! ?)
+    word_starts = is_word & ~np.concatenate(([False], is_word[:-1]))
+    n_words = int(word_starts.sum())
+    sentence_ids = np.cumsum(_IS_TERMINATOR[ascii_codes] & ~non_ascii)
+    words_per_sentence = np.bincount(sentence_ids[word_starts])
+    words_per_sentence = words_per_sentence[words_per_sentence > 0]
+
+    tokens = tokenize(text)
+    n_tokens = max(len(tokens), 1)
+
+    shape = np.zeros(len(SHAPE_FEATURES))
+    if len(words_per_sentence):
+        mean_sentence = words_per_sentence.mean()
+        shape[0] = np.log1p(mean_sentence)
+        shape[1] = words_per_sentence.std() / mean_sentence
+    if n_words:
+        word_lengths = np.bincount(np.cumsum(word_starts)[is_word])[1:]
+        shape[2] = np.log1p(word_lengths.mean())
+        shape[3] = (word_lengths >= 7).mean()
+    shape[4] = len(set(tokens)) / n_tokens
+    shape[5] = _IS_UPPER[ascii_codes].sum() / n_chars
+    shape[6] = _IS_DIGIT[ascii_codes].sum() / n_chars
+    shape[7] = _IS_SPACE[ascii_codes].sum() / n_chars
+
+    punct_slots = _PUNCT_SLOT[ascii_codes]
+    punct_slots = punct_slots[(punct_slots >= 0) & ~non_ascii]
+    punctuation = np.bincount(punct_slots, minlength=len(PUNCTUATION)) / n_chars
+
+    function_ids = [_FUNCTION_WORD_INDEX[t] for t in tokens if t in _FUNCTION_WORD_INDEX]
+    function_words = np.bincount(function_ids, minlength=len(FUNCTION_WORDS)) / n_tokens
+
+    # Hashed character n-grams over the lower-cased code points
+    lowered = np.where((codes >= ord('A')) & (codes <= ord('Z')), codes + 32, codes)
+    char_ngrams = np.zeros(CHAR_NGRAM_BUCKETS)
+    if n_chars >= CHAR_NGRAM_SIZE:
+        hashes = np.zeros(n_chars - CHAR_NGRAM_SIZE + 1, dtype=np.int64)
+        for offset in range(CHAR_NGRAM_SIZE):
+            hashes = hashes * 1000003 + lowered[offset:n_chars - CHAR_NGRAM_SIZE + 1 + offset]
+        char_ngrams = np.bincount(hashes % CHAR_NGRAM_BUCKETS, minlength=CHAR_NGRAM_BUCKETS) / len(hashes)
+
+    return np.concatenate([shape, punctuation, function_words, char_ngrams])
+
+
+class StylometryModel:
+    """
+    Per-dialect style profiles and cosine scoring against them
+
+    A dialect's profile is the mean feature vector of its passages. Features
+    are centered on the mean profile and scaled by their spread across
+    dialects, so scoring rewards what makes a dialect's style distinctive
+    rather than what all of them share.
+    """
+
+    def __init__(self, exemplars: Dict[str, List[str]]):
+        """
+        Args:
+            exemplars: Dictionary of dialect names to lists of passages
+        """
+        self.dialect_names: List[str] = [name for name, passages in exemplars.items() if passages]
+        raw_profiles = np.array([
+            np.mean([extract_features(passage) for passage in exemplars[name]], axis=0)
+            for name in self.dialect_names
+        ]).reshape(len(self.dialect_names), FEATURE_DIM)
+
+        self.mean = raw_profiles.mean(axis=0)
+        spread = raw_profiles.std(axis=0)
+        self.scale = np.ones(FEATURE_DIM)
+        start = 0
+        for _, length, _ in FEATURE_BLOCKS:
+            block = slice(start, start + length)
+            # Floor each feature's spread at the block average to keep rare features from exploding
+            self.scale[block] = spread[block] + max(spread[block].mean(), 1e-9)
+            start += length
+
+        self.profiles = np.array([self.transform(profile) for profile in raw_profiles]).reshape(raw_profiles.shape)
+
+    def transform(self, features: np.ndarray) -> np.ndarray:
+        """Standardize a raw feature vector, weight each block equally and L2-normalize"""
+        z = (features - self.mean) / self.scale
+        start = 0
+        for _, length, weight in FEATURE_BLOCKS:
+            block = z[start:start + length]
+            norm = np.linalg.norm(block)
+            if norm > 0:
+                z[start:start + length] = weight * block / norm
+            start += length
+        norm = np.linalg.norm(z)
+        return z / norm if norm > 0 else z
+
+    def score(self, user_text: str) -> Dict[str, float]:
+        """Cosine similarity of the text's style to each dialect profile, mapped to [0, 1]"""
+        similarities = self.profiles @ self.transform(extract_features(user_text))
+        return {name: float((sim + 1) / 2) for name, sim in zip(self.dialect_names, similarities)}
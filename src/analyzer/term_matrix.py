@@ -0,0 +1,76 @@
+"""
+EchoLens Term Matrix Module
+Sparse dialect x term matrix for explaining shared vocabulary across all dialects at once
+"""
+
+import numpy as np
+from collections import Counter
+from scipy import sparse
+from typing import Any, Dict, FrozenSet, List
+from .tokenizer import STOP_WORDS, tokenize
+
+
+class DialectTermMatrix:
+    """
+    Sparse dialect x term matrix over the shared tokenizer's vocabulary
+
+    Each cell holds the dialect's sublinear term frequency (1 + log tf) scaled
+    by a smoothed IDF across dialects, so words every dialect uses carry less
+    weight. One element-wise product with the user's sparse term vector
+    yields the shared terms and their weights for every dialect.
+    """
+
+    def __init__(self, dialects: Dict[str, str], stop_words: FrozenSet[str] = STOP_WORDS):
+        self.dialect_names: List[str] = list(dialects.keys())
+        self.stop_words = stop_words
+
+        rows, cols, counts = [], [], []
+        self.vocabulary: Dict[str, int] = {}
+        for row, name in enumerate(self.dialect_names):
+            for term, count in Counter(t for t in tokenize(dialects[name]) if t not in stop_words).items():
+                col = self.vocabulary.setdefault(term, len(self.vocabulary))
+                rows.append(row)
+                cols.append(col)
+                counts.append(count)
+
+        self.terms = np.array(list(self.vocabulary.keys()), dtype=object)
+        shape = (len(self.dialect_names), len(self.vocabulary))
+        tf = sparse.csr_matrix((1 + np.log(np.asarray(counts, dtype=np.float32)), (rows, cols)), shape=shape)
+        df = np.bincount(cols, minlength=shape[1]) if cols else np.zeros(shape[1])
+        self.idf = (np.log((1 + shape[0]) / (1 + df)) + 1).astype(np.float32)
+        self.matrix = sparse.csr_matrix(tf.multiply(self.idf[np.newaxis, :]))
+
+    def user_vector(self, user_text: str) -> sparse.csr_matrix:
+        """Sparse 1 x vocabulary sublinear term-frequency vector for the user text (unknown terms dropped)"""
+        counts = Counter(
+            self.vocabulary[t] for t in tokenize(user_text)
+            if t in self.vocabulary and t not in self.stop_words
+        )
+        cols = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        data = 1 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+        return sparse.csr_matrix((data, (np.zeros_like(cols), cols)), shape=(1, len(self.vocabulary)))
+
+    def explain(self, user_text: str, top_n: int = 10) -> Dict[str, Dict[str, Any]]:
+        """
+        Shared-term explanations for every dialect in one sparse pass
+
+        Returns:
+            {dialect: {'shared_terms': alphabetical list,
+                       'term_weights': [(term, weight), ...] top_n by weight,
+                       'shared_weight': total weight of shared terms}}
+        """
+        shared = sparse.csr_matrix(self.matrix.multiply(self.user_vector(user_text)))
+        shared.eliminate_zeros()
+
+        explanations: Dict[str, Dict[str, Any]] = {}
+        for row, name in enumerate(self.dialect_names):
+            start, end = shared.indptr[row], shared.indptr[row + 1]
+            cols = shared.indices[start:end]
+            weights = shared.data[start:end]
+            order = np.argsort(-weights, kind='stable')[:top_n]
+            explanations[name] = {
+                'shared_terms': sorted(self.terms[cols].tolist()),
+                'term_weights': [(self.terms[cols[i]], float(weights[i])) for i in order],
+                'shared_weight': float(weights.sum()),
+            }
+        return explanations
@@ -0,0 +1,55 @@
+"""
+EchoLens Timing Module
+Optional per-stage timings and cache hit/miss flags for a single analysis
+"""
+
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict
+
+
+class StageTimer:
+    """
+    Accumulates high-resolution wall-clock durations per named stage
+
+    Stage names are dotted by convention (e.g. "scorer.embeddings",
+    "embeddings.api"); time spent in a repeated stage is summed.
+    """
+
+    def __init__(self):
+        self.stages_ms: Dict[str, float] = {}
+        self.cache_hits: Dict[str, bool] = {}
+        self._started_ns = time.perf_counter_ns()
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter_ns() - start) / 1e6
+            self.stages_ms[name] = self.stages_ms.get(name, 0.0) + elapsed_ms
+
+    def record_cache(self, name: str, hit: bool):
+        """Record whether the named cache was hit"""
+        self.cache_hits[name] = hit
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'stages_ms': dict(self.stages_ms),
+            'cache_hits': dict(self.cache_hits),
+            'total_ms': (time.perf_counter_ns() - self._started_ns) / 1e6,
+        }
+
+
+class NullTimer:
+    """Timer that records nothing; used when timings aren't requested"""
+
+    def stage(self, name: str):
+        return nullcontext()
+
+    def record_cache(self, name: str, hit: bool):
+        pass
+
+
+NULL_TIMER = NullTimer()
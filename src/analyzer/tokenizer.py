@@ -0,0 +1,131 @@
+"""
+EchoLens Tokenizer Module
+Shared word tokenization with Unicode normalization, stop words and caching
+"""
+
+import re
+import sys
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, FrozenSet, Tuple
+
+# Common English function words filtered from "meaningful" shared words
+STOP_WORDS: FrozenSet[str] = frozenset({
+    'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
+    'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had',
+    'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might',
+    'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it',
+    'we', 'they', 'me', 'him', 'her', 'us', 'them', 'my', 'your', 'his',
+    'hers', 'its', 'our', 'their'
+})
+
+# Smaller list used by the simple UI
+BASIC_STOP_WORDS: FrozenSet[str] = frozenset({
+    'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
+    'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had'
+})
+
+# Words are runs of letters/digits, optionally joined by inner apostrophes or hyphens
+_TOKEN_RE = re.compile(r"\w+(?:['\-]\w+)*")
+
+# Typographic characters NFKC leaves alone but that should match their ASCII forms
+_PUNCTUATION_MAP = str.maketrans({
+    '‘': "'", '’': "'", '‛': "'", '′': "'",
+    '‐': '-', '‑': '-',      # hyphens join words
+    '‒': ' ', '–': ' ', '—': ' ',  # figure/en/em dashes separate them
+})
+
+# Typographic quotes and dashes folded to ASCII when canonicalizing whole texts
+_CANONICAL_MAP = str.maketrans({
+    '‘': "'", '’': "'", '‛': "'", '′': "'",
+    '“': '"', '”': '"', '„': '"', '″': '"',
+    '‐': '-', '‑': '-', '‒': '-', '–': '-', '—': '-',
+})
+
+TOKEN_CACHE_SIZE = 4096
+
+
+def normalize(text: str) -> str:
+    """Unicode-normalize (NFKC), unify quotes/dashes and case-fold text"""
+    return unicodedata.normalize('NFKC', text).translate(_PUNCTUATION_MAP).casefold()
+
+
+def canonicalize(text: str, lowercase: bool = False) -> str:
+    """
+    Canonical form of a whole text, for cache keying
+
+    NFKC normalization, ASCII quotes/dashes, whitespace runs collapsed to a
+    single space and ends trimmed; case-folded only with `lowercase`. Unlike
+    normalize(), punctuation is otherwise kept, so the canonical text is
+    still suitable for embedding.
+    """
+    text = " ".join(unicodedata.normalize('NFKC', text).translate(_CANONICAL_MAP).split())
+    return text.casefold() if lowercase else text
+
+
+class _DigestCache:
+    """
+    Bounded LRU of per-text results, keyed by a digest of the text
+
+    Keying by digest instead of the text itself keeps long user texts from
+    being pinned in memory for as long as their tokenization is cached.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, text: str, compute: Callable[[str], Any]) -> Any:
+        key = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                return value
+        value = compute(text)
+        with self._lock:
+            self._entries[key] = value
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_tokenize_cache = _DigestCache(TOKEN_CACHE_SIZE)
+_token_set_cache = _DigestCache(TOKEN_CACHE_SIZE)
+
+
+def tokenize(text: str) -> Tuple[str, ...]:
+    """
+    Split text into normalized word tokens, punctuation removed
+
+    Results are cached per text hash (LRU) and tokens are interned, so repeated
+    calls for the same text within a request cost a hash and a dictionary lookup.
+    """
+    return _tokenize_cache.get(text, _tokenize)
+
+
+def _tokenize(text: str) -> Tuple[str, ...]:
+    return tuple(sys.intern(token) for token in _TOKEN_RE.findall(normalize(text)))
+
+
+def token_set(text: str) -> FrozenSet[str]:
+    """Unique tokens of a text (cached)"""
+    return _token_set_cache.get(text, lambda text: frozenset(tokenize(text)))
+
+
+def content_words(text: str, stop_words: FrozenSet[str] = STOP_WORDS) -> FrozenSet[str]:
+    """Unique tokens of a text with stop words removed"""
+    return token_set(text) - stop_words
+
+
+def clear_token_cache():
+    """Drop all cached tokenizations"""
+    _tokenize_cache.clear()
+    _token_set_cache.clear()
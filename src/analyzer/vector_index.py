@@ -0,0 +1,347 @@
+"""
+EchoLens Vector Index Module
+Nearest-neighbour search over dialect embeddings with exact and approximate backends
+"""
+
+import os
+import logging
+import tempfile
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row so dot products become cosine similarities"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first"""
+    if k >= len(scores):
+        return np.argsort(-scores)
+    candidates = np.argpartition(-scores, k)[:k]
+    return candidates[np.argsort(-scores[candidates])]
+
+
+class VectorIndex:
+    """
+    Base class for dialect embedding indexes
+
+    Vectors are stored L2-normalized in one contiguous float32 matrix and
+    addressed by string keys (dialect names). Queries return cosine similarity.
+    Subclasses override `_search` to narrow the candidate rows.
+    """
+
+    kind = "base"
+
+    def __init__(self, dim: Optional[int] = None):
+        self.dim = dim
+        self.keys: List[str] = []
+        self.fingerprints: List[str] = []
+        self.vectors = np.zeros((0, dim or 0), dtype=np.float32)
+        self._key_to_row: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._key_to_row
+
+    def fingerprint(self, key: str) -> Optional[str]:
+        """Return the fingerprint stored alongside a key (used to detect stale entries)"""
+        row = self._key_to_row.get(key)
+        return self.fingerprints[row] if row is not None else None
+
+    def add(self, keys: Sequence[str], vectors: Sequence[Sequence[float]],
+            fingerprints: Optional[Sequence[str]] = None):
+        """
+        Insert or replace vectors incrementally
+
+        Args:
+            keys: Keys identifying each vector
+            vectors: Embeddings, one per key
+            fingerprints: Optional content fingerprints stored with each key
+        """
+        if not keys:
+            return
+        matrix = _normalize_rows(np.asarray(vectors, dtype=np.float32).reshape(len(keys), -1))
+        if self.dim is None or len(self) == 0:
+            self.dim = matrix.shape[1]
+            self.vectors = self.vectors.reshape(0, self.dim)
+        if matrix.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dimension {self.dim}, got {matrix.shape[1]}")
+
+        fingerprints = list(fingerprints) if fingerprints is not None else [""] * len(keys)
+        new_rows = []
+        for key, vector, fp in zip(keys, matrix, fingerprints):
+            row = self._key_to_row.get(key)
+            if row is None:
+                self._key_to_row[key] = len(self.keys)
+                new_rows.append(vector)
+                self.keys.append(key)
+                self.fingerprints.append(fp)
+            else:
+                self.vectors[row] = vector
+                self.fingerprints[row] = fp
+                self._on_update(row)
+
+        if new_rows:
+            start = self.vectors.shape[0]
+            self.vectors = np.vstack([self.vectors, np.asarray(new_rows, dtype=np.float32)])
+            self._on_insert(np.arange(start, self.vectors.shape[0]))
+
+    def _on_insert(self, rows: np.ndarray):
+        """Hook for subclasses to index newly appended rows"""
+
+    def _on_update(self, row: int):
+        """Hook for subclasses to re-index a replaced row"""
+
+    def _search(self, query: np.ndarray) -> np.ndarray:
+        """Return candidate row ids for a normalized query (all rows by default)"""
+        return np.arange(len(self.keys))
+
+    def _prepare_query(self, vector: Sequence[float]) -> np.ndarray:
+        query = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(query)
+        return query / norm if norm > 0 else query
+
+    def search_exact(self, vector: Sequence[float], k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Brute-force cosine search over every stored vector
+
+        This is the recall reference for approximate subclasses.
+        """
+        if not len(self):
+            return []
+        query = self._prepare_query(vector)
+        scores = self.vectors @ query
+        order = _top_k(scores, k or len(scores))
+        return [(self.keys[i], float(scores[i])) for i in order]
+
+    def query(self, vector: Sequence[float], k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Return the top-k (key, cosine similarity) pairs, best first
+
+        Args:
+            vector: Query embedding
+            k: Number of neighbours (default: all stored vectors)
+        """
+        if not len(self):
+            return []
+        query = self._prepare_query(vector)
+        candidates = self._search(query)
+        if len(candidates) == len(self.keys):
+            return self.search_exact(query, k)
+        scores = self.vectors[candidates] @ query
+        order = _top_k(scores, k or len(scores))
+        return [(self.keys[candidates[i]], float(scores[i])) for i in order]
+
+    def _extra_state(self) -> Dict[str, np.ndarray]:
+        return {}
+
+    def _restore_extra_state(self, state):
+        pass
+
+    def save(self, path: str):
+        """Persist the index as a compressed .npz file"""
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        # A temp file of its own per writer, so concurrent saves (app and service) can't clobber each other
+        tmp = tempfile.NamedTemporaryFile(dir=directory, prefix=f"{os.path.basename(path)}.",
+                                          suffix='.tmp.npz', delete=False)
+        try:
+            with tmp:
+                np.savez_compressed(
+                    tmp,
+                    kind=np.array(self.kind),
+                    keys=np.array(self.keys, dtype=str),
+                    fingerprints=np.array(self.fingerprints, dtype=str),
+                    vectors=self.vectors,
+                    **self._extra_state()
+                )
+            os.replace(tmp.name, path)
+        except BaseException:
+            if os.path.exists(tmp.name):
+                os.remove(tmp.name)
+            raise
+        logger.debug(f"Saved {self.kind} index with {len(self)} vectors to {path}")
+
+    @classmethod
+    def _from_state(cls, state, **kwargs) -> "VectorIndex":
+        index = cls(**kwargs)
+        index.keys = [str(k) for k in state['keys']]
+        index.fingerprints = [str(f) for f in state['fingerprints']]
+        index.vectors = np.asarray(state['vectors'], dtype=np.float32)
+        index.dim = index.vectors.shape[1] if index.vectors.ndim == 2 and index.keys else None
+        index._key_to_row = {key: row for row, key in enumerate(index.keys)}
+        index._restore_extra_state(state)
+        return index
+
+
+class BruteForceIndex(VectorIndex):
+    """Exact index: every query scores every stored vector with one matrix product"""
+
+    kind = "brute_force"
+
+
+class IVFIndex(VectorIndex):
+    """
+    Inverted-file approximate index
+
+    Vectors are clustered with spherical k-means into `n_lists` cells; a query
+    only scores the vectors in its `n_probe` closest cells. Small indexes
+    (fewer than `min_train_size` vectors) are searched exactly. New vectors are
+    assigned to their nearest existing cell, and the clustering is retrained
+    once the index has grown by `retrain_factor` since the last training.
+    """
+
+    kind = "ivf"
+
+    def __init__(self, dim: Optional[int] = None, n_lists: Optional[int] = None, n_probe: int = 8,
+                 min_train_size: int = 1024, retrain_factor: float = 2.0, seed: int = 0):
+        super().__init__(dim)
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.min_train_size = min_train_size
+        self.retrain_factor = retrain_factor
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self.assignments = np.zeros(0, dtype=np.int32)
+        self._trained_size = 0
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def train(self, iterations: int = 10):
+        """Cluster the stored vectors with spherical k-means"""
+        n = len(self.keys)
+        if n == 0:
+            return
+        n_lists = min(self.n_lists or max(1, int(np.sqrt(n))), n)
+        rng = np.random.default_rng(self.seed)
+        centroids = self.vectors[rng.choice(n, n_lists, replace=False)].copy()
+
+        for _ in range(iterations):
+            assignments = np.argmax(self.vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, self.vectors)
+            empty = ~np.any(sums, axis=1)
+            sums[empty] = centroids[empty]
+            centroids = _normalize_rows(sums)
+
+        self.centroids = centroids.astype(np.float32)
+        self.assignments = np.argmax(self.vectors @ self.centroids.T, axis=1).astype(np.int32)
+        self._trained_size = n
+        logger.info(f"Trained IVF index: {n} vectors in {n_lists} lists")
+
+    def _assign(self, rows: np.ndarray) -> np.ndarray:
+        return np.argmax(self.vectors[rows] @ self.centroids.T, axis=1).astype(np.int32)
+
+    def _on_insert(self, rows: np.ndarray):
+        if not self.is_trained:
+            if len(self.keys) >= self.min_train_size:
+                self.train()
+            return
+        if len(self.keys) >= self._trained_size * self.retrain_factor:
+            self.train()
+            return
+        self.assignments = np.concatenate([self.assignments, self._assign(rows)])
+
+    def _on_update(self, row: int):
+        if self.is_trained:
+            self.assignments[row] = self._assign(np.array([row]))[0]
+
+    def _search(self, query: np.ndarray) -> np.ndarray:
+        if not self.is_trained or self.n_probe >= len(self.centroids):
+            return np.arange(len(self.keys))
+        cells = _top_k(self.centroids @ query, self.n_probe)
+        return np.flatnonzero(np.isin(self.assignments, cells))
+
+    def _extra_state(self) -> Dict[str, np.ndarray]:
+        state = {
+            'params': np.array([self.n_lists or 0, self.n_probe, self.min_train_size,
+                                self._trained_size, self.seed], dtype=np.int64),
+            'retrain_factor': np.array(self.retrain_factor),
+        }
+        if self.is_trained:
+            state['centroids'] = self.centroids
+            state['assignments'] = self.assignments
+        return state
+
+    def _restore_extra_state(self, state):
+        if 'params' in state:
+            n_lists, self.n_probe, self.min_train_size, self._trained_size, self.seed = \
+                (int(v) for v in state['params'])
+            self.n_lists = n_lists or None
+            self.retrain_factor = float(state['retrain_factor'])
+        if 'centroids' in state:
+            self.centroids = np.asarray(state['centroids'], dtype=np.float32)
+            self.assignments = np.asarray(state['assignments'], dtype=np.int32)
+
+
+# Registry of available index backends; new backends only need to subclass VectorIndex
+INDEX_TYPES: Dict[str, Type[VectorIndex]] = {
+    BruteForceIndex.kind: BruteForceIndex,
+    IVFIndex.kind: IVFIndex,
+}
+
+
+def register_index_type(index_cls: Type[VectorIndex]):
+    """Register a custom VectorIndex subclass under its `kind`"""
+    INDEX_TYPES[index_cls.kind] = index_cls
+    return index_cls
+
+
+def create_vector_index(kind: str = "ivf", **kwargs) -> VectorIndex:
+    """
+    Factory function to create an empty vector index
+
+    Args:
+        kind: Registered index type ("ivf" or "brute_force")
+        **kwargs: Backend-specific parameters
+    """
+    if kind not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type '{kind}'. Available: {sorted(INDEX_TYPES)}")
+    return INDEX_TYPES[kind](**kwargs)
+
+
+def load_vector_index(path: str) -> Optional[VectorIndex]:
+    """
+    Load a persisted index, returning None if it is missing or unreadable
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as state:
+            kind = str(state['kind'])
+            if kind not in INDEX_TYPES:
+                logger.warning(f"Unknown index type '{kind}' in {path}")
+                return None
+            return INDEX_TYPES[kind]._from_state(state)
+    except Exception as e:
+        logger.warning(f"Failed to load vector index from {path}: {e}")
+        return None
+
+
+def recall_at_k(index: VectorIndex, queries: Sequence[Sequence[float]], k: int = 10) -> float:
+    """
+    Measure approximate-search recall against exact brute-force results
+
+    Returns:
+        Fraction of exact top-k neighbours found by `index.query`
+    """
+    if not len(index) or not len(queries):
+        return 1.0
+    hits = 0
+    total = 0
+    for query in queries:
+        exact = {key for key, _ in index.search_exact(query, k)}
+        approx = {key for key, _ in index.query(query, k)}
+        hits += len(exact & approx)
+        total += len(exact)
+    return hits / total if total else 1.0
@@ -2,29 +2,117 @@
 Dialect sample loader for EchoLens
 """
 import os
-from typing import Dict
+import time
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+SAMPLES_DIR = os.path.join('data', 'dialects', 'samples')
+
+# Seconds a computed corpus version is reused before the sample files are stat'ed again
+CORPUS_VERSION_TTL = 2.0
+_corpus_versions: Dict[str, Tuple[float, str]] = {} # abs samples dir -> (expires at, version)
+
+# Separator used when a multi-passage dialect is flattened into a single sample
+PASSAGE_SEPARATOR = "\n\n"
+
+
+def dialect_display_name(filename: str) -> str:
+    """Turn a sample file or directory name into a dialect display name"""
+    return filename.replace('.txt', '').replace('_', ' ').title()
+
+
+def _read_passage(path: str) -> str:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read().strip()
+            if not content:
+                print(f"Warning: {os.path.basename(path)} is empty")
+            return content
+    except Exception as e:
+        print(f"Warning: Could not load {os.path.basename(path)}: {e}")
+        return ""
+
+
+def load_dialect_exemplars(samples_dir: Optional[str] = None) -> Dict[str, List[str]]:
+    """
+    Load example passages for each dialect
+
+    A dialect is either a single `<name>.txt` file (one passage) or a
+    `<name>/` directory whose `.txt` files are each one passage. Both forms
+    may coexist for the same dialect.
+
+    Returns:
+        Dictionary mapping dialect name to its list of passages (no fallback)
+    """
+    samples_dir = samples_dir or SAMPLES_DIR
+    exemplars: Dict[str, List[str]] = {}
+
+    if not os.path.exists(samples_dir):
+        return exemplars
+
+    for entry in sorted(os.listdir(samples_dir)):
+        path = os.path.join(samples_dir, entry)
+        if os.path.isdir(path):
+            passages = [
+                _read_passage(os.path.join(path, filename))
+                for filename in sorted(os.listdir(path))
+                if filename.endswith('.txt')
+            ]
+        elif entry.endswith('.txt'):
+            passages = [_read_passage(path)]
+        else:
+            continue
+
+        passages = [p for p in passages if p]
+        if passages:
+            exemplars.setdefault(dialect_display_name(entry), []).extend(passages)
+
+    return exemplars
+
+
+def dialect_corpus_version(samples_dir: Optional[str] = None) -> str:
+    """
+    Cheap version identifier for the dialect corpus
+
+    Derived from the names, sizes and modification times of the sample files,
+    so it changes whenever a dialect is added, removed or edited without
+    reading any file contents. It is called on every analysis, so the result
+    is reused for CORPUS_VERSION_TTL seconds instead of stat'ing every passage
+    file each time; edits show up once it expires.
+    """
+    samples_dir = os.path.abspath(samples_dir or SAMPLES_DIR)
+    now = time.monotonic()
+    cached = _corpus_versions.get(samples_dir)
+    if cached and now < cached[0]:
+        return cached[1]
+
+    version = _scan_corpus_version(samples_dir)
+    _corpus_versions[samples_dir] = (now + CORPUS_VERSION_TTL, version)
+    return version
+
+
+def _scan_corpus_version(samples_dir: str) -> str:
+    digest = hashlib.md5()
+    if os.path.exists(samples_dir):
+        for root, dirs, files in os.walk(samples_dir):
+            dirs.sort()
+            for filename in sorted(files):
+                if filename.endswith('.txt'):
+                    stat = os.stat(os.path.join(root, filename))
+                    rel_path = os.path.relpath(os.path.join(root, filename), samples_dir)
+                    digest.update(f"{rel_path}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:16]
+
+
+def flatten_exemplars(exemplars: Dict[str, List[str]]) -> Dict[str, str]:
+    """Join each dialect's passages into a single sample text"""
+    return {name: PASSAGE_SEPARATOR.join(passages) for name, passages in exemplars.items()}
+
 
 def load_dialect_samples() -> Dict[str, str]:
     """Load dialect samples from files"""
-    samples = {}
-    samples_dir = os.path.join('data', 'dialects', 'samples')
-    
-    if os.path.exists(samples_dir):
-        for filename in os.listdir(samples_dir):
-            if filename.endswith('.txt'):
-                # Just use filename without extension as the dialect name
-                dialect_name = filename.replace('.txt', '').replace('_', ' ').title()
-                
-                try:
-                    with open(os.path.join(samples_dir, filename), 'r', encoding='utf-8') as f:
-                        content = f.read().strip()
-                        if content:  # Only add non-empty files
-                            samples[dialect_name] = content
-                        else:
-                            print(f"Warning: {filename} is empty")
-                except Exception as e:
-                    print(f"Warning: Could not load {filename}: {e}")
-    
+    samples = flatten_exemplars(load_dialect_exemplars())
+
     # Fallback samples only if no files were loaded successfully
     if not samples:
         print("Warning: No dialect samples found in files, using fallback samples")
@@ -33,5 +121,5 @@ def load_dialect_samples() -> Dict[str, str]:
             "Startup Techie": "We're building something truly transformative here. This could fundamentally reshape how people think about this space.",
             "Crossfit Bro": "I'm absolutely crushing my goals right now. Hit a new PR yesterday and my nutrition is completely dialed in."
         }
-    
+
     return samples
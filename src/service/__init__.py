@@ -0,0 +1,8 @@
+"""
+EchoLens Service Module
+Headless HTTP API for running analyses outside Streamlit
+"""
+
+from .server import AnalysisService, get_service_analyzer, run_service
+
+__all__ = ['AnalysisService', 'get_service_analyzer', 'run_service']
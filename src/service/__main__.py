@@ -0,0 +1,8 @@
+"""
+EchoLens - Headless Service Entry Point
+Run with: python -m src.service [--host HOST] [--port PORT] [--workers N] [--queue-size N]
+"""
+from .server import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,449 @@
+"""
+EchoLens Service Module
+Headless JSON HTTP API over a process-shared PatternAnalyzer (stdlib asyncio, no web framework)
+"""
+
+import json
+import time
+import signal
+import asyncio
+import logging
+import argparse
+import threading
+from http import HTTPStatus
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from config.settings import (
+    get_config, LOG_LEVEL, MAX_TEXT_LENGTH, EMBEDDING_BATCH_WINDOW_MS, EMBEDDING_MAX_BATCH_SIZE,
+    EMBEDDING_LOWERCASE_KEYS, EMBEDDING_NEAR_DUPLICATE_DISTANCE,
+    SERVICE_HOST, SERVICE_PORT, SERVICE_WORKERS, SERVICE_QUEUE_SIZE, TFIDF_MODE
+)
+from ..analyzer.embeddings import create_embeddings_manager
+from ..analyzer.metrics import METRICS, PROMETHEUS_CONTENT_TYPE
+from ..analyzer.pattern_analyzer import PatternAnalyzer
+from ..analyzer.result_cache import ResultCache
+from ..analyzer.scorers import SCORER_REGISTRY
+from ..dialects.loader import dialect_corpus_version
+
+logger = logging.getLogger(__name__)
+
+REQUESTS = METRICS.counter('echolens_service_requests_total', "Service requests by path and status", ['path', 'status'])
+REQUEST_DURATION = METRICS.histogram('echolens_service_request_duration_seconds',
+                                     "Service request handling time, queueing included, by path", ['path'])
+
+MAX_BODY_BYTES = 1024 * 1024
+MAX_BATCH_TEXTS = 100
+MAX_HEADERS = 100
+KEEP_ALIVE_SECONDS = 5.0
+SHUTDOWN_GRACE_SECONDS = 30.0
+RETRY_AFTER_SECONDS = 1
+
+_shared_analyzer: Optional[PatternAnalyzer] = None
+_shared_lock = threading.Lock()
+
+
+def get_service_analyzer() -> PatternAnalyzer:
+    """
+    Process-wide analyzer for the service
+
+    Uses embeddings when OPENAI_API_KEY is configured and local scorers
+    otherwise; results are memoized in the shared on-disk result cache.
+    """
+    global _shared_analyzer
+    if _shared_analyzer is None:
+        with _shared_lock:
+            if _shared_analyzer is None:
+                api_key = get_config('OPENAI_API_KEY')
+                embeddings_manager = create_embeddings_manager(
+                    api_key, base_url=get_config('OPENAI_BASE_URL'),
+                    batch_window_ms=EMBEDDING_BATCH_WINDOW_MS, max_batch_size=EMBEDDING_MAX_BATCH_SIZE,
+                    lowercase_keys=EMBEDDING_LOWERCASE_KEYS, near_duplicate_distance=EMBEDDING_NEAR_DUPLICATE_DISTANCE
+                ) if api_key else None
+                if not embeddings_manager:
+                    logger.warning("Embeddings unavailable; the service will use local scorers only")
+                _shared_analyzer = PatternAnalyzer(embeddings_manager, result_cache=ResultCache(),
+                                                   tfidf_mode=TFIDF_MODE)
+    return _shared_analyzer
+
+
+class HTTPError(Exception):
+    """Error answered with `status` and a JSON {'error': message} body"""
+
+    def __init__(self, status: HTTPStatus, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, 'item'): # numpy scalars
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _require_text(value: Any, field: str = 'text') -> str:
+    if not isinstance(value, str):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"'{field}' must be a string")
+    if len(value) > MAX_TEXT_LENGTH:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"'{field}' exceeds {MAX_TEXT_LENGTH} characters")
+    return value
+
+
+def _analysis_options(payload: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+    """(use_embeddings, method) from a request payload"""
+    use_embeddings = payload.get('use_embeddings', True)
+    if not isinstance(use_embeddings, bool):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "'use_embeddings' must be a boolean")
+    method = payload.get('method')
+    if method is not None and method != "cascade" and method not in SCORER_REGISTRY:
+        available = sorted(SCORER_REGISTRY) + ["cascade"]
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"Unknown method '{method}'. Available: {available}")
+    return use_embeddings, method
+
+
+class AnalysisService:
+    """
+    JSON HTTP front end for a PatternAnalyzer
+
+    Endpoints:
+        POST /analyze        {"text", "method"?, "use_embeddings"?, "details"?, "timings"?}
+        POST /analyze_batch  {"texts", "method"?, "use_embeddings"?}
+        GET  /dialects
+        GET  /health
+        GET  /metrics        (Prometheus text format)
+
+    Requests are parsed on the event loop and their analyses queued for a
+    fixed pool of workers. The queue is bounded: when it is full new work is
+    rejected with 429 and a Retry-After header instead of piling up. On
+    shutdown the listener closes, idle keep-alive connections are dropped
+    and queued work is drained before the workers stop.
+    """
+
+    def __init__(self, analyzer: Optional[PatternAnalyzer] = None, workers: int = SERVICE_WORKERS,
+                 queue_size: int = SERVICE_QUEUE_SIZE):
+        """
+        Args:
+            analyzer: Analyzer to serve (default: the process-wide get_service_analyzer())
+            workers: Analyses running concurrently
+            queue_size: Analyses waiting for a worker before requests are rejected with 429
+        """
+        self.analyzer = analyzer or get_service_analyzer()
+        self.workers = workers
+        self.queue_size = queue_size
+        self.routes: Dict[Tuple[str, str], Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            ('POST', '/analyze'): self.analyze,
+            ('POST', '/analyze_batch'): self.analyze_batch,
+            ('GET', '/dialects'): self.dialects,
+        }
+        self._known_paths = {path for _, path in self.routes} | {'/health', '/metrics'}
+        self._queue: Optional[asyncio.Queue] = None
+        self._admitted = 0 # Analyses accepted and not yet finished, running or queued
+        self._worker_tasks: List[asyncio.Task] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.StreamWriter, bool] = {} # writer -> handling a request
+        self._stop_requested: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    # Handlers (run on worker threads)
+
+    def analyze(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        text = _require_text(payload.get('text'))
+        use_embeddings, method = _analysis_options(payload)
+        scores, method_used, detailed = self.analyzer.analyze_with_details(
+            text, use_embeddings=use_embeddings, method=method, collect_timings=bool(payload.get('timings'))
+        )
+        response = {
+            'scores': scores,
+            'method_used': method_used,
+            'top_dialect': detailed.get('top_dialect'),
+            'top_score': detailed.get('top_score'),
+        }
+        if payload.get('details'):
+            response['details'] = detailed
+        if payload.get('timings'):
+            response['timings'] = detailed.get('timings')
+        return response
+
+    def analyze_batch(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        texts = payload.get('texts')
+        if not isinstance(texts, list) or not texts:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'texts' must be a non-empty list")
+        if len(texts) > MAX_BATCH_TEXTS:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"At most {MAX_BATCH_TEXTS} texts per batch")
+        texts = [_require_text(text, f'texts[{i}]') for i, text in enumerate(texts)]
+        use_embeddings, method = _analysis_options(payload)
+        # One worker per batch: its embeddings are fetched up front in bulk, and the
+        # service's own pool already bounds how many analyses run at once
+        results = self.analyzer.analyze_batch(texts, use_embeddings=use_embeddings, method=method, max_workers=1)
+        return {'results': [{'scores': scores, 'method_used': method_used} for scores, method_used in results]}
+
+    def dialects(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        exemplars = self.analyzer.load_dialect_exemplars()
+        return {
+            'version': dialect_corpus_version(),
+            'dialects': [{'name': name, 'passages': len(passages)} for name, passages in exemplars.items()],
+        }
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            'status': 'stopping' if self._stopping else 'ok',
+            'embeddings': self.analyzer.embeddings_manager is not None,
+            'workers': self.workers,
+            'queue_depth': max(self._admitted - self.workers, 0),
+            'queue_size': self.queue_size,
+        }
+
+    # Work queue
+
+    async def submit(self, handler: Callable[[Dict[str, Any]], Dict[str, Any]], payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue `handler(payload)` for a worker and wait for its result"""
+        if self._stopping:
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "Service is shutting down")
+        # Admission is counted here rather than by the queue's maxsize: an item stays
+        # in the queue until its woken worker actually runs, so a burst would otherwise
+        # see idle workers' slots as taken
+        if self._admitted >= self.workers + self.queue_size:
+            raise HTTPError(HTTPStatus.TOO_MANY_REQUESTS, "Analysis queue is full, retry later",
+                            {'Retry-After': str(RETRY_AFTER_SECONDS)})
+        future = asyncio.get_running_loop().create_future()
+        self._admitted += 1
+        self._queue.put_nowait((handler, payload, future))
+        return await future
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            handler, payload, future = await self._queue.get()
+            try:
+                if future.cancelled(): # Client went away while queued
+                    continue
+                result = await loop.run_in_executor(self._executor, handler, payload)
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self._admitted -= 1
+                self._queue.task_done()
+
+    # HTTP
+
+    async def _read_request(self, request_line: bytes,
+                            reader: asyncio.StreamReader) -> Tuple[str, str, str, Dict[str, str], bytes]:
+        """Parse one request after its request line: (method, path, version, headers, body)"""
+        try:
+            method, target, version = request_line.decode('latin-1').split()
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            if len(headers) >= MAX_HEADERS:
+                raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Too many headers")
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Body exceeds {MAX_BODY_BYTES} bytes")
+        body = await reader.readexactly(length) if length > 0 else b''
+        return method.upper(), target.split('?', 1)[0], version, headers, body
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Union[Dict[str, Any], str]:
+        if path == '/health':
+            return self.health()
+        if path == '/metrics':
+            return METRICS.render_prometheus()
+        handler = self.routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self.routes):
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed on {path}")
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No endpoint {path}")
+
+        payload: Dict[str, Any] = {}
+        if method == 'POST':
+            try:
+                payload = json.loads(body or b'{}')
+            except ValueError:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Body is not valid JSON")
+            if not isinstance(payload, dict):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object")
+        return await self.submit(handler, payload)
+
+    async def _write_response(self, writer: asyncio.StreamWriter, status: HTTPStatus,
+                              body: Union[Dict[str, Any], str], keep_alive: bool,
+                              headers: Optional[Dict[str, str]] = None):
+        """Write a JSON response (text bodies are metrics exposition)"""
+        if isinstance(body, str):
+            payload, content_type = body.encode('utf-8'), PROMETHEUS_CONTENT_TYPE
+        else:
+            payload, content_type = json.dumps(body, default=_json_default).encode('utf-8'), "application/json"
+        lines = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(payload)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ] + [f"{name}: {value}" for name, value in (headers or {}).items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + payload)
+        await writer.drain()
+
+    async def _handle_request(self, request_line: bytes, reader: asyncio.StreamReader,
+                              writer: asyncio.StreamWriter) -> bool:
+        """Answer one request; returns whether the connection stays open"""
+        keep_alive = False
+        start = time.perf_counter()
+        path = None
+        try:
+            method, path, version, headers, body = await self._read_request(request_line, reader)
+            connection = headers.get('connection', '').lower()
+            keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+            status, response, extra_headers = HTTPStatus.OK, await self._dispatch(method, path, body), None
+        except HTTPError as e:
+            status, response, extra_headers = e.status, {'error': e.message}, e.headers
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            status, response, extra_headers = HTTPStatus.BAD_REQUEST, {'error': "Incomplete request"}, None
+            keep_alive = False
+        except Exception as e:
+            logger.exception(f"Request failed: {e}")
+            status, response, extra_headers = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': "Internal error"}, None
+
+        keep_alive = keep_alive and not self._stopping
+        await self._write_response(writer, status, response, keep_alive, extra_headers)
+        # Unknown paths share one label so scanners can't grow the series without bound
+        known_path = path if path in self._known_paths else 'other'
+        REQUESTS.inc(path=known_path, status=status.value)
+        REQUEST_DURATION.observe(time.perf_counter() - start, path=known_path)
+        return keep_alive
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._connections[writer] = False
+        try:
+            while not self._stopping:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line.strip():
+                    break
+                self._connections[writer] = True
+                if not await self._handle_request(request_line, reader, writer):
+                    break
+                self._connections[writer] = False
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    # Lifecycle
+
+    async def start(self, host: str = SERVICE_HOST, port: int = SERVICE_PORT, reuse_port: bool = False):
+        """
+        Start the workers and begin listening
+
+        With reuse_port, several service processes can listen on the same
+        port and the kernel spreads connections across them (Linux/BSD).
+        """
+        self._queue = asyncio.Queue() # Bounded by the admission count in submit()
+        self._admitted = 0
+        self._stop_requested = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="echolens-service")
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._server = await asyncio.start_server(self._handle_connection, host, port,
+                                                  reuse_port=reuse_port or None)
+        bound = ", ".join(f"{sock.getsockname()[0]}:{sock.getsockname()[1]}" for sock in self._server.sockets)
+        logger.info(f"EchoLens service listening on {bound} "
+                    f"({self.workers} workers, queue of {self.queue_size})")
+
+    @property
+    def port(self) -> Optional[int]:
+        """Port actually bound (useful with port=0)"""
+        if not self._server or not self._server.sockets:
+            return None
+        return self._server.sockets[0].getsockname()[1]
+
+    def request_stop(self):
+        """Ask serve() to shut down gracefully (safe to call from signal handlers)"""
+        if self._stop_requested is not None:
+            self._stop_requested.set()
+
+    async def shutdown(self, grace: float = SHUTDOWN_GRACE_SECONDS):
+        """Stop accepting work, finish what's queued (up to `grace` seconds) and stop the workers"""
+        if self._stopping:
+            return
+        self._stopping = True
+        logger.info("Shutting down: draining queued analyses")
+        self._server.close()
+        for writer, busy in list(self._connections.items()):
+            if not busy: # Idle keep-alive connection
+                writer.close()
+
+        try:
+            await asyncio.wait_for(self._queue.join(), grace)
+        except asyncio.TimeoutError:
+            logger.warning(f"{self._queue.qsize()} queued analyses abandoned after {grace}s")
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+
+        # Let in-flight responses finish writing
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + grace
+        while self._connections and loop.time() < deadline:
+            await asyncio.sleep(0.05)
+        await self._server.wait_closed()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        logger.info("EchoLens service stopped")
+
+    async def serve(self, host: str = SERVICE_HOST, port: int = SERVICE_PORT, reuse_port: bool = False):
+        """Run until SIGINT/SIGTERM (or request_stop()), then shut down gracefully"""
+        await self.start(host, port, reuse_port)
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.request_stop)
+            except (NotImplementedError, RuntimeError): # Windows, or not the main thread
+                pass
+        try:
+            await self._stop_requested.wait()
+        finally:
+            await self.shutdown()
+
+
+def run_service(host: str = SERVICE_HOST, port: int = SERVICE_PORT, workers: int = SERVICE_WORKERS,
+                queue_size: int = SERVICE_QUEUE_SIZE, reuse_port: bool = False):
+    """Serve the process-shared analyzer until interrupted"""
+    service = AnalysisService(workers=workers, queue_size=queue_size)
+    asyncio.run(service.serve(host, port, reuse_port))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EchoLens headless analysis service")
+    parser.add_argument('--host', default=SERVICE_HOST)
+    parser.add_argument('--port', type=int, default=SERVICE_PORT)
+    parser.add_argument('--workers', type=int, default=SERVICE_WORKERS, help="concurrent analyses")
+    parser.add_argument('--queue-size', type=int, default=SERVICE_QUEUE_SIZE,
+                        help="waiting analyses before requests get 429")
+    parser.add_argument('--reuse-port', action='store_true',
+                        help="let several service processes share the port")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    run_service(args.host, args.port, args.workers, args.queue_size, args.reuse_port)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,18 +4,29 @@ EchoLens - Analyzes text for ideological and linguistic patterns
 import streamlit as st
 import os
 import sys
-import pandas as pd
 import time
+import hashlib
+import tempfile
+import pandas as pd
+from collections import OrderedDict, deque
 from typing import Dict, List, Tuple
 
 # Add project root to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from config.settings import get_config
+from config.settings import (
+    get_config, DEBUG, EMBEDDING_BATCH_WINDOW_MS, EMBEDDING_MAX_BATCH_SIZE,
+    EMBEDDING_LOWERCASE_KEYS, EMBEDDING_NEAR_DUPLICATE_DISTANCE, METRICS_HOST, METRICS_PORT, TFIDF_MODE
+)
 from src.analyzer import create_embeddings_manager
 from src.analyzer.pattern_analyzer import PatternAnalyzer
-from src.dialects.loader import load_dialect_samples
-#from src.analyzer.similarity_analyzer import SimilarityAnalyzer
+from src.analyzer.incremental import IncrementalAnalyzer
+from src.analyzer.progressive import start_progressive_analysis
+from src.analyzer.batch import RESULT_COLUMNS, ResultTableWriter, analyze_documents, iter_documents
+from src.analyzer.result_cache import ResultCache
+from src.analyzer.scorers import SCORER_REGISTRY
+from src.dialects.loader import load_dialect_samples, dialect_corpus_version
+from src.analyzer.similarity_analyzer import get_shared_analyzer
 
 # Configure page with Apple-inspired styling
 st.set_page_config(
@@ -25,404 +36,405 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# Load CSS first with more aggressive targeting
-def load_css():
-    st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-
-    /* Global overrides */
-    .stApp {
-        background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%) !important;
-        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif !important;
-    }
-
+# Page styles; injected once per full script run (see load_css)
+APP_CSS = """
+<style>
+@import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
+
+/* Global overrides */
+.stApp {
+    background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%) !important;
+    font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif !important;
+}
+
+.main .block-container {
+    background: transparent !important;
+    padding-top: 2rem !important;
+    max-width: 1200px !important;
+}
+
+/* Hide Streamlit elements */
+#MainMenu {visibility: hidden !important;}
+footer {visibility: hidden !important;}
+header {visibility: hidden !important;}
+.stDeployButton {visibility: hidden !important;}
+
+/* Force all markdown containers to be transparent */
+div[data-testid="stMarkdownContainer"] {
+    background: transparent !important;
+}
+
+div[data-testid="stVerticalBlock"] {
+    background: transparent !important;
+}
+
+div[data-testid="column"] {
+    background: transparent !important;
+}
+
+/* Hero section styling with responsive design */
+.stMarkdown .hero-container,
+div[data-testid="stMarkdownContainer"] .hero-container {
+    text-align: center !important;
+    padding: clamp(2rem, 5vw, 4rem) clamp(1rem, 3vw, 2rem) !important;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
+    border-radius: clamp(16px, 3vw, 24px) !important;
+    margin: clamp(1rem, 2vw, 2rem) 0 !important;
+    color: white !important;
+    box-shadow: 0 20px 40px rgba(0,0,0,0.1) !important;
+}
+
+.stMarkdown .hero-title,
+div[data-testid="stMarkdownContainer"] .hero-title {
+    font-size: clamp(2rem, 6vw, 3.5rem) !important;
+    font-weight: 700 !important;
+    margin-bottom: clamp(0.5rem, 2vw, 1rem) !important;
+    letter-spacing: -0.02em !important;
+    background: linear-gradient(45deg, #fff, #e0e7ff) !important;
+    -webkit-background-clip: text !important;
+    -webkit-text-fill-color: transparent !important;
+    background-clip: text !important;
+    font-family: 'Inter', sans-serif !important;
+    line-height: 1.2 !important;
+}
+
+.stMarkdown .hero-subtitle,
+div[data-testid="stMarkdownContainer"] .hero-subtitle {
+    font-size: clamp(1rem, 3vw, 1.4rem) !important;
+    font-weight: 400 !important;
+    opacity: 0.9 !important;
+    margin-bottom: clamp(1rem, 3vw, 2rem) !important;
+    line-height: 1.5 !important;
+    color: white !important;
+    font-family: 'Inter', sans-serif !important;
+    max-width: 90% !important;
+    margin-left: auto !important;
+    margin-right: auto !important;
+}
+
+/* Why section responsive styling */
+.stMarkdown .why-section,
+div[data-testid="stMarkdownContainer"] .why-section {
+    background: rgba(255, 255, 255, 0.9) !important;
+    backdrop-filter: blur(20px) !important;
+    border-radius: clamp(16px, 3vw, 20px) !important;
+    padding: clamp(1.5rem, 4vw, 3rem) !important;
+    margin: clamp(1rem, 2vw, 2rem) 0 !important;
+    box-shadow: 0 10px 30px rgba(0,0,0,0.1) !important;
+    border: 1px solid rgba(255,255,255,0.2) !important;
+}
+
+.stMarkdown .why-title,
+div[data-testid="stMarkdownContainer"] .why-title {
+    font-size: clamp(1.8rem, 5vw, 2.5rem) !important;
+    font-weight: 600 !important;
+    color: #1d1d1f !important;
+    margin-bottom: clamp(1rem, 2vw, 1.5rem) !important;
+    text-align: center !important;
+    font-family: 'Inter', sans-serif !important;
+}
+
+.stMarkdown .why-text,
+div[data-testid="stMarkdownContainer"] .why-text {
+    font-size: clamp(1rem, 2.5vw, 1.1rem) !important;
+    line-height: 1.7 !important;
+    color: #424245 !important;
+    text-align: center !important;
+    max-width: min(800px, 90%) !important;
+    margin: 0 auto clamp(1rem, 2vw, 2rem) !important;
+    font-family: 'Inter', sans-serif !important;
+}
+
+/* Responsive insight cards */
+.stMarkdown .insight-card,
+div[data-testid="stMarkdownContainer"] .insight-card {
+    background: rgba(255, 255, 255, 0.8) !important;
+    backdrop-filter: blur(20px) !important;
+    border-radius: clamp(12px, 2vw, 16px) !important;
+    padding: clamp(1rem, 3vw, 2rem) !important;
+    margin: clamp(0.5rem, 1vw, 1rem) 0 !important;
+    box-shadow: 0 8px 25px rgba(0,0,0,0.08) !important;
+    border: 1px solid rgba(255,255,255,0.3) !important;
+    transition: all 0.3s ease !important;
+    height: 100% !important;
+    display: flex !important;
+    flex-direction: column !important;
+}
+
+.stMarkdown .insight-card:hover,
+div[data-testid="stMarkdownContainer"] .insight-card:hover {
+    transform: translateY(-2px) !important;
+    box-shadow: 0 12px 35px rgba(0,0,0,0.12) !important;
+}
+
+.stMarkdown .insight-number,
+div[data-testid="stMarkdownContainer"] .insight-number {
+    font-size: clamp(2rem, 6vw, 3rem) !important;
+    font-weight: 700 !important;
+    color: #667eea !important;
+    line-height: 1 !important;
+    margin-bottom: clamp(0.25rem, 1vw, 0.5rem) !important;
+    font-family: 'Inter', sans-serif !important;
+}
+
+.stMarkdown .insight-title,
+div[data-testid="stMarkdownContainer"] .insight-title {
+    font-size: clamp(1.1rem, 2.5vw, 1.3rem) !important;
+    font-weight: 600 !important;
+    color: #1d1d1f !important;
+    margin-bottom: clamp(0.25rem, 1vw, 0.5rem) !important;
+    font-family: 'Inter', sans-serif !important;
+}
+
+.stMarkdown .insight-text,
+div[data-testid="stMarkdownContainer"] .insight-text {
+    color: #515154 !important;
+    line-height: 1.6 !important;
+    font-family: 'Inter', sans-serif !important;
+    font-size: clamp(0.9rem, 2vw, 1rem) !important;
+    flex-grow: 1 !important;
+}
+
+/* Responsive input section */
+.stMarkdown .input-section,
+div[data-testid="stMarkdownContainer"] .input-section {
+    background: rgba(255, 255, 255, 0.9) !important;
+    backdrop-filter: blur(20px) !important;
+    border-radius: clamp(16px, 3vw, 20px) !important;
+    padding: clamp(1.5rem, 4vw, 2.5rem) !important;
+    margin: clamp(1rem, 2vw, 2rem) 0 !important;
+    box-shadow: 0 10px 30px rgba(0,0,0,0.1) !important;
+}
+
+.stMarkdown .section-title,
+div[data-testid="stMarkdownContainer"] .section-title {
+    font-size: clamp(1.5rem, 4vw, 2rem) !important;
+    font-weight: 600 !important;
+    color: #1d1d1f !important;
+    margin-bottom: clamp(0.5rem, 1vw, 1rem) !important;
+    text-align: center !important;
+    font-family: 'Inter', sans-serif !important;
+}
+
+/* Responsive button styling */
+.stButton > button {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
+    color: white !important;
+    border: none !important;
+    border-radius: clamp(8px, 2vw, 12px) !important;
+    padding: clamp(0.5rem, 2vw, 0.75rem) clamp(1rem, 3vw, 2rem) !important;
+    font-size: clamp(0.9rem, 2.5vw, 1.1rem) !important;
+    font-weight: 600 !important;
+    transition: all 0.3s ease !important;
+    box-shadow: 0 4px 15px rgba(102, 126, 234, 0.4) !important;
+    width: 100% !important;
+    font-family: 'Inter', sans-serif !important;
+}
+
+.stButton > button:hover {
+    transform: translateY(-2px) !important;
+    box-shadow: 0 8px 25px rgba(102, 126, 234, 0.5) !important;
+}
+
+/* Responsive text area styling */
+.stTextArea > div > div > textarea {
+    background: rgba(255, 255, 255, 0.9) !important;
+    border: 2px solid rgba(102, 126, 234, 0.2) !important;
+    border-radius: clamp(8px, 2vw, 12px) !important;
+    font-family: 'Inter', sans-serif !important;
+    font-size: clamp(0.9rem, 2vw, 1rem) !important;
+    padding: clamp(0.75rem, 2vw, 1rem) !important;
+    min-height: clamp(120px, 20vh, 150px) !important;
+}
+
+.stTextArea > div > div > textarea:focus {
+    border-color: #667eea !important;
+    box-shadow: 0 0 0 2px rgba(102, 126, 234, 0.2) !important;
+}
+
+.stTextArea label {
+    font-family: 'Inter', sans-serif !important;
+    font-weight: 500 !important;
+    color: #1d1d1f !important;
+    font-size: clamp(0.9rem, 2vw, 1rem) !important;
+}
+
+/* Responsive metric containers */
+.stMarkdown .metric-container,
+div[data-testid="stMarkdownContainer"] .metric-container {
+    background: rgba(255, 255, 255, 0.8) !important;
+    backdrop-filter: blur(20px) !important;
+    border-radius: clamp(12px, 2vw, 16px) !important;
+    padding: clamp(1rem, 2.5vw, 1.5rem) !important;
+    text-align: center !important;
+    box-shadow: 0 8px 25px rgba(0,0,0,0.08) !important;
+    border: 1px solid rgba(255,255,255,0.3) !important;
+    height: 100% !important;
+    display: flex !important;
+    flex-direction: column !important;
+    justify-content: center !important;
+}
+
+.stMarkdown .metric-container h2,
+div[data-testid="stMarkdownContainer"] .metric-container h2 {
+    font-size: clamp(1.2rem, 3vw, 1.8rem) !important;
+    margin: clamp(0.25rem, 1vw, 0.5rem) 0 !important;
+}
+
+.stMarkdown .metric-container h3,
+div[data-testid="stMarkdownContainer"] .metric-container h3 {
+    font-size: clamp(0.9rem, 2vw, 1.1rem) !important;
+}
+
+.stMarkdown .metric-container p,
+div[data-testid="stMarkdownContainer"] .metric-container p {
+    font-size: clamp(0.8rem, 1.8vw, 0.9rem) !important;
+}
+
+/* Responsive results section */
+.stMarkdown .results-section,
+div[data-testid="stMarkdownContainer"] .results-section {
+    background: rgba(255, 255, 255, 0.95) !important;
+    backdrop-filter: blur(20px) !important;
+    border-radius: clamp(16px, 3vw, 20px) !important;
+    padding: clamp(1.5rem, 4vw, 2.5rem) !important;
+    margin: clamp(1rem, 2vw, 2rem) 0 !important;
+    box-shadow: 0 15px 35px rgba(0,0,0,0.1) !important;
+    border: 1px solid rgba(255,255,255,0.2) !important;
+}
+
+/* Responsive typography */
+.stMarkdown h1, .stMarkdown h2, .stMarkdown h3, .stMarkdown h4, .stMarkdown h5, .stMarkdown h6 {
+    font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif !important;
+    color: #1d1d1f !important;
+}
+
+.stMarkdown h4 {
+    font-size: clamp(1.1rem, 3vw, 1.3rem) !important;
+}
+
+.stMarkdown p {
+    font-family: 'Inter', sans-serif !important;
+    font-size: clamp(0.9rem, 2vw, 1rem) !important;
+    line-height: 1.6 !important;
+}
+
+/* Mobile-specific adjustments */
+@media (max-width: 768px) {
     .main .block-container {
-        background: transparent !important;
-        padding-top: 2rem !important;
-        max-width: 1200px !important;
-    }
-
-    /* Hide Streamlit elements */
-    #MainMenu {visibility: hidden !important;}
-    footer {visibility: hidden !important;}
-    header {visibility: hidden !important;}
-    .stDeployButton {visibility: hidden !important;}
-
-    /* Force all markdown containers to be transparent */
-    div[data-testid="stMarkdownContainer"] {
-        background: transparent !important;
-    }
-
-    div[data-testid="stVerticalBlock"] {
-        background: transparent !important;
+        padding-left: 1rem !important;
+        padding-right: 1rem !important;
     }
-
-    div[data-testid="column"] {
-        background: transparent !important;
-    }
-
-    /* Hero section styling with responsive design */
+    
     .stMarkdown .hero-container,
     div[data-testid="stMarkdownContainer"] .hero-container {
-        text-align: center !important;
-        padding: clamp(2rem, 5vw, 4rem) clamp(1rem, 3vw, 2rem) !important;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
-        border-radius: clamp(16px, 3vw, 24px) !important;
-        margin: clamp(1rem, 2vw, 2rem) 0 !important;
-        color: white !important;
-        box-shadow: 0 20px 40px rgba(0,0,0,0.1) !important;
+        margin: 1rem 0 !important;
     }
-
-    .stMarkdown .hero-title,
-    div[data-testid="stMarkdownContainer"] .hero-title {
-        font-size: clamp(2rem, 6vw, 3.5rem) !important;
-        font-weight: 700 !important;
-        margin-bottom: clamp(0.5rem, 2vw, 1rem) !important;
-        letter-spacing: -0.02em !important;
-        background: linear-gradient(45deg, #fff, #e0e7ff) !important;
-        -webkit-background-clip: text !important;
-        -webkit-text-fill-color: transparent !important;
-        background-clip: text !important;
-        font-family: 'Inter', sans-serif !important;
-        line-height: 1.2 !important;
-    }
-
-    .stMarkdown .hero-subtitle,
-    div[data-testid="stMarkdownContainer"] .hero-subtitle {
-        font-size: clamp(1rem, 3vw, 1.4rem) !important;
-        font-weight: 400 !important;
-        opacity: 0.9 !important;
-        margin-bottom: clamp(1rem, 3vw, 2rem) !important;
-        line-height: 1.5 !important;
-        color: white !important;
-        font-family: 'Inter', sans-serif !important;
-        max-width: 90% !important;
-        margin-left: auto !important;
-        margin-right: auto !important;
-    }
-
-    /* Why section responsive styling */
+    
     .stMarkdown .why-section,
-    div[data-testid="stMarkdownContainer"] .why-section {
-        background: rgba(255, 255, 255, 0.9) !important;
-        backdrop-filter: blur(20px) !important;
-        border-radius: clamp(16px, 3vw, 20px) !important;
-        padding: clamp(1.5rem, 4vw, 3rem) !important;
-        margin: clamp(1rem, 2vw, 2rem) 0 !important;
-        box-shadow: 0 10px 30px rgba(0,0,0,0.1) !important;
-        border: 1px solid rgba(255,255,255,0.2) !important;
-    }
-
-    .stMarkdown .why-title,
-    div[data-testid="stMarkdownContainer"] .why-title {
-        font-size: clamp(1.8rem, 5vw, 2.5rem) !important;
-        font-weight: 600 !important;
-        color: #1d1d1f !important;
-        margin-bottom: clamp(1rem, 2vw, 1.5rem) !important;
-        text-align: center !important;
-        font-family: 'Inter', sans-serif !important;
-    }
-
-    .stMarkdown .why-text,
-    div[data-testid="stMarkdownContainer"] .why-text {
-        font-size: clamp(1rem, 2.5vw, 1.1rem) !important;
-        line-height: 1.7 !important;
-        color: #424245 !important;
-        text-align: center !important;
-        max-width: min(800px, 90%) !important;
-        margin: 0 auto clamp(1rem, 2vw, 2rem) !important;
-        font-family: 'Inter', sans-serif !important;
-    }
-
-    /* Responsive insight cards */
-    .stMarkdown .insight-card,
-    div[data-testid="stMarkdownContainer"] .insight-card {
-        background: rgba(255, 255, 255, 0.8) !important;
-        backdrop-filter: blur(20px) !important;
-        border-radius: clamp(12px, 2vw, 16px) !important;
-        padding: clamp(1rem, 3vw, 2rem) !important;
-        margin: clamp(0.5rem, 1vw, 1rem) 0 !important;
-        box-shadow: 0 8px 25px rgba(0,0,0,0.08) !important;
-        border: 1px solid rgba(255,255,255,0.3) !important;
-        transition: all 0.3s ease !important;
-        height: 100% !important;
-        display: flex !important;
-        flex-direction: column !important;
-    }
-
-    .stMarkdown .insight-card:hover,
-    div[data-testid="stMarkdownContainer"] .insight-card:hover {
-        transform: translateY(-2px) !important;
-        box-shadow: 0 12px 35px rgba(0,0,0,0.12) !important;
-    }
-
-    .stMarkdown .insight-number,
-    div[data-testid="stMarkdownContainer"] .insight-number {
-        font-size: clamp(2rem, 6vw, 3rem) !important;
-        font-weight: 700 !important;
-        color: #667eea !important;
-        line-height: 1 !important;
-        margin-bottom: clamp(0.25rem, 1vw, 0.5rem) !important;
-        font-family: 'Inter', sans-serif !important;
-    }
-
-    .stMarkdown .insight-title,
-    div[data-testid="stMarkdownContainer"] .insight-title {
-        font-size: clamp(1.1rem, 2.5vw, 1.3rem) !important;
-        font-weight: 600 !important;
-        color: #1d1d1f !important;
-        margin-bottom: clamp(0.25rem, 1vw, 0.5rem) !important;
-        font-family: 'Inter', sans-serif !important;
-    }
-
-    .stMarkdown .insight-text,
-    div[data-testid="stMarkdownContainer"] .insight-text {
-        color: #515154 !important;
-        line-height: 1.6 !important;
-        font-family: 'Inter', sans-serif !important;
-        font-size: clamp(0.9rem, 2vw, 1rem) !important;
-        flex-grow: 1 !important;
-    }
-
-    /* Responsive input section */
+    div[data-testid="stMarkdownContainer"] .why-section,
     .stMarkdown .input-section,
-    div[data-testid="stMarkdownContainer"] .input-section {
-        background: rgba(255, 255, 255, 0.9) !important;
-        backdrop-filter: blur(20px) !important;
-        border-radius: clamp(16px, 3vw, 20px) !important;
-        padding: clamp(1.5rem, 4vw, 2.5rem) !important;
-        margin: clamp(1rem, 2vw, 2rem) 0 !important;
-        box-shadow: 0 10px 30px rgba(0,0,0,0.1) !important;
-    }
-
-    .stMarkdown .section-title,
-    div[data-testid="stMarkdownContainer"] .section-title {
-        font-size: clamp(1.5rem, 4vw, 2rem) !important;
-        font-weight: 600 !important;
-        color: #1d1d1f !important;
-        margin-bottom: clamp(0.5rem, 1vw, 1rem) !important;
-        text-align: center !important;
-        font-family: 'Inter', sans-serif !important;
-    }
-
-    /* Responsive button styling */
-    .stButton > button {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
-        color: white !important;
-        border: none !important;
-        border-radius: clamp(8px, 2vw, 12px) !important;
-        padding: clamp(0.5rem, 2vw, 0.75rem) clamp(1rem, 3vw, 2rem) !important;
-        font-size: clamp(0.9rem, 2.5vw, 1.1rem) !important;
-        font-weight: 600 !important;
-        transition: all 0.3s ease !important;
-        box-shadow: 0 4px 15px rgba(102, 126, 234, 0.4) !important;
-        width: 100% !important;
-        font-family: 'Inter', sans-serif !important;
-    }
-
-    .stButton > button:hover {
-        transform: translateY(-2px) !important;
-        box-shadow: 0 8px 25px rgba(102, 126, 234, 0.5) !important;
-    }
-
-    /* Responsive text area styling */
-    .stTextArea > div > div > textarea {
-        background: rgba(255, 255, 255, 0.9) !important;
-        border: 2px solid rgba(102, 126, 234, 0.2) !important;
-        border-radius: clamp(8px, 2vw, 12px) !important;
-        font-family: 'Inter', sans-serif !important;
-        font-size: clamp(0.9rem, 2vw, 1rem) !important;
-        padding: clamp(0.75rem, 2vw, 1rem) !important;
-        min-height: clamp(120px, 20vh, 150px) !important;
-    }
-
-    .stTextArea > div > div > textarea:focus {
-        border-color: #667eea !important;
-        box-shadow: 0 0 0 2px rgba(102, 126, 234, 0.2) !important;
-    }
-
-    .stTextArea label {
-        font-family: 'Inter', sans-serif !important;
-        font-weight: 500 !important;
-        color: #1d1d1f !important;
-        font-size: clamp(0.9rem, 2vw, 1rem) !important;
-    }
-
-    /* Responsive metric containers */
-    .stMarkdown .metric-container,
-    div[data-testid="stMarkdownContainer"] .metric-container {
-        background: rgba(255, 255, 255, 0.8) !important;
-        backdrop-filter: blur(20px) !important;
-        border-radius: clamp(12px, 2vw, 16px) !important;
-        padding: clamp(1rem, 2.5vw, 1.5rem) !important;
-        text-align: center !important;
-        box-shadow: 0 8px 25px rgba(0,0,0,0.08) !important;
-        border: 1px solid rgba(255,255,255,0.3) !important;
-        height: 100% !important;
-        display: flex !important;
-        flex-direction: column !important;
-        justify-content: center !important;
-    }
-
-    .stMarkdown .metric-container h2,
-    div[data-testid="stMarkdownContainer"] .metric-container h2 {
-        font-size: clamp(1.2rem, 3vw, 1.8rem) !important;
-        margin: clamp(0.25rem, 1vw, 0.5rem) 0 !important;
-    }
-
-    .stMarkdown .metric-container h3,
-    div[data-testid="stMarkdownContainer"] .metric-container h3 {
-        font-size: clamp(0.9rem, 2vw, 1.1rem) !important;
-    }
-
-    .stMarkdown .metric-container p,
-    div[data-testid="stMarkdownContainer"] .metric-container p {
-        font-size: clamp(0.8rem, 1.8vw, 0.9rem) !important;
-    }
-
-    /* Responsive results section */
+    div[data-testid="stMarkdownContainer"] .input-section,
     .stMarkdown .results-section,
     div[data-testid="stMarkdownContainer"] .results-section {
-        background: rgba(255, 255, 255, 0.95) !important;
-        backdrop-filter: blur(20px) !important;
-        border-radius: clamp(16px, 3vw, 20px) !important;
-        padding: clamp(1.5rem, 4vw, 2.5rem) !important;
-        margin: clamp(1rem, 2vw, 2rem) 0 !important;
-        box-shadow: 0 15px 35px rgba(0,0,0,0.1) !important;
-        border: 1px solid rgba(255,255,255,0.2) !important;
-    }
-
-    /* Responsive typography */
-    .stMarkdown h1, .stMarkdown h2, .stMarkdown h3, .stMarkdown h4, .stMarkdown h5, .stMarkdown h6 {
-        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif !important;
-        color: #1d1d1f !important;
-    }
-
-    .stMarkdown h4 {
-        font-size: clamp(1.1rem, 3vw, 1.3rem) !important;
-    }
-
-    .stMarkdown p {
-        font-family: 'Inter', sans-serif !important;
-        font-size: clamp(0.9rem, 2vw, 1rem) !important;
-        line-height: 1.6 !important;
-    }
-
-    /* Mobile-specific adjustments */
-    @media (max-width: 768px) {
-        .main .block-container {
-            padding-left: 1rem !important;
-            padding-right: 1rem !important;
-        }
-        
-        .stMarkdown .hero-container,
-        div[data-testid="stMarkdownContainer"] .hero-container {
-            margin: 1rem 0 !important;
-        }
-        
-        .stMarkdown .why-section,
-        div[data-testid="stMarkdownContainer"] .why-section,
-        .stMarkdown .input-section,
-        div[data-testid="stMarkdownContainer"] .input-section,
-        .stMarkdown .results-section,
-        div[data-testid="stMarkdownContainer"] .results-section {
-            margin: 1rem 0 !important;
-        }
-        
-        .stMarkdown .insight-card,
-        div[data-testid="stMarkdownContainer"] .insight-card {
-            margin: 0.5rem 0 !important;
-        }
-    }
-
-    /* Tablet adjustments */
-    @media (min-width: 769px) and (max-width: 1024px) {
-        .main .block-container {
-            max-width: 90% !important;
-        }
-    }
-
-    /* Large screen adjustments */
-    @media (min-width: 1400px) {
-        .main .block-container {
-            max-width: 1200px !important;
-        }
+        margin: 1rem 0 !important;
     }
-
-    /* Progress bars */
-    .progress-container {
-        background: #f0f0f0 !important;
-        border-radius: 10px !important;
-        height: 8px !important;
-        margin: 0.5rem 0 !important;
-        overflow: hidden !important;
-    }
-
-    .progress-bar {
-        background: linear-gradient(90deg, #667eea, #764ba2) !important;
-        height: 100% !important;
-        border-radius: 10px !important;
-        transition: width 1s ease !important;
-    }
-
-    /* Dialect preview */
-    .dialect-preview {
-        background: rgba(102, 126, 234, 0.05) !important;
-        border-left: 4px solid #667eea !important;
-        border-radius: 8px !important;
-        padding: 1rem !important;
+    
+    .stMarkdown .insight-card,
+    div[data-testid="stMarkdownContainer"] .insight-card {
         margin: 0.5rem 0 !important;
     }
+}
 
-    /* Animations */
-    .fade-in {
-        animation: fadeIn 0.8s ease-in !important;
-    }
-
-    @keyframes fadeIn {
-        from { opacity: 0; transform: translateY(20px); }
-        to { opacity: 1; transform: translateY(0); }
-    }
-
-    /* Typography overrides */
-    .stMarkdown h1, .stMarkdown h2, .stMarkdown h3, .stMarkdown h4, .stMarkdown h5, .stMarkdown h6 {
-        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif !important;
-        color: #1d1d1f !important;
-    }
-
-    .stMarkdown p {
-        font-family: 'Inter', sans-serif !important;
-    }
-
-    /* Custom scrollbar */
-    ::-webkit-scrollbar {
-        width: 8px;
-    }
-
-    ::-webkit-scrollbar-track {
-        background: rgba(255, 255, 255, 0.1);
-        border-radius: 4px;
+/* Tablet adjustments */
+@media (min-width: 769px) and (max-width: 1024px) {
+    .main .block-container {
+        max-width: 90% !important;
     }
+}
 
-    ::-webkit-scrollbar-thumb {
-        background: rgba(102, 126, 234, 0.3);
-        border-radius: 4px;
+/* Large screen adjustments */
+@media (min-width: 1400px) {
+    .main .block-container {
+        max-width: 1200px !important;
     }
+}
+
+/* Progress bars */
+.progress-container {
+    background: #f0f0f0 !important;
+    border-radius: 10px !important;
+    height: 8px !important;
+    margin: 0.5rem 0 !important;
+    overflow: hidden !important;
+}
+
+.progress-bar {
+    background: linear-gradient(90deg, #667eea, #764ba2) !important;
+    height: 100% !important;
+    border-radius: 10px !important;
+    transition: width 1s ease !important;
+}
+
+/* Dialect preview */
+.dialect-preview {
+    background: rgba(102, 126, 234, 0.05) !important;
+    border-left: 4px solid #667eea !important;
+    border-radius: 8px !important;
+    padding: 1rem !important;
+    margin: 0.5rem 0 !important;
+}
+
+/* Animations */
+.fade-in {
+    animation: fadeIn 0.8s ease-in !important;
+}
+
+@keyframes fadeIn {
+    from { opacity: 0; transform: translateY(20px); }
+    to { opacity: 1; transform: translateY(0); }
+}
+
+/* Typography overrides */
+.stMarkdown h1, .stMarkdown h2, .stMarkdown h3, .stMarkdown h4, .stMarkdown h5, .stMarkdown h6 {
+    font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif !important;
+    color: #1d1d1f !important;
+}
+
+.stMarkdown p {
+    font-family: 'Inter', sans-serif !important;
+}
+
+/* Custom scrollbar */
+::-webkit-scrollbar {
+    width: 8px;
+}
+
+::-webkit-scrollbar-track {
+    background: rgba(255, 255, 255, 0.1);
+    border-radius: 4px;
+}
+
+::-webkit-scrollbar-thumb {
+    background: rgba(102, 126, 234, 0.3);
+    border-radius: 4px;
+}
+
+::-webkit-scrollbar-thumb:hover {
+    background: rgba(102, 126, 234, 0.5);
+}
+
+/* Force font loading */
+* {
+    font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif !important;
+}
+</style>
+"""
 
-    ::-webkit-scrollbar-thumb:hover {
-        background: rgba(102, 126, 234, 0.5);
-    }
 
-    /* Force font loading */
-    * {
-        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+def load_css():
+    st.markdown(APP_CSS, unsafe_allow_html=True)
 
-# Load CSS immediately
-load_css()
 
 @st.cache_resource
 def initialize_analyzer():
@@ -433,7 +445,12 @@ def initialize_analyzer():
             st.error("⚠️ OpenAI API key not found. Please check your configuration.")
             return None
         
-        embeddings_manager = create_embeddings_manager(api_key)
+        # Sessions share this manager, so concurrent analyses coalesce their embedding calls
+        embeddings_manager = create_embeddings_manager(
+            api_key, base_url=get_config('OPENAI_BASE_URL'),
+            batch_window_ms=EMBEDDING_BATCH_WINDOW_MS, max_batch_size=EMBEDDING_MAX_BATCH_SIZE,
+            lowercase_keys=EMBEDDING_LOWERCASE_KEYS, near_duplicate_distance=EMBEDDING_NEAR_DUPLICATE_DISTANCE
+        )
         if embeddings_manager:
             st.success("🤖 AI-powered analysis enabled!")
             return embeddings_manager
@@ -446,36 +463,60 @@ def initialize_analyzer():
 
 
 
-# In your run_app, pass embeddings_manager to analyze_text_patterns where needed
-def run_app():
-    load_css() # Reload CSS to ensure it's applied
-    embeddings_manager = initialize_analyzer() # Initialize embeddings manager
-    analyzer = PatternAnalyzer(embeddings_manager) # Create analyzer
-    
-    # Hero Section
-    st.markdown("""
+@st.cache_resource
+def get_result_cache():
+    """Process-wide cache of complete analysis results, persisted across restarts"""
+    return ResultCache()
+
+
+@st.cache_resource
+def get_pattern_analyzer():
+    """Process-wide analyzer shared by all sessions, so warmed dialect state is reused"""
+    return PatternAnalyzer(initialize_analyzer(), result_cache=get_result_cache(), tfidf_mode=TFIDF_MODE)
+
+
+@st.cache_resource
+def start_metrics_endpoint():
+    """Serve the process's metrics on METRICS_PORT (once per process), if configured"""
+    if not METRICS_PORT:
+        return None
+    from src.analyzer.metrics import start_metrics_server
+    try:
+        return start_metrics_server(METRICS_PORT, METRICS_HOST)
+    except OSError as e:
+        st.warning(f"⚠️ Metrics endpoint unavailable: {e}")
+        return None
+
+
+def render_debug_timings(timings: Dict):
+    """Debug panel with per-stage timings and cache hits of one analysis (shown when DEBUG is set)"""
+    with st.expander("🛠️ Debug: stage timings", expanded=False):
+        if not timings:
+            st.markdown("No timings recorded for this analysis.")
+            return
+        st.markdown(f"**Total:** {timings.get('total_ms', 0.0):.2f} ms")
+        stages = timings.get('stages_ms', {})
+        if stages:
+            st.table(pd.DataFrame(
+                [{'stage': name, 'ms': round(ms, 3)} for name, ms in stages.items()]
+            ).set_index('stage'))
+        cache_hits = timings.get('cache_hits', {})
+        if cache_hits:
+            st.markdown("**Caches:** " + ", ".join(
+                f"{name}: {'hit' if hit else 'miss'}" for name, hit in cache_hits.items()
+            ))
+
+
+HERO_HTML = """
     <div class="hero-container fade-in">
         <div class="hero-title">Your Words<br>Reveal Your World</div>
         <div class="hero-subtitle">
             Discover the hidden influences shaping how you think, speak, and see reality
         </div>
     </div>
-    """, unsafe_allow_html=True)
+    """
 
-    # System Status Indicator
-    if embeddings_manager:
-        status_html = '<span class="status-indicator status-embeddings">🤖 AI Analysis Active</span>'
-    else:
-        status_html = '<span class="status-indicator status-fallback">📝 Basic Analysis</span>'
-    
-    st.markdown(f"""
-    <div style="text-align: center; margin: 1rem 0;">
-        Analysis Mode: {status_html}
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Why Section - Simon Sinek Style
-    st.markdown("""
+WHY_HTML = """
     <div class="why-section fade-in">
         <div class="why-title">Why does this matter?</div>
         <div class="why-text">
@@ -491,13 +532,10 @@ def run_app():
             What if you could understand which voices have unconsciously become your voice?
         </div>
     </div>
-    """, unsafe_allow_html=True)
-    
-    # Three Key Insights
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown("""
+    """
+
+INSIGHT_CARDS_HTML = (
+    """
         <div class="insight-card fade-in">
             <div class="insight-number">01</div>
             <div class="insight-title">Hidden Influence</div>
@@ -506,10 +544,8 @@ def run_app():
                 ideologies have shaped your worldview—often without you realizing it.
             </div>
         </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
+        """,
+    """
         <div class="insight-card fade-in">
             <div class="insight-number">02</div>
             <div class="insight-title">Blind Spots</div>
@@ -518,10 +554,8 @@ def run_app():
                 Understanding your linguistic biases helps you see where your perspective might be limited.
             </div>
         </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown("""
+        """,
+    """
         <div class="insight-card fade-in">
             <div class="insight-number">03</div>
             <div class="insight-title">Conscious Choice</div>
@@ -530,15 +564,90 @@ def run_app():
                 you can choose more intentionally what influences to embrace.
             </div>
         </div>
-        """, unsafe_allow_html=True)
-    
-    # Input Section
-    st.markdown("""
+        """,
+)
+
+INPUT_SECTION_HTML = """
     <div class="input-section">
         <div class="section-title">See Your Reflection</div>
     </div>
+    """
+
+FOOTER_HTML = """
+    <div style="text-align: center; padding: 3rem 1rem; color: #666;">
+        <h3 style="color: #1d1d1f;">Ready to expand your perspective?</h3>
+        <p>Understanding your influences is the first step toward conscious growth.</p>
+        <p style="font-size: 0.9rem; margin-top: 2rem;">
+            EchoLens uses AI to reveal the invisible patterns in your language, 
+            helping you become more aware of how your worldview is shaped.
+        </p>
+    </div>
+    """
+
+# Analyses kept per session (oldest dropped first)
+MAX_SESSION_RESULTS = 20
+
+# Background refinement: how long to wait before showing the quick result, and the status poll interval
+REFINE_GRACE_SECONDS = 0.15
+REFINE_POLL_SECONDS = 0.5
+
+# Bulk upload: documents per analysis batch, parallel workers and rows kept for the live preview
+BULK_BATCH_SIZE = 16
+BULK_WORKERS = 4
+BULK_PREVIEW_ROWS = 200
+
+# Result badge colours per analysis method (scorers without one use the default)
+METHOD_COLORS = {'embeddings': "#10b981", 'tfidf': "#667eea", 'stylometry': "#8b5cf6", 'cascade': "#0ea5e9"}
+DEFAULT_METHOD_COLOR = "#f59e0b"
+CASCADE_LABEL = "⚡ Cost-Aware Cascade Analysis"
+
+STATUS_EMBEDDINGS_HTML = '<span class="status-indicator status-embeddings">🤖 AI Analysis Active</span>'
+STATUS_FALLBACK_HTML = '<span class="status-indicator status-fallback">📝 Basic Analysis</span>'
+
+
+def render_static_content(embeddings_manager):
+    """Hero, mode indicator, why section and insight cards; unaffected by analysis reruns"""
+    st.markdown(HERO_HTML, unsafe_allow_html=True)
+
+    # System Status Indicator
+    status_html = STATUS_EMBEDDINGS_HTML if embeddings_manager else STATUS_FALLBACK_HTML
+    st.markdown(f"""
+    <div style="text-align: center; margin: 1rem 0;">
+        Analysis Mode: {status_html}
+    </div>
     """, unsafe_allow_html=True)
+
+    st.markdown(WHY_HTML, unsafe_allow_html=True)
+
+    for column, card_html in zip(st.columns(3), INSIGHT_CARDS_HTML):
+        with column:
+            st.markdown(card_html, unsafe_allow_html=True)
+
+    st.markdown(INPUT_SECTION_HTML, unsafe_allow_html=True)
+
+
+def run_app():
+    load_css()
+    start_metrics_endpoint()
+    embeddings_manager = initialize_analyzer() # Initialize embeddings manager
+    analyzer = get_pattern_analyzer() # Shared across sessions and threads
+    
+    # Keep per-segment embeddings for the session so edits only re-embed what changed
+    if embeddings_manager and 'incremental_analyzer' not in st.session_state:
+        st.session_state.incremental_analyzer = IncrementalAnalyzer(analyzer)
     
+    # Static page content is only sent on full reruns; widget interactions
+    # inside the analysis section rerun just that fragment
+    render_static_content(embeddings_manager)
+    analysis_section(analyzer, embeddings_manager)
+    bulk_analysis_section(analyzer)
+    
+    st.markdown(FOOTER_HTML, unsafe_allow_html=True)
+
+
+@st.fragment
+def analysis_section(analyzer: PatternAnalyzer, embeddings_manager):
+    """Input, dialect list and results; reruns in isolation when its widgets change"""
     # Load dialects
     dialects = load_dialect_samples()
     
@@ -564,185 +673,333 @@ def run_app():
         for name in dialects.keys():
             st.markdown(f"• **{name}**")
     
-   # Analysis Results
+    # Analysis Results
     if analyze_button and user_text:
         if len(user_text.strip()) < 50:
             st.warning("⚠️ Please enter at least 50 characters for meaningful analysis.")
         else:
-            analysis_method = "AI-powered semantic analysis" if embeddings_manager else "pattern matching analysis"
-            with st.spinner(f"🔍 Running {analysis_method}..."):
-                time.sleep(1)
-
-                # 1) Unpack the tuple: scores dict and the actual method used
-                scores, method_used = analyzer.analyze_text(user_text)
-                
-                # 2) Pass BOTH scores and method_used into get_detailed_analysis
-                detailed_analysis = analyzer.get_detailed_analysis(user_text, scores, method_used)
-
-                # Now use detailed_analysis['sorted_scores'], detailed_analysis['top_dialect'], etc.
-                if scores:
-                    # Pull out what you need
-                    sorted_scores = detailed_analysis['sorted_scores']
-                    top_dialect   = detailed_analysis['top_dialect']
-                    top_score     = detailed_analysis['top_score']
-                    avg_score     = detailed_analysis['avg_score']
-                    uniqueness    = detailed_analysis['uniqueness']
-
-                    # Choose display text/colors based on the actual method used
-                    method_display = "🤖 AI Semantic Analysis" if method_used == 'embeddings' else "📝 Word Pattern Analysis"
-                    method_color   = "#10b981" if method_used == 'embeddings' else "#f59e0b"
-                
-                    st.markdown("""
-                    <div class="results-section fade-in">
-                        <div class="section-title">Your Linguistic Reflection</div>
-                     </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Analysis method indicator
-                    method_text = detailed_analysis.get('analysis_method', 'unknown')
-                    if method_text == 'embeddings':
-                        method_display = "🤖 AI Semantic Analysis"
-                        method_color = "#10b981"
-                    else:
-                        method_display = "📝 Word Pattern Analysis"  
-                        method_color = "#f59e0b"
-                    
-                    st.markdown(f"""
-                    <div style="text-align: center; margin-bottom: 2rem;">
-                        <span style="color: {method_color}; font-weight: 600; font-size: 0.9rem;">
-                            {method_display}
-                        </span>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Use existing metrics and analysis display code but replace:
-                    # detailed_analysis.get('avg_score', 0) instead of sum(scores.values()) / len(scores)
-                    # detailed_analysis.get('uniqueness', 0) instead of 100 - (top_score * 100)
-                    
-                    # Detailed Analysis
-                    st.markdown('<h4 style="color: #1d1d1f; font-weight: 600; margin: 2rem 0 1rem 0;">Your Influence Breakdown</h4>', unsafe_allow_html=True)
-                    
-                    for dialect, score in sorted_scores:
-                        percentage = score * 100
-                        st.markdown(f"""
-                        <div style="background: rgba(255, 255, 255, 0.8); backdrop-filter: blur(20px); border-radius: 12px; padding: 1.5rem; margin: 1rem 0; box-shadow: 0 4px 15px rgba(0,0,0,0.08);">
-                            <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 1rem;">
-                                <span style="font-weight: 600; color: #1d1d1f; font-size: 1.1rem;">{dialect}</span>
-                                <span style="color: #667eea; font-weight: bold; font-size: 1.1rem;">{percentage:.1f}%</span>
-                            </div>
-                            <div class="progress-container" style="height: 12px; background: #e8e8e8; border-radius: 6px; overflow: hidden;">
-                                <div class="progress-bar" style="width: {percentage}%; height: 100%; background: linear-gradient(90deg, #667eea, #764ba2); border-radius: 6px; transition: width 1.5s ease;"></div>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    # Pattern Analysis
-                    st.markdown('<h4 style="color: #1d1d1f; font-weight: 600; margin: 2rem 0 1rem 0;">🎯 Pattern Analysis</h4>', unsafe_allow_html=True)
-                    
-                    # Get meaningful words
-                    user_words = set(user_text.lower().split())
-                    dialect_words = set(dialects[top_dialect].lower().split())
-                    common_words = user_words.intersection(dialect_words)
-                    
-                    stop_words = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them', 'my', 'your', 'his', 'hers', 'its', 'our', 'their'}
-                    meaningful_words = common_words - stop_words
-                    
-                    if meaningful_words:
-                        pattern_text = f"**Key phrases echoing {top_dialect} patterns:** {', '.join(sorted(meaningful_words))}"
-                    else:
-                        pattern_text = f"**Analysis:** Your text shows subtle patterns similar to {top_dialect} communication style."
-                    
-                    # Custom styled info box
-                    st.markdown(f"""
-                    <div style="background: rgba(102, 126, 234, 0.1); border-left: 4px solid #667eea; border-radius: 8px; padding: 1.5rem; margin: 1rem 0; font-size: 1.1rem; color: #1d1d1f;">
-                        {pattern_text}
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    
-                    # ─── Quick TF-IDF Influence Demo ─────────────────────────────────
-                    # this sits right after your Pattern Analysis box  
-                    #sim_analyzer = SimilarityAnalyzer(dialects)
-                    #influence_scores, df_top_terms = sim_analyzer.analyze(
-                    #    user_text,
-                    #    top_n_terms=10
-                    #)
+            results = st.session_state.setdefault('analysis_results', OrderedDict())
+            result_key = analysis_key(user_text)
+            if result_key not in results:
+                refine = None
+                if embeddings_manager:
+                    incremental_analyzer = st.session_state.incremental_analyzer
+                    refine = lambda: incremental_analyzer.analyze_with_details(user_text, collect_timings=DEBUG)
+                with st.spinner("🔍 Running pattern analysis..."):
+                    # Local result now; semantic analysis (if available) continues in the background
+                    job = start_progressive_analysis(analyzer, user_text, refine=refine, collect_timings=DEBUG)
+                    job.wait(timeout=REFINE_GRACE_SECONDS) # Skip the intermediate view when refining is instant
+                results[result_key] = {'text': user_text, 'job': job}
+                while len(results) > MAX_SESSION_RESULTS:
+                    results.popitem(last=False)
+            st.session_state.current_analysis_text = user_text
     
-                    #st.subheader("🔍 TF-IDF Influence Scores")
-                    #st.bar_chart(influence_scores)
+    # Re-render the latest analysis on every rerun, so other interactions don't lose it.
+    # Results for an older dialect corpus no longer match their key and aren't shown.
+    current_text = st.session_state.get('current_analysis_text')
+    result = st.session_state.get('analysis_results', {}).get(analysis_key(current_text)) if current_text else None
+    if result:
+        job = result['job']
+        render_analysis_status(job)
+        if not job.done:
+            # This run ends right after rendering the quick result; the poller refreshes the page once refined
+            refine_poller(job)
+        scores, method_used, detailed_analysis = job.result()
+        if DEBUG:
+            render_debug_timings(detailed_analysis.get('timings'))
+        render_analysis_results(scores, method_used, detailed_analysis, dialects, result)
+
+
+@st.fragment(run_every=REFINE_POLL_SECONDS)
+def refine_poller(job):
+    """
+    Re-checks a background refinement every REFINE_POLL_SECONDS without holding a run open
     
-                    #st.subheader("📝 Top Terms by TF-IDF Weight")
-                    #st.dataframe(df_top_terms)
-                    # ──   
-                    
-                    # Show top 3 matches with better styling
-                    st.markdown("""
-                    <div style="background: rgba(255, 255, 255, 0.8); backdrop-filter: blur(20px); border-radius: 12px; padding: 1.5rem; margin: 1.5rem 0; box-shadow: 0 4px 15px rgba(0,0,0,0.08);">
-                        <h5 style="color: #1d1d1f; font-weight: 600; margin: 0 0 1rem 0;">Top 3 Dialect Matches:</h5>
-                    """, unsafe_allow_html=True)
-                    
-                    for i, (dialect, score) in enumerate(sorted_scores[:3]):
-                        st.markdown(f"""
-                        <div style="margin: 0.75rem 0; padding: 0.5rem 0;">
-                            <span style="color: #667eea; font-weight: bold; font-size: 1.1rem;">{i+1}.</span>
-                            <span style="font-weight: 600; color: #1d1d1f; margin-left: 0.5rem;">{dialect}:</span>
-                            <span style="color: #515154; margin-left: 0.5rem;">{score:.1%} similarity</span>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    st.markdown("</div>", unsafe_allow_html=True)
-                    
-                    # Insights
-                    if top_score > 0.1:
-                        st.markdown(f"""
-                        <div style="background: linear-gradient(135deg, #667eea20, #764ba220); 
-                                   border-radius: 12px; padding: 1.5rem; margin: 2rem 0; 
-                                   border-left: 4px solid #667eea;">
-                            <h4 style="color: #667eea; margin-top: 0;">💡 What This Reveals</h4>
-                            <p>Your writing strongly echoes <strong>{top_dialect}</strong> communication patterns. 
-                            This suggests you've been influenced by content, communities, or thought leaders 
-                            who share this linguistic style.</p>
-                            <p><strong>Consider:</strong> What podcasts, books, or communities do you engage with? 
-                            How might this influence be shaping your perspective on the world?</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    else:
-                        st.markdown("""
-                        <div style="background: linear-gradient(135deg, #10b98120, #059fe220); 
-                                   border-radius: 12px; padding: 1.5rem; margin: 2rem 0; 
-                                   border-left: 4px solid #10b981;">
-                            <h4 style="color: #10b981; margin-top: 0;">🌟 Unique Voice Detected</h4>
-                            <p>Your writing doesn't strongly match any single pattern—this suggests you have 
-                            a distinctive voice that draws from diverse influences or represents an original 
-                            perspective.</p>
-                            <p><strong>This is rare and valuable.</strong> Your unique linguistic fingerprint 
-                            suggests independent thinking.</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    # Sample comparisons in expander
-                    with st.expander("🔍 See detailed pattern comparison", expanded=False):
-                        st.markdown(f"**Sample from {top_dialect} pattern:**")
-                        st.markdown(f'<div class="dialect-preview">{dialects[top_dialect][:200]}...</div>', 
-                                  unsafe_allow_html=True)
-                        
-                        st.markdown("**Detailed word analysis:**")
-                        if meaningful_words:
-                            st.markdown(f"Shared meaningful words: {', '.join(sorted(meaningful_words))}")
-                        else:
-                            st.markdown("Your text shows stylistic similarity without obvious shared vocabulary.")
-
-    # Footer
-    st.markdown("""
-    <div style="text-align: center; padding: 3rem 1rem; color: #666;">
-        <h3 style="color: #1d1d1f;">Ready to expand your perspective?</h3>
-        <p>Understanding your influences is the first step toward conscious growth.</p>
-        <p style="font-size: 0.9rem; margin-top: 2rem;">
-            EchoLens uses AI to reveal the invisible patterns in your language, 
-            helping you become more aware of how your worldview is shaped.
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    Only this small fragment reruns while the worker is busy. A fragment can't rerun its
+    parent fragment, so the finished result is picked up with one app rerun, which reads
+    everything from session state.
+    """
+    if job.done:
+        st.rerun()
+    st.caption(f"⏳ Refining with AI semantic analysis… {time.perf_counter() - job.started:.0f}s")
+
+
+def render_analysis_status(job):
+    """Status widget listing the analysis stages of a progressive job"""
+    if job.done and len(job.stages) == 1:
+        return None
+    refining = not job.done
+    label = "Refining with AI semantic analysis…" if refining else "Analysis complete"
+    status = st.status(label, state="running" if refining else "complete", expanded=False)
+    with status:
+        for stage in job.stages:
+            method = stage['method'] or "embeddings"
+            if stage['status'] == 'running':
+                st.markdown(f"⏳ **{method}** running in the background")
+            elif stage['status'] == 'failed':
+                st.markdown(f"⚠️ **{method}** unavailable, showing the quick result")
+            else:
+                st.markdown(f"✅ **{method}** finished in {stage['ms']:.0f} ms")
+    return status
+
+
+@st.fragment
+def bulk_analysis_section(analyzer: PatternAnalyzer):
+    """Multi-document upload with batched parallel analysis and downloadable results"""
+    with st.expander("📂 Analyze multiple documents", expanded=False):
+        uploaded_files = st.file_uploader(
+            "Upload .txt, .md or .csv files", type=["txt", "md", "csv"], accept_multiple_files=True
+        )
+        csv_column = st.text_input("CSV column containing the text", value="text")
+        if st.button("📊 Analyze documents", disabled=not uploaded_files):
+            run_bulk_analysis(analyzer, uploaded_files, csv_column)
+        render_bulk_downloads()
+
+
+def run_bulk_analysis(analyzer: PatternAnalyzer, uploaded_files, csv_column: str):
+    """
+    Analyze every uploaded document, streaming result rows to a table on disk
+
+    Only the current batch of texts and a preview of recent rows are kept in memory
+    while analyzing. The table is written to a temporary directory that is removed
+    once the finished exports have been read into session state for download.
+    """
+    st.session_state.pop('bulk_results', None)
+    
+    dialect_names = list(analyzer.load_dialect_samples().keys())
+    total_bytes = sum(uploaded.size for uploaded in uploaded_files) or 1
+    done_bytes = 0
+    progress = st.progress(0.0, text="Starting analysis…")
+    preview = st.empty()
+    recent_rows = deque(maxlen=BULK_PREVIEW_ROWS)
+    
+    with tempfile.TemporaryDirectory(prefix="echolens_results_") as tmp_dir:
+        csv_path = os.path.join(tmp_dir, "results.csv")
+        with ResultTableWriter(csv_path, RESULT_COLUMNS + dialect_names) as writer:
+            for uploaded in uploaded_files:
+                uploaded.seek(0)
+                documents = iter_documents(uploaded.name, uploaded, csv_column=csv_column)
+                try:
+                    for rows in analyze_documents(analyzer, documents, batch_size=BULK_BATCH_SIZE,
+                                                  max_workers=BULK_WORKERS):
+                        writer.write(rows)
+                        recent_rows.extend(rows)
+                        fraction = min((done_bytes + uploaded.tell()) / total_bytes, 1.0)
+                        progress.progress(fraction, text=f"Analyzed {writer.rows_written} documents…")
+                        preview.dataframe(pd.DataFrame(list(recent_rows)), hide_index=True)
+                except ValueError as e:
+                    st.warning(f"⚠️ Skipped {uploaded.name}: {e}")
+                done_bytes += uploaded.size
+            
+            progress.progress(1.0, text=f"Analyzed {writer.rows_written} documents")
+            parquet_path = None
+            try:
+                parquet_path = writer.to_parquet(os.path.join(tmp_dir, "results.parquet"))
+            except Exception as e:
+                st.info(f"Parquet export unavailable: {e}")
+        
+        bulk = {'csv': None, 'parquet': None}
+        for fmt, path in (('csv', csv_path), ('parquet', parquet_path)):
+            if path:
+                with open(path, 'rb') as f:
+                    bulk[fmt] = f.read()
+    
+    st.session_state.bulk_results = bulk
+
+
+def render_bulk_downloads():
+    """Download buttons for the latest bulk analysis of this session"""
+    bulk = st.session_state.get('bulk_results')
+    if not bulk or not bulk.get('csv'):
+        return
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("⬇️ Download CSV", bulk['csv'], file_name="echolens_results.csv", mime="text/csv")
+    if bulk.get('parquet'):
+        with col2:
+            st.download_button("⬇️ Download Parquet", bulk['parquet'], file_name="echolens_results.parquet",
+                               mime="application/vnd.apache.parquet")
+
+
+def analysis_key(user_text: str) -> str:
+    """Session result key: text hash plus the dialect corpus version it was analyzed against"""
+    text_hash = hashlib.sha256(user_text.encode('utf-8')).hexdigest()
+    return f"{text_hash}:{dialect_corpus_version()}"
+
+
+def tfidf_explanation(result: Dict, dialects: Dict[str, str]):
+    """
+    TF-IDF influence scores and top terms of a session result
+
+    Computed on first view and stored with the result, whose key already pins
+    the text and dialect corpus version, so fragment reruns and refine polls reuse it.
+    """
+    if 'tfidf' not in result:
+        result['tfidf'] = get_shared_analyzer(dialects, mode=TFIDF_MODE).analyze(result['text'], top_n_terms=10)
+    return result['tfidf']
+
+
+def method_badge(method: str) -> Tuple[str, str]:
+    """Display label and colour for an analysis method (a registered scorer name or "cascade")"""
+    if method == "cascade":
+        label = CASCADE_LABEL
+    elif method in SCORER_REGISTRY:
+        label = SCORER_REGISTRY[method].label
+    else:
+        label = SCORER_REGISTRY["word_similarity"].label
+    return label, METHOD_COLORS.get(method, DEFAULT_METHOD_COLOR)
+
+
+def render_analysis_results(scores: Dict[str, float], method_used: str, detailed_analysis: Dict,
+                            dialects: Dict[str, str], result: Dict):
+    """Render one analysis; called on every rerun from the results kept in session state"""
+    # Now use detailed_analysis['sorted_scores'], detailed_analysis['top_dialect'], etc.
+    if scores:
+        # Pull out what you need
+        sorted_scores = detailed_analysis['sorted_scores']
+        top_dialect   = detailed_analysis['top_dialect']
+        top_score     = detailed_analysis['top_score']
+        avg_score     = detailed_analysis['avg_score']
+        uniqueness    = detailed_analysis['uniqueness']
+
+        st.markdown("""
+        <div class="results-section fade-in">
+            <div class="section-title">Your Linguistic Reflection</div>
+         </div>
+        """, unsafe_allow_html=True)
+        
+        # Analysis method indicator, labelled from the scorer registry
+        method_display, method_color = method_badge(detailed_analysis.get('analysis_method', method_used))
+        
+        st.markdown(f"""
+        <div style="text-align: center; margin-bottom: 2rem;">
+            <span style="color: {method_color}; font-weight: 600; font-size: 0.9rem;">
+                {method_display}
+            </span>
+        </div>
+        """, unsafe_allow_html=True)
+
+        reuse = detailed_analysis.get('embedding_reuse')
+        if reuse:
+            reused = (f"embeddings of {reuse['segments']} near-identical passages" if reuse.get('segments')
+                      else "the embedding of a near-identical text")
+            st.markdown(f"""
+            <div style="text-align: center; margin: -1.5rem 0 2rem; color: #6b7280; font-size: 0.8rem;">
+                ♻️ Reused {reused} analyzed earlier
+                (SimHash distance {reuse.get('hamming_distance', 0)})
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Use existing metrics and analysis display code but replace:
+        # detailed_analysis.get('avg_score', 0) instead of sum(scores.values()) / len(scores)
+        # detailed_analysis.get('uniqueness', 0) instead of 100 - (top_score * 100)
+        
+        # Detailed Analysis
+        st.markdown('<h4 style="color: #1d1d1f; font-weight: 600; margin: 2rem 0 1rem 0;">Your Influence Breakdown</h4>', unsafe_allow_html=True)
+        
+        explanations = detailed_analysis.get('explanations', {})
+        for dialect, score in sorted_scores:
+            percentage = score * 100
+            top_terms = [term for term, _ in explanations.get(dialect, {}).get('term_weights', [])[:5]]
+            shared_terms_html = (
+                f'<div style="color: #515154; font-size: 0.9rem; margin-top: 0.75rem;">Shared terms: {", ".join(top_terms)}</div>'
+                if top_terms else ""
+            )
+            st.markdown(f"""
+            <div style="background: rgba(255, 255, 255, 0.8); backdrop-filter: blur(20px); border-radius: 12px; padding: 1.5rem; margin: 1rem 0; box-shadow: 0 4px 15px rgba(0,0,0,0.08);">
+                <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 1rem;">
+                    <span style="font-weight: 600; color: #1d1d1f; font-size: 1.1rem;">{dialect}</span>
+                    <span style="color: #667eea; font-weight: bold; font-size: 1.1rem;">{percentage:.1f}%</span>
+                </div>
+                <div class="progress-container" style="height: 12px; background: #e8e8e8; border-radius: 6px; overflow: hidden;">
+                    <div class="progress-bar" style="width: {percentage}%; height: 100%; background: linear-gradient(90deg, #667eea, #764ba2); border-radius: 6px; transition: width 1.5s ease;"></div>
+                </div>{shared_terms_html}
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Pattern Analysis
+        st.markdown('<h4 style="color: #1d1d1f; font-weight: 600; margin: 2rem 0 1rem 0;">🎯 Pattern Analysis</h4>', unsafe_allow_html=True)
+        
+        # Meaningful words shared with the top dialect (computed once in get_detailed_analysis)
+        meaningful_words = detailed_analysis.get('meaningful_words', [])
+        
+        if meaningful_words:
+            pattern_text = f"**Key phrases echoing {top_dialect} patterns:** {', '.join(meaningful_words)}"
+        else:
+            pattern_text = f"**Analysis:** Your text shows subtle patterns similar to {top_dialect} communication style."
+        
+        # Custom styled info box
+        st.markdown(f"""
+        <div style="background: rgba(102, 126, 234, 0.1); border-left: 4px solid #667eea; border-radius: 8px; padding: 1.5rem; margin: 1rem 0; font-size: 1.1rem; color: #1d1d1f;">
+            {pattern_text}
+        </div>
+        """, unsafe_allow_html=True)
+        
+        
+        # TF-IDF view: the fitted state is shared process-wide and the explanation is kept with the result
+        with st.expander("🔍 TF-IDF influence scores", expanded=False):
+            influence_scores, top_terms = tfidf_explanation(result, dialects)
+            st.bar_chart(influence_scores)
+            if top_terms:
+                st.markdown("**Top terms by TF-IDF weight:** " + ", ".join(term.term for term in top_terms))
+        
+        # Show top 3 matches with better styling
+        st.markdown("""
+        <div style="background: rgba(255, 255, 255, 0.8); backdrop-filter: blur(20px); border-radius: 12px; padding: 1.5rem; margin: 1.5rem 0; box-shadow: 0 4px 15px rgba(0,0,0,0.08);">
+            <h5 style="color: #1d1d1f; font-weight: 600; margin: 0 0 1rem 0;">Top 3 Dialect Matches:</h5>
+        """, unsafe_allow_html=True)
+        
+        for i, (dialect, score) in enumerate(sorted_scores[:3]):
+            st.markdown(f"""
+            <div style="margin: 0.75rem 0; padding: 0.5rem 0;">
+                <span style="color: #667eea; font-weight: bold; font-size: 1.1rem;">{i+1}.</span>
+                <span style="font-weight: 600; color: #1d1d1f; margin-left: 0.5rem;">{dialect}:</span>
+                <span style="color: #515154; margin-left: 0.5rem;">{score:.1%} similarity</span>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        st.markdown("</div>", unsafe_allow_html=True)
+        
+        # Insights
+        if top_score > 0.1:
+            st.markdown(f"""
+            <div style="background: linear-gradient(135deg, #667eea20, #764ba220); 
+                       border-radius: 12px; padding: 1.5rem; margin: 2rem 0; 
+                       border-left: 4px solid #667eea;">
+                <h4 style="color: #667eea; margin-top: 0;">💡 What This Reveals</h4>
+                <p>Your writing strongly echoes <strong>{top_dialect}</strong> communication patterns. 
+                This suggests you've been influenced by content, communities, or thought leaders 
+                who share this linguistic style.</p>
+                <p><strong>Consider:</strong> What podcasts, books, or communities do you engage with? 
+                How might this influence be shaping your perspective on the world?</p>
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.markdown("""
+            <div style="background: linear-gradient(135deg, #10b98120, #059fe220); 
+                       border-radius: 12px; padding: 1.5rem; margin: 2rem 0; 
+                       border-left: 4px solid #10b981;">
+                <h4 style="color: #10b981; margin-top: 0;">🌟 Unique Voice Detected</h4>
+                <p>Your writing doesn't strongly match any single pattern—this suggests you have 
+                a distinctive voice that draws from diverse influences or represents an original 
+                perspective.</p>
+                <p><strong>This is rare and valuable.</strong> Your unique linguistic fingerprint 
+                suggests independent thinking.</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Sample comparisons in expander
+        with st.expander("🔍 See detailed pattern comparison", expanded=False):
+            st.markdown(f"**Sample from {top_dialect} pattern:**")
+            st.markdown(f'<div class="dialect-preview">{dialects[top_dialect][:200]}...</div>', 
+                      unsafe_allow_html=True)
+            
+            st.markdown("**Detailed word analysis:**")
+            if meaningful_words:
+                st.markdown(f"Shared meaningful words: {', '.join(meaningful_words)}")
+            else:
+                st.markdown("Your text shows stylistic similarity without obvious shared vocabulary.")
+
 
 if __name__ == "__main__":
     run_app()
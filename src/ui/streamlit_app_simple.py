@@ -13,6 +13,8 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+from src.analyzer.tokenizer import BASIC_STOP_WORDS, token_set
+
 def load_dialect_samples() -> Dict[str, str]:
     """Load all dialect samples from the data directory"""
     samples = {}
@@ -32,11 +34,11 @@ def load_dialect_samples() -> Dict[str, str]:
 
 def simple_similarity_score(text1: str, text2: str) -> float:
     """Simple similarity calculation using word overlap"""
-    words1 = set(text1.lower().split())
-    words2 = set(text2.lower().split())
+    words1 = token_set(text1)
+    words2 = token_set(text2)
     
-    intersection = len(words1.intersection(words2))
-    union = len(words1.union(words2))
+    intersection = len(words1 & words2)
+    union = len(words1) + len(words2) - intersection
     
     if union == 0:
         return 0.0
@@ -147,13 +149,10 @@ def run_app():
                     st.markdown("### 🎯 Pattern Analysis")
                     
                     if top_score > 0.05:
-                        user_words = set(user_text.lower().split())
-                        dialect_words = set(dialects[top_dialect].lower().split())
-                        common_words = user_words.intersection(dialect_words)
+                        common_words = token_set(user_text) & token_set(dialects[top_dialect])
                         
                         # Filter out common stop words
-                        stop_words = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had'}
-                        meaningful_words = common_words - stop_words
+                        meaningful_words = common_words - BASIC_STOP_WORDS
                         
                         if meaningful_words:
                             st.info(f"**Key phrases echoing {top_dialect} patterns:** {', '.join(sorted(meaningful_words))}")
@@ -0,0 +1,10 @@
+"""
+EchoLens benchmark suite
+
+Times the analysis hot paths over user texts of 50 to 10k characters and
+5 to 10k synthetic dialects, with a deterministic fake embedding provider.
+Results are written as JSON so runs can be compared between commits.
+
+    python -m pytest tests/benchmarks --bench-json bench_results.json [--bench-full]
+    python -m tests.benchmarks [--full] [--output PATH] [--compare BASELINE.json]
+"""
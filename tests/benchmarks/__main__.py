@@ -0,0 +1,57 @@
+"""
+Standalone benchmark runner (no pytest needed)
+
+    python -m tests.benchmarks [--full] [--filter NAME] [--output PATH] [--compare BASELINE.json]
+"""
+
+import sys
+import logging
+import argparse
+import tempfile
+from .cases import BenchmarkContext, case_params, run_case, verify_case
+from .harness import FULL_GRID, QUICK_GRID, BenchmarkRecorder, isolated_workdir, print_comparison, result_key
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EchoLens hot-path benchmarks")
+    parser.add_argument('--full', action='store_true', help="full grid (up to 10k dialects)")
+    parser.add_argument('--filter', default=None, help="only run benchmarks whose name contains this")
+    parser.add_argument('--output', default='bench_results.json', help="JSON results file")
+    parser.add_argument('--compare', default=None, help="baseline JSON results to compare medians against")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="slowdown ratio reported as a regression (default 1.25)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING) # Per-call INFO logs would drown the results
+
+    grid = FULL_GRID if args.full else QUICK_GRID
+    cases = [(name, params) for name, params in case_params(grid) if not args.filter or args.filter in name]
+    recorder = BenchmarkRecorder('full' if args.full else 'quick')
+
+    print(f"⏱️  Running {len(cases)} benchmarks ({recorder.grid_name} grid)...")
+    with tempfile.TemporaryDirectory(prefix='echolens-bench-') as workdir, isolated_workdir(workdir):
+        context = BenchmarkContext()
+        mismatches = 0
+        for name, params in cases:
+            stats = run_case(context, recorder, name, params)
+            print(f"  {result_key(name, params)}: median {stats['median_ms']:.3f} ms "
+                  f"(min {stats['min_ms']:.3f}, {stats['rounds']} rounds)")
+            try:
+                verify_case(context, name, params)
+            except AssertionError as e:
+                mismatches += 1
+                print(f"  ❌ results differ from the reference: {e}")
+
+    print(f"💾 Results written to {recorder.write(args.output)}")
+    if mismatches:
+        print(f"❌ {mismatches} benchmarks computed different results than their reference")
+        return 1
+    if args.compare:
+        regressions = print_comparison(args.compare, recorder.to_dict(), args.threshold)
+        if regressions:
+            print(f"❌ {regressions} benchmarks slowed down by more than {args.threshold:.2f}x")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,326 @@
+"""
+EchoLens Benchmark Cases
+The analysis hot paths, each timed over the text-size / dialect-count grid
+"""
+
+import zlib
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+import numpy as np
+from .harness import (
+    DIALECT_CHARS, MAX_ROUNDS, BenchmarkRecorder, FakeEmbeddingsClient, assert_matches_reference, grid_cases,
+    make_dialects, make_embeddings_manager, make_pattern_analyzer, make_text, make_user_texts, measure, result_key
+)
+
+CaseFn = Callable[["BenchmarkContext", Dict[str, int]], Dict[str, Any]]
+VerifyFn = Callable[["BenchmarkContext", Dict[str, int]], None]
+
+DEFAULT_DIALECTS = 5 # For cases whose cost doesn't depend on the dialect count
+REFERENCE_TEXTS = 3 # Benchmark texts per case checked against a reference implementation
+EMBEDDING_TOLERANCE = 1e-4 # Index and exemplar scoring run in float32
+
+
+class BenchmarkContext:
+    """
+    Corpora and warmed analyzers shared by the cases of one run
+
+    Expensive setup (fitting, embedding thousands of synthetic dialects) is
+    done once per dialect count and is not part of any timing.
+    """
+
+    def __init__(self):
+        self.client = FakeEmbeddingsClient()
+        self._dialects: Dict[int, Dict[str, str]] = {}
+        self._analyzers: Dict[Tuple[str, int], Any] = {}
+        self._user_texts: Dict[Tuple[int, str], List[str]] = {}
+
+    def dialects(self, count: int) -> Dict[str, str]:
+        if count not in self._dialects:
+            self._dialects[count] = make_dialects(count)
+        return self._dialects[count]
+
+    def user_texts(self, name: str, params: Dict[str, int]) -> List[str]:
+        """
+        User texts for one benchmark, distinct from every other benchmark's
+
+        Texts are never shared between grid points, so a benchmark doesn't
+        find them already tokenized or embedded by an earlier one.
+        """
+        key = (params['text_chars'], result_key(name, params))
+        if key not in self._user_texts:
+            seed = zlib.crc32(key[1].encode())
+            self._user_texts[key] = make_user_texts(params['text_chars'], MAX_ROUNDS, seed=seed)
+        return self._user_texts[key]
+
+    def _cached(self, kind: str, count: int, build: Callable[[], Any]) -> Any:
+        if (kind, count) not in self._analyzers:
+            self._analyzers[(kind, count)] = build()
+        return self._analyzers[(kind, count)]
+
+    def word_analyzer(self, count: int):
+        return self._cached('word', count, lambda: make_pattern_analyzer(self.dialects(count)))
+
+    def similarity_analyzer(self, count: int):
+        from src.analyzer.similarity_analyzer import SimilarityAnalyzer
+        return self._cached('tfidf', count, lambda: SimilarityAnalyzer(self.dialects(count)))
+
+    def embedding_analyzer(self, count: int):
+        def build():
+            analyzer = make_pattern_analyzer(self.dialects(count), make_embeddings_manager(self.client))
+            # Embed the dialects and build their index up front
+            analyzer.analyze_with_embeddings(make_text(200, seed=1), self.dialects(count))
+            return analyzer
+        return self._cached('embeddings', count, build)
+
+    def cached_analyzer(self, count: int):
+        from src.analyzer.result_cache import ResultCache
+        return self._cached('result_cache', count,
+                            lambda: make_pattern_analyzer(self.dialects(count), result_cache=ResultCache()))
+
+
+def bench_simple_word_similarity(ctx: BenchmarkContext, params: Dict[str, int]) -> Dict[str, Any]:
+    from src.analyzer.embeddings import simple_word_similarity
+    from src.analyzer.tokenizer import clear_token_cache
+    texts = ctx.user_texts('simple_word_similarity', params)
+    other = make_text(DIALECT_CHARS, seed=2)
+    # Token caches cleared each round: measures tokenizing both texts plus the set overlap
+    return measure(lambda i: simple_word_similarity(texts[i], other), setup=lambda i: clear_token_cache())
+
+
+def bench_analyze_with_word_similarity(ctx: BenchmarkContext, params: Dict[str, int]) -> Dict[str, Any]:
+    analyzer = ctx.word_analyzer(params['dialects'])
+    dialects = ctx.dialects(params['dialects'])
+    texts = ctx.user_texts('analyze_with_word_similarity', params)
+    analyzer.analyze_with_word_similarity(make_text(100, seed=3), dialects) # Warm the dialects' token cache
+    return measure(lambda i: analyzer.analyze_with_word_similarity(texts[i], dialects))
+
+
+def bench_similarity_analyzer_fit(ctx: BenchmarkContext, params: Dict[str, int]) -> Dict[str, Any]:
+    from src.analyzer.similarity_analyzer import SimilarityAnalyzer
+    dialects = ctx.dialects(params['dialects'])
+    return measure(lambda i: SimilarityAnalyzer(dialects), min_rounds=1, max_rounds=5)
+
+
+def bench_similarity_analyzer_analyze(ctx: BenchmarkContext, params: Dict[str, int]) -> Dict[str, Any]:
+    analyzer = ctx.similarity_analyzer(params['dialects'])
+    texts = ctx.user_texts('similarity_analyzer.analyze', params)
+    return measure(lambda i: analyzer.analyze(texts[i]))
+
+
+def bench_analyze_with_embeddings_miss(ctx: BenchmarkContext, params: Dict[str, int]) -> Dict[str, Any]:
+    analyzer = ctx.embedding_analyzer(params['dialects'])
+    dialects = ctx.dialects(params['dialects'])
+    texts = ctx.user_texts('analyze_with_embeddings.cache_miss', params) # Unseen texts: every round misses
+    return measure(lambda i: analyzer.analyze_with_embeddings(texts[i], dialects))
+
+
+def bench_analyze_with_embeddings_hit(ctx: BenchmarkContext, params: Dict[str, int]) -> Dict[str, Any]:
+    analyzer = ctx.embedding_analyzer(params['dialects'])
+    dialects = ctx.dialects(params['dialects'])
+    texts = ctx.user_texts('analyze_with_embeddings.cache_hit', params)
+    analyzer.embeddings_manager.get_embeddings_batch(texts)
+    return measure(lambda i: analyzer.analyze_with_embeddings(texts[i], dialects))
+
+
+def bench_embedding_cache(ctx: BenchmarkContext, params: Dict[str, int], hit: bool) -> Dict[str, Any]:
+    manager = ctx.embedding_analyzer(DEFAULT_DIALECTS).embeddings_manager
+    texts = ctx.user_texts('embedding_cache.hit' if hit else 'embedding_cache.miss', params)
+    if hit:
+        manager.get_embeddings_batch(texts)
+    return measure(lambda i: manager.load_cached_embedding(texts[i]))
+
+
+def bench_result_cache(ctx: BenchmarkContext, params: Dict[str, int], hit: bool) -> Dict[str, Any]:
+    """analyze_with_details through the result cache: a hit returns the memoized analysis"""
+    analyzer = ctx.cached_analyzer(params['dialects'])
+    texts = ctx.user_texts('result_cache.hit' if hit else 'result_cache.miss', params)
+    if hit:
+        for text in texts:
+            analyzer.analyze_with_details(text, method="word_similarity")
+    return measure(lambda i: analyzer.analyze_with_details(texts[i], method="word_similarity"))
+
+
+def bench_get_detailed_analysis(ctx: BenchmarkContext, params: Dict[str, int]) -> Dict[str, Any]:
+    analyzer = ctx.word_analyzer(params['dialects'])
+    dialects = ctx.dialects(params['dialects'])
+    texts = ctx.user_texts('get_detailed_analysis', params)
+    analyzer.get_term_matrix(dialects) # Built once per corpus; not part of the per-request cost
+    scores = [None] * len(texts)
+
+    def setup(i: int):
+        if scores[i] is None:
+            scores[i] = analyzer.analyze_with_word_similarity(texts[i], dialects)
+    return measure(lambda i: analyzer.get_detailed_analysis(texts[i], *scores[i]), setup=setup)
+
+
+# Reference implementations: plain recomputations, without the caches, sparse products
+# and indexes of the benchmarked paths, that those paths must agree with
+
+def reference_word_similarity(text: str, dialects: Dict[str, str]) -> Dict[str, float]:
+    """Jaccard overlap of token sets"""
+    from src.analyzer.tokenizer import tokenize
+    words = set(tokenize(text))
+    scores = {}
+    for name, dialect_text in dialects.items():
+        other = set(tokenize(dialect_text))
+        union = words | other
+        scores[name] = len(words & other) / len(union) if union else 0.0
+    return scores
+
+
+def reference_tfidf(texts: List[str], dialects: Dict[str, str]) -> List[Dict[str, float]]:
+    """Dense cosine similarity of a freshly fitted TF-IDF model"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    vectorizer = TfidfVectorizer(ngram_range=(1, 2), stop_words='english', max_features=5000)
+    dialect_matrix = vectorizer.fit_transform(list(dialects.values())).toarray()
+    user_matrix = vectorizer.transform(texts).toarray()
+    norms = np.linalg.norm(user_matrix, axis=1, keepdims=True) * np.linalg.norm(dialect_matrix, axis=1)
+    similarities = np.divide(user_matrix @ dialect_matrix.T, norms, out=np.zeros_like(norms), where=norms > 0)
+    return [dict(zip(dialects, map(float, row))) for row in similarities]
+
+
+def reference_embedding_scores(client: FakeEmbeddingsClient, manager, text: str,
+                               dialects: Dict[str, str]) -> Dict[str, float]:
+    """
+    Exact cosine similarity to every dialect, mapped to [0, 1] like the exemplar scorer
+    (each dialect is one passage, so it is its own centroid and nearest exemplar)
+    """
+    user = np.asarray(client.embed(manager.canonical_text(text)), dtype=np.float64)
+    scores = {}
+    for name, dialect_text in dialects.items():
+        dialect = np.asarray(client.embed(manager.canonical_text(dialect_text)), dtype=np.float64)
+        cosine = user @ dialect / (np.linalg.norm(user) * np.linalg.norm(dialect))
+        scores[name] = float((cosine + 1) / 2)
+    return scores
+
+
+def _checked_texts(ctx: BenchmarkContext, name: str, params: Dict[str, int]) -> List[str]:
+    return ctx.user_texts(name, params)[:REFERENCE_TEXTS]
+
+
+def verify_simple_word_similarity(ctx: BenchmarkContext, params: Dict[str, int]):
+    from src.analyzer.embeddings import simple_word_similarity
+    other = make_text(DIALECT_CHARS, seed=2)
+    for text in _checked_texts(ctx, 'simple_word_similarity', params):
+        assert_matches_reference({'other': simple_word_similarity(text, other)},
+                                 reference_word_similarity(text, {'other': other}))
+
+
+def verify_word_scores(ctx: BenchmarkContext, params: Dict[str, int], name: str):
+    analyzer = ctx.word_analyzer(params['dialects'])
+    dialects = ctx.dialects(params['dialects'])
+    for text in _checked_texts(ctx, name, params):
+        assert_matches_reference(analyzer.analyze_with_word_similarity(text, dialects)[0],
+                                 reference_word_similarity(text, dialects), label=name)
+
+
+def verify_tfidf(ctx: BenchmarkContext, params: Dict[str, int], name: str):
+    from src.analyzer.similarity_analyzer import SimilarityAnalyzer
+    dialects = ctx.dialects(params['dialects'])
+    texts = (ctx.user_texts(name, params) if 'text_chars' in params
+             else make_user_texts(DIALECT_CHARS, MAX_ROUNDS))[:REFERENCE_TEXTS]
+    analyzer = ctx.similarity_analyzer(params['dialects']) if name.endswith('analyze') else SimilarityAnalyzer(dialects)
+    for (scores, _), expected in zip(analyzer.analyze_batch(texts), reference_tfidf(texts, dialects)):
+        assert_matches_reference(scores, expected, label=name)
+
+
+def verify_embeddings(ctx: BenchmarkContext, params: Dict[str, int], name: str):
+    analyzer = ctx.embedding_analyzer(params['dialects'])
+    dialects = ctx.dialects(params['dialects'])
+    for text in _checked_texts(ctx, name, params):
+        scores, method = analyzer.analyze_with_embeddings(text, dialects)
+        assert method == "embeddings", f"{name}: fell back to {method}"
+        expected = reference_embedding_scores(ctx.client, analyzer.embeddings_manager, text, dialects)
+        assert_matches_reference(scores, expected, tolerance=EMBEDDING_TOLERANCE, label=name)
+
+
+def verify_embedding_cache(ctx: BenchmarkContext, params: Dict[str, int], hit: bool):
+    manager = ctx.embedding_analyzer(DEFAULT_DIALECTS).embeddings_manager
+    for text in _checked_texts(ctx, 'embedding_cache.hit' if hit else 'embedding_cache.miss', params):
+        cached = manager.load_cached_embedding(text)
+        if not hit:
+            assert cached is None, "embedding_cache.miss: a never-embedded text was found in the cache"
+            continue
+        np.testing.assert_allclose(cached, ctx.client.embed(manager.canonical_text(text)), atol=1e-6)
+
+
+def verify_result_cache(ctx: BenchmarkContext, params: Dict[str, int], hit: bool):
+    name = 'result_cache.hit' if hit else 'result_cache.miss'
+    analyzer = ctx.cached_analyzer(params['dialects'])
+    dialects = ctx.dialects(params['dialects'])
+    for text in _checked_texts(ctx, name, params):
+        scores, _, _ = analyzer.analyze_with_details(text, method="word_similarity")
+        assert_matches_reference(scores, reference_word_similarity(text, dialects), label=name)
+
+
+def verify_detailed_analysis(ctx: BenchmarkContext, params: Dict[str, int]):
+    analyzer = ctx.word_analyzer(params['dialects'])
+    dialects = ctx.dialects(params['dialects'])
+    for text in _checked_texts(ctx, 'get_detailed_analysis', params):
+        expected = reference_word_similarity(text, dialects)
+        detailed = analyzer.get_detailed_analysis(text, expected, "word_similarity")
+        assert_matches_reference({detailed['top_dialect']: detailed['top_score']},
+                                 {detailed['top_dialect']: max(expected.values())},
+                                 label='get_detailed_analysis')
+        assert expected[detailed['top_dialect']] == max(expected.values())
+
+
+# name -> (function, grid axes it varies over)
+CASES: Dict[str, Tuple[CaseFn, Tuple[str, ...]]] = {
+    'simple_word_similarity': (bench_simple_word_similarity, ('text_chars',)),
+    'analyze_with_word_similarity': (bench_analyze_with_word_similarity, ('text_chars', 'dialects')),
+    'similarity_analyzer.fit': (bench_similarity_analyzer_fit, ('dialects',)),
+    'similarity_analyzer.analyze': (bench_similarity_analyzer_analyze, ('text_chars', 'dialects')),
+    'analyze_with_embeddings.cache_miss': (bench_analyze_with_embeddings_miss, ('text_chars', 'dialects')),
+    'analyze_with_embeddings.cache_hit': (bench_analyze_with_embeddings_hit, ('text_chars', 'dialects')),
+    'embedding_cache.hit': (lambda ctx, params: bench_embedding_cache(ctx, params, hit=True), ('text_chars',)),
+    'embedding_cache.miss': (lambda ctx, params: bench_embedding_cache(ctx, params, hit=False), ('text_chars',)),
+    'result_cache.hit': (lambda ctx, params: bench_result_cache(ctx, params, hit=True), ('text_chars', 'dialects')),
+    'result_cache.miss': (lambda ctx, params: bench_result_cache(ctx, params, hit=False), ('text_chars', 'dialects')),
+    'get_detailed_analysis': (bench_get_detailed_analysis, ('text_chars', 'dialects')),
+}
+
+
+# name -> check of the benchmarked path's results against its reference
+VERIFIERS: Dict[str, VerifyFn] = {
+    'simple_word_similarity': verify_simple_word_similarity,
+    'analyze_with_word_similarity': lambda ctx, params: verify_word_scores(ctx, params, 'analyze_with_word_similarity'),
+    'similarity_analyzer.fit': lambda ctx, params: verify_tfidf(ctx, params, 'similarity_analyzer.fit'),
+    'similarity_analyzer.analyze': lambda ctx, params: verify_tfidf(ctx, params, 'similarity_analyzer.analyze'),
+    'analyze_with_embeddings.cache_miss':
+        lambda ctx, params: verify_embeddings(ctx, params, 'analyze_with_embeddings.cache_miss'),
+    'analyze_with_embeddings.cache_hit':
+        lambda ctx, params: verify_embeddings(ctx, params, 'analyze_with_embeddings.cache_hit'),
+    'embedding_cache.hit': lambda ctx, params: verify_embedding_cache(ctx, params, hit=True),
+    'embedding_cache.miss': lambda ctx, params: verify_embedding_cache(ctx, params, hit=False),
+    'result_cache.hit': lambda ctx, params: verify_result_cache(ctx, params, hit=True),
+    'result_cache.miss': lambda ctx, params: verify_result_cache(ctx, params, hit=False),
+    'get_detailed_analysis': verify_detailed_analysis,
+}
+
+
+def case_params(grid: Dict[str, Sequence[int]]) -> List[Tuple[str, Dict[str, int]]]:
+    """(case name, params) for every case over the grid axes it uses"""
+    selected = []
+    for name, (_, axes) in CASES.items():
+        seen = set()
+        for text_chars, dialects in grid_cases(grid):
+            params = {axis: value for axis, value in (('text_chars', text_chars), ('dialects', dialects))
+                      if axis in axes}
+            key = tuple(sorted(params.items()))
+            if key not in seen:
+                seen.add(key)
+                selected.append((name, params))
+    return selected
+
+
+def run_case(ctx: BenchmarkContext, recorder: BenchmarkRecorder, name: str, params: Dict[str, int]) -> Dict[str, Any]:
+    """Run one benchmark and record its statistics"""
+    fn, _ = CASES[name]
+    stats = fn(ctx, params)
+    recorder.record(name, params, stats)
+    return stats
+
+
+def verify_case(ctx: BenchmarkContext, name: str, params: Dict[str, int]):
+    """Raise AssertionError if the benchmarked path disagrees with its reference implementation"""
+    VERIFIERS[name](ctx, params)
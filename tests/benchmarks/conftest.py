@@ -0,0 +1,32 @@
+"""
+Pytest wiring for the benchmark suite: grid selection, shared context and JSON output
+(the --bench-* options are registered in tests/conftest.py)
+"""
+
+import pytest
+from .cases import BenchmarkContext, case_params
+from .harness import FULL_GRID, QUICK_GRID, BenchmarkRecorder, isolated_workdir, result_key
+
+def pytest_generate_tests(metafunc):
+    if 'bench_case' in metafunc.fixturenames:
+        grid = FULL_GRID if metafunc.config.getoption('--bench-full') else QUICK_GRID
+        cases = case_params(grid)
+        metafunc.parametrize('bench_case', cases, ids=[result_key(name, params) for name, params in cases])
+
+
+@pytest.fixture(scope='session')
+def bench_recorder(request):
+    recorder = BenchmarkRecorder('full' if request.config.getoption('--bench-full') else 'quick')
+    yield recorder
+    if recorder.results:
+        path = recorder.write(request.config.getoption('--bench-json'))
+        request.config.pluginmanager.get_plugin('terminalreporter').write_line(
+            f"benchmark results: {path} ({len(recorder.results)} benchmarks)"
+        )
+
+
+@pytest.fixture(scope='session')
+def bench_context(tmp_path_factory):
+    # Embedding caches, dialect indexes and the result cache are written under data/ relative to the cwd
+    with isolated_workdir(str(tmp_path_factory.mktemp('echolens-bench'))):
+        yield BenchmarkContext()
@@ -0,0 +1,252 @@
+"""
+EchoLens Benchmark Harness
+Synthetic corpora, a deterministic fake embedding provider, timing and JSON results
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import platform
+import statistics
+import subprocess
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.analyzer.fake_embeddings import FAKE_EMBEDDING_DIM, FakeEmbeddingsClient # Re-exported for the suite
+
+# Input grids: user text sizes (characters) x dialect counts
+QUICK_GRID = {'text_chars': (50, 1000, 10000), 'dialects': (5, 100, 1000)}
+FULL_GRID = {'text_chars': (50, 200, 1000, 5000, 10000), 'dialects': (5, 50, 500, 2000, 10000)}
+
+MIN_ROUNDS = 3
+MAX_ROUNDS = 50
+TIME_BUDGET_SECONDS = 0.3 # Per benchmark; rounds stop once it is spent (after MIN_ROUNDS)
+DIALECT_CHARS = 400
+
+
+# Synthetic data
+
+def _make_vocabulary(size: int = 6000, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    syllables = ["ka", "lo", "mi", "ne", "ta", "ri", "so", "vu", "pe", "zan", "dor", "qui", "bel", "tor", "ex"]
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(syllables) for _ in range(rng.randint(1, 4))))
+    return sorted(words)
+
+
+VOCABULARY = _make_vocabulary()
+COMMON_WORDS = ["the", "and", "to", "of", "we", "is", "this", "really", "just", "about", "our", "you"]
+
+
+def make_text(n_chars: int, seed: int = 0, topic: Optional[int] = None) -> str:
+    """
+    Deterministic pseudo-English text of about `n_chars` characters
+
+    Words follow a Zipf-like distribution over a fixed synthetic vocabulary;
+    with `topic`, half of them come from a topic-specific slice, so texts of
+    the same topic share vocabulary the way a dialect's passages do.
+    """
+    rng = random.Random(seed)
+    words: List[str] = []
+    length = 0
+    while length < n_chars:
+        roll = rng.random()
+        if roll < 0.25:
+            word = rng.choice(COMMON_WORDS)
+        elif topic is not None and roll < 0.65:
+            start = (topic * 37) % (len(VOCABULARY) - 60)
+            word = VOCABULARY[start + int(rng.paretovariate(1.2)) % 60]
+        else:
+            word = VOCABULARY[int(rng.paretovariate(0.8)) % len(VOCABULARY)]
+        if rng.random() < 0.08:
+            word += rng.choice([",", ".", "!", "?"])
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:n_chars].rstrip()
+
+
+def make_dialects(count: int, chars: int = DIALECT_CHARS, seed: int = 1000) -> Dict[str, str]:
+    """`count` synthetic dialects, each one passage on its own topic"""
+    return {f"Synthetic Dialect {i:05d}": make_text(chars, seed=seed + i, topic=i) for i in range(count)}
+
+
+def make_user_texts(n_chars: int, rounds: int, seed: int = 50000) -> List[str]:
+    """Distinct user texts, one per round, so per-text caches start cold"""
+    return [make_text(n_chars, seed=seed + i, topic=i % 7) for i in range(rounds)]
+
+
+# Fake embedding provider
+
+def make_embeddings_manager(client: Optional[FakeEmbeddingsClient] = None, **kwargs):
+    """EmbeddingsManager whose API calls go to a FakeEmbeddingsClient (cache under the working directory)"""
+    from src.analyzer.embeddings import EmbeddingsManager
+    manager = EmbeddingsManager(api_key="benchmark", **kwargs)
+    manager.client = SimpleNamespace(embeddings=client or FakeEmbeddingsClient())
+    return manager
+
+
+def make_pattern_analyzer(dialects: Dict[str, str], embeddings_manager=None, **kwargs):
+    """PatternAnalyzer scoring the given (synthetic) dialects instead of the sample files"""
+    from src.analyzer.pattern_analyzer import PatternAnalyzer
+
+    exemplars = {name: [text] for name, text in dialects.items()}
+
+    class SyntheticPatternAnalyzer(PatternAnalyzer):
+        def load_dialect_exemplars(self) -> Dict[str, List[str]]:
+            return exemplars
+
+    return SyntheticPatternAnalyzer(embeddings_manager, **kwargs)
+
+
+@contextmanager
+def isolated_workdir(path: str) -> Iterator[str]:
+    """Run with `path` as working directory, so caches and indexes the code writes under data/ land there"""
+    previous = os.getcwd()
+    os.makedirs(path, exist_ok=True)
+    os.chdir(path)
+    try:
+        yield path
+    finally:
+        os.chdir(previous)
+
+
+# Timing and results
+
+def measure(fn: Callable[[int], Any], setup: Optional[Callable[[int], Any]] = None,
+            min_rounds: int = MIN_ROUNDS, max_rounds: int = MAX_ROUNDS,
+            time_budget: float = TIME_BUDGET_SECONDS) -> Dict[str, Any]:
+    """
+    Time `fn(round)` repeatedly; `setup(round)`, if given, runs untimed before each round
+
+    Stops after max_rounds, or once time_budget seconds of measured time are spent
+    and at least min_rounds ran. Returns timing statistics in milliseconds.
+    """
+    samples: List[float] = []
+    spent = 0.0
+    for round_number in range(max_rounds):
+        if setup is not None:
+            setup(round_number)
+        start = time.perf_counter_ns()
+        fn(round_number)
+        elapsed = (time.perf_counter_ns() - start) / 1e6
+        samples.append(elapsed)
+        spent += elapsed / 1000
+        if round_number + 1 >= min_rounds and spent >= time_budget:
+            break
+    return {
+        'rounds': len(samples),
+        'min_ms': min(samples),
+        'median_ms': statistics.median(samples),
+        'mean_ms': statistics.fmean(samples),
+        'stdev_ms': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def result_key(name: str, params: Dict[str, Any]) -> str:
+    """Identifies one benchmark across runs, e.g. 'analyze_with_word_similarity[dialects=100,text_chars=50]'"""
+    return f"{name}[{','.join(f'{key}={params[key]}' for key in sorted(params))}]"
+
+
+class BenchmarkRecorder:
+    """Collects benchmark results and writes them as JSON"""
+
+    def __init__(self, grid_name: str = 'quick'):
+        self.grid_name = grid_name
+        self.results: List[Dict[str, Any]] = []
+
+    def record(self, name: str, params: Dict[str, Any], stats: Dict[str, Any]):
+        self.results.append({'name': name, 'key': result_key(name, params), 'params': params, **stats})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'meta': run_metadata(self.grid_name), 'results': self.results}
+
+    def write(self, path: str) -> str:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+
+def run_metadata(grid_name: str) -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'grid': grid_name,
+    }
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Tuple[str, float, float, float]]:
+    """
+    (key, baseline median ms, current median ms, ratio) for benchmarks present in both runs
+
+    Sorted with the largest slowdowns first.
+    """
+    before = {result['key']: result for result in baseline.get('results', [])}
+    rows = []
+    for result in current.get('results', []):
+        previous = before.get(result['key'])
+        if previous and previous['median_ms'] > 0:
+            rows.append((result['key'], previous['median_ms'], result['median_ms'],
+                         result['median_ms'] / previous['median_ms']))
+    return sorted(rows, key=lambda row: row[3], reverse=True)
+
+
+def print_comparison(baseline_path: str, current: Dict[str, Any], threshold: float = 1.25,
+                     noise_floor_ms: float = 0.05) -> int:
+    """
+    Print median changes against a baseline results file; returns the number of regressions
+
+    A regression is a slowdown by more than `threshold` that also adds at least
+    `noise_floor_ms`, so jitter on microsecond-scale benchmarks isn't flagged.
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\n📊 Compared with {baseline_path} (commit {baseline.get('meta', {}).get('git_commit')}):")
+    regressions = 0
+    for key, before, after, ratio in compare_results(baseline, current):
+        regressed = ratio > threshold and after - before >= noise_floor_ms
+        improved = ratio < 1 / threshold and before - after >= noise_floor_ms
+        regressions += regressed
+        flag = "❌" if regressed else ("✅" if improved else "  ")
+        print(f"  {flag} {key}: {before:.3f} ms -> {after:.3f} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def assert_matches_reference(actual: Dict[str, float], expected: Dict[str, float],
+                             tolerance: float = 1e-6, label: str = ""):
+    """
+    Fail unless `actual` scores the same dialects as `expected`, within `tolerance`,
+    with a top dialect that is also top in `expected` (ties may pick either)
+    """
+    prefix = f"{label}: " if label else ""
+    assert set(actual) == set(expected), f"{prefix}scored dialects differ from the reference"
+    if not expected:
+        return
+    top = max(actual, key=actual.get)
+    assert expected[top] >= max(expected.values()) - tolerance, (
+        f"{prefix}top dialect {top} differs from the reference's {max(expected, key=expected.get)}"
+    )
+    worst = max(expected, key=lambda name: abs(actual[name] - expected[name]))
+    assert abs(actual[worst] - expected[worst]) <= tolerance, (
+        f"{prefix}{worst} scored {actual[worst]:.6f}, reference {expected[worst]:.6f}"
+    )
+
+
+def grid_cases(grid: Dict[str, Sequence[int]]) -> List[Tuple[int, int]]:
+    """(text_chars, dialects) pairs of a grid"""
+    return [(text_chars, dialects) for dialects in grid['dialects'] for text_chars in grid['text_chars']]
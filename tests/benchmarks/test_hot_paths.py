@@ -0,0 +1,14 @@
+"""
+Benchmarks of the analysis hot paths (parametrized over the grid in conftest.py)
+"""
+
+from .cases import run_case, verify_case
+
+
+def test_hot_path(bench_case, bench_context, bench_recorder):
+    name, params = bench_case
+    stats = run_case(bench_context, bench_recorder, name, params)
+    assert stats['rounds'] >= 1
+    assert stats['median_ms'] >= 0
+    # A faster path only counts if it still computes the same scores
+    verify_case(bench_context, name, params)
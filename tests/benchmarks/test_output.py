@@ -0,0 +1,40 @@
+"""
+Tests for where the benchmark suite writes its results
+"""
+
+import os
+import sys
+import json
+import subprocess
+from .harness import PROJECT_ROOT
+
+CONFTEST = """
+from tests.conftest import pytest_addoption, pytest_configure
+from tests.benchmarks.conftest import bench_recorder
+"""
+
+TEST_MODULE = """
+import pytest
+from tests.benchmarks.harness import isolated_workdir
+
+@pytest.fixture(scope='session')
+def elsewhere(tmp_path_factory):
+    with isolated_workdir(str(tmp_path_factory.mktemp('elsewhere'))):
+        yield
+
+def test_record(bench_recorder, elsewhere):
+    bench_recorder.record('noop', {'n': 1}, {'median_ms': 1.0})
+"""
+
+
+def test_relative_bench_json_lands_under_the_invocation_dir(tmp_path):
+    (tmp_path / 'conftest.py').write_text(CONFTEST)
+    (tmp_path / 'test_record.py').write_text(TEST_MODULE)
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT)
+    result = subprocess.run([sys.executable, '-m', 'pytest', '-q', '-p', 'no:cacheprovider', 'test_record.py',
+                             '--bench-json', os.path.join('out', 'bench.json')],
+                            cwd=tmp_path, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
+
+    with open(tmp_path / 'out' / 'bench.json') as f:
+        assert [r['name'] for r in json.load(f)['results']] == ['noop']
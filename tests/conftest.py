@@ -0,0 +1,46 @@
+"""
+Shared pytest configuration for EchoLens
+"""
+
+import os
+import sys
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+BENCH_OUTPUT = 'bench_results.json'
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('echolens benchmarks')
+    group.addoption('--bench-full', action='store_true',
+                    help="run the full benchmark grid (up to 10k dialects) instead of the quick one")
+    group.addoption('--bench-json', default=BENCH_OUTPUT,
+                    help=f"where to write benchmark results (default: {BENCH_OUTPUT})")
+
+
+def pytest_configure(config):
+    # Benchmarks run in a temporary working directory, so resolve the output path before they chdir
+    config.option.bench_json = os.path.join(str(config.invocation_params.dir), config.option.bench_json)
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run the test in an empty working directory, so caches written under data/ stay isolated"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def fake_client():
+    from tests.benchmarks.harness import FakeEmbeddingsClient
+    return FakeEmbeddingsClient(dim=64)
+
+
+@pytest.fixture
+def embeddings_manager(workdir, fake_client):
+    """EmbeddingsManager backed by a deterministic in-process fake API"""
+    from tests.benchmarks.harness import make_embeddings_manager
+    return make_embeddings_manager(fake_client)
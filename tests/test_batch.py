@@ -0,0 +1,83 @@
+"""
+Tests for bulk document analysis and its CSV/Parquet export
+"""
+
+import io
+import csv
+import pytest
+from src.analyzer.batch import RESULT_COLUMNS, ResultTableWriter, analyze_documents, iter_documents
+from tests.benchmarks.harness import make_pattern_analyzer
+
+DIALECTS = {
+    'startup': "We move fast, ship the product and disrupt the market with scalable growth.",
+    'wellness': "Holding space for the universe, my vibration and my authentic self on this journey.",
+}
+
+
+def csv_upload(rows, header=('id', 'body')) -> io.BytesIO:
+    text = io.StringIO()
+    writer = csv.writer(text)
+    writer.writerow(header)
+    writer.writerows(rows)
+    return io.BytesIO(text.getvalue().encode('utf-8'))
+
+
+def test_csv_rows_are_documents_from_the_named_column():
+    stream = csv_upload([(1, "Ship it today"), (2, ""), (3, "Holding space, friends")])
+    documents = list(iter_documents('posts.csv', stream, csv_column='body'))
+
+    assert documents == [('posts.csv#1', "Ship it today"), ('posts.csv#2', ""), ('posts.csv#3', "Holding space, friends")]
+    assert not stream.closed # The caller's upload stays usable
+
+
+def test_text_files_are_one_document_each():
+    assert list(iter_documents('note.md', io.BytesIO("Ship it.\n".encode()))) == [('note.md', "Ship it.\n")]
+
+
+@pytest.mark.parametrize('name, column', [('posts.csv', 'text'), ('posts.json', 'body')])
+def test_missing_column_or_unsupported_file_is_rejected(name, column):
+    with pytest.raises(ValueError):
+        list(iter_documents(name, csv_upload([(1, "Ship it")]), csv_column=column))
+
+
+def test_analyzed_rows_stream_to_csv_with_a_column_per_dialect(workdir):
+    analyzer = make_pattern_analyzer(DIALECTS)
+    documents = iter_documents('posts.csv', csv_upload([(i, "We ship the product fast") for i in range(5)] + [(5, "")]),
+                               csv_column='body')
+    columns = RESULT_COLUMNS + list(DIALECTS)
+
+    with ResultTableWriter(str(workdir / 'out' / 'results.csv'), columns) as writer:
+        batches = list(analyze_documents(analyzer, documents, batch_size=2, max_workers=2, use_embeddings=False))
+        for rows in batches:
+            writer.write(rows)
+
+    assert [len(rows) for rows in batches] == [2, 2, 2]
+    assert writer.rows_written == 6
+    with open(workdir / 'out' / 'results.csv', newline='') as f:
+        reader = csv.DictReader(f)
+        written = list(reader)
+    assert reader.fieldnames == columns
+    assert [row['document'] for row in written] == [f"posts.csv#{i}" for i in range(1, 7)]
+    assert written[0]['top_dialect'] == 'startup'
+    # An empty row is reported, not dropped: no scores, so no top dialect
+    assert written[-1]['method'].startswith('not_analyzed') and written[-1]['top_dialect'] == ''
+
+
+def test_parquet_round_trip_keeps_columns_and_types(workdir):
+    pytest.importorskip('pyarrow')
+    import pandas as pd
+
+    columns = RESULT_COLUMNS + list(DIALECTS)
+    rows = [
+        {'document': 'a.txt', 'method': 'tfidf', 'top_dialect': 'startup', 'top_score': 0.5, 'startup': 0.5, 'wellness': 0.1},
+        {'document': 'b.txt', 'method': 'not_analyzed', 'top_dialect': None, 'top_score': None, 'startup': None, 'wellness': None},
+    ]
+    with ResultTableWriter(str(workdir / 'results.csv'), columns) as writer:
+        writer.write(rows)
+    path = writer.to_parquet(str(workdir / 'results.parquet'), chunksize=1)
+
+    table = pd.read_parquet(path)
+    assert list(table.columns) == columns
+    assert table['document'].tolist() == ['a.txt', 'b.txt']
+    assert table['startup'].iloc[0] == pytest.approx(0.5)
+    assert pd.isna(table['top_score'].iloc[1])
@@ -0,0 +1,99 @@
+"""
+Tests for the cost-aware scorer cascade
+"""
+
+import pytest
+from src.analyzer.cascade import CascadePlanner, top_gap, top_margin
+from src.analyzer.scorers import SCORER_REGISTRY, Scorer
+
+STAGES = ['t_cheap', 't_mid', 't_costly']
+
+
+@pytest.fixture
+def scorers(monkeypatch):
+    """Registers three fake scorers whose outputs a test sets; records which ones ran"""
+    outputs, calls = {}, []
+
+    def make(name):
+        def score(analyzer, user_text, dialects, exemplars):
+            calls.append(name)
+            return outputs.get(name)
+        return score
+
+    for cost, name in enumerate(STAGES, start=1):
+        monkeypatch.setitem(SCORER_REGISTRY, name, Scorer(name, cost, make(name)))
+    return outputs, calls
+
+
+def run(outputs, **kwargs):
+    return CascadePlanner(stages=STAGES, **kwargs).run(None, "text", {"A": "", "B": ""})
+
+
+def test_decisive_cheap_result_stops_early(scorers):
+    outputs, calls = scorers
+    outputs['t_cheap'] = {"A": 0.6, "B": 0.2}
+    scores, method, stages = run(outputs)
+    assert (scores, method) == (outputs['t_cheap'], 't_cheap')
+    assert calls == ['t_cheap']
+    assert [stage.get('skipped') for stage in stages] == [None, 'not_needed', 'not_needed']
+
+
+def test_ambiguous_result_escalates(scorers):
+    outputs, calls = scorers
+    outputs['t_cheap'] = {"A": 0.50, "B": 0.45}
+    outputs['t_mid'] = {"A": 0.8, "B": 0.3}
+    scores, method, stages = run(outputs)
+    assert method == 't_mid'
+    assert calls == ['t_cheap', 't_mid']
+    assert stages[0]['decisive'] is False and stages[1]['decisive'] is True
+
+
+def test_noise_level_scores_are_not_decisive(scorers):
+    outputs, calls = scorers
+    # Relative margin 0.35, but both scores are noise
+    outputs['t_cheap'] = {"A": 0.085, "B": 0.055}
+    outputs['t_mid'] = {"A": 0.7, "B": 0.2}
+    _, method, stages = run(outputs)
+    assert stages[0]['margin'] > 0.25 and stages[0]['decisive'] is False
+    assert method == 't_mid'
+
+
+def test_small_absolute_gap_is_not_decisive(scorers):
+    outputs, calls = scorers
+    outputs['t_cheap'] = {"A": 0.16, "B": 0.12} # Margin 0.25, gap 0.04
+    outputs['t_mid'] = {"A": 0.7, "B": 0.2}
+    _, method, _ = run(outputs)
+    assert method == 't_mid'
+
+
+@pytest.mark.parametrize('tie', [{"A": 0.5, "B": 0.5}, {"A": 0.0, "B": 0.0}])
+def test_ties_escalate_to_the_last_successful_scorer(scorers, tie):
+    outputs, calls = scorers
+    for name in STAGES:
+        outputs[name] = dict(tie)
+    scores, method, stages = run(outputs)
+    assert calls == STAGES
+    assert method == 't_costly' and scores == tie
+    assert not any(stage['decisive'] for stage in stages)
+
+
+def test_failed_scorers_are_skipped(scorers):
+    outputs, calls = scorers
+    outputs['t_mid'] = {"A": 0.9, "B": 0.1} # t_cheap returns None
+    _, method, stages = run(outputs)
+    assert method == 't_mid'
+    assert stages[0]['error'] is True
+
+
+def test_margin_helpers():
+    assert top_margin({"A": 0.5}) == 1.0
+    assert top_margin({"A": 0.0, "B": 0.0}) == 0.0
+    assert top_gap({"A": 0.7, "B": 0.2, "C": 0.1}) == (0.7, pytest.approx(0.5))
+    assert top_gap({}) == (0.0, 0.0)
+
+
+def test_every_builtin_scorer_has_its_own_label():
+    builtin = ['word_similarity', 'stylometry', 'tfidf', 'embeddings']
+    labels = [SCORER_REGISTRY[name].label for name in builtin]
+    assert len(set(labels)) == len(builtin)
+    assert Scorer('my_model', 1, lambda *args: None).label == "My Model"
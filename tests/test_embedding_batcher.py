@@ -0,0 +1,143 @@
+"""
+Tests for the embedding micro-batcher
+"""
+
+import threading
+import time
+import pytest
+from src.analyzer.embedding_batcher import EmbeddingMicroBatcher
+
+
+class RecordingEmbedder:
+    """embed_many stand-in: one-element vectors derived from the text, and a log of calls"""
+
+    def __init__(self, error: Exception = None, delay: float = 0.0):
+        self.calls = []
+        self.error = error
+        self.delay = delay
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return [[float(len(text))] for text in texts]
+
+
+@pytest.fixture
+def make_batcher():
+    batchers = []
+
+    def make(embed_many, **kwargs):
+        batcher = EmbeddingMicroBatcher(embed_many, **kwargs)
+        batchers.append(batcher)
+        return batcher
+    yield make
+    for batcher in batchers:
+        batcher.close()
+
+
+def embed_concurrently(batcher, texts):
+    """Submit every text from its own thread; returns {text: embedding or raised exception}"""
+    results = {}
+    barrier = threading.Barrier(len(texts))
+
+    def worker(text):
+        barrier.wait()
+        try:
+            results[text] = batcher.embed(text, timeout=5)
+        except Exception as e:
+            results[text] = e
+
+    threads = [threading.Thread(target=worker, args=(text,)) for text in texts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_requests_within_the_window_share_one_call(make_batcher):
+    embedder = RecordingEmbedder()
+    batcher = make_batcher(embedder, window_ms=100, max_batch_size=64)
+    texts = ["a", "bb", "ccc", "dddd"]
+
+    results = embed_concurrently(batcher, texts)
+
+    assert len(embedder.calls) == 1
+    assert sorted(embedder.calls[0]) == sorted(texts)
+    assert batcher.stats()['batches'] == 1
+
+
+def test_a_lone_request_is_sent_once_the_window_passes(make_batcher):
+    embedder = RecordingEmbedder()
+    batcher = make_batcher(embedder, window_ms=50, max_batch_size=64)
+
+    start = time.monotonic()
+    assert batcher.embed("solo", timeout=5) == [4.0]
+    assert time.monotonic() - start >= 0.045
+    assert embedder.calls == [["solo"]]
+
+
+def test_a_full_batch_is_sent_without_waiting_for_the_window(make_batcher):
+    embedder = RecordingEmbedder()
+    batcher = make_batcher(embedder, window_ms=10000, max_batch_size=3)
+
+    start = time.monotonic()
+    results = embed_concurrently(batcher, ["a", "bb", "ccc"])
+
+    assert time.monotonic() - start < 5
+    assert results == {"a": [1.0], "bb": [2.0], "ccc": [3.0]}
+    assert len(embedder.calls) == 1
+
+
+def test_each_waiter_gets_its_own_embedding(make_batcher):
+    embedder = RecordingEmbedder()
+    batcher = make_batcher(embedder, window_ms=100, max_batch_size=64)
+    texts = ["x" * n for n in range(1, 21)]
+
+    results = embed_concurrently(batcher, texts)
+
+    assert results == {text: [float(len(text))] for text in texts}
+
+
+def test_duplicate_texts_are_sent_once(make_batcher):
+    embedder = RecordingEmbedder()
+    batcher = make_batcher(embedder, window_ms=100, max_batch_size=64)
+
+    futures = [batcher.submit(text) for text in ["same", "same", "other", "same"]]
+
+    assert [future.result(5) for future in futures] == [[4.0], [4.0], [5.0], [4.0]]
+    assert batcher.stats()['requests'] == 4
+    assert batcher.stats()['inputs'] == 2
+
+
+def test_a_failed_call_raises_to_every_waiter(make_batcher):
+    embedder = RecordingEmbedder(error=RuntimeError("API down"))
+    batcher = make_batcher(embedder, window_ms=100, max_batch_size=64)
+    texts = ["a", "bb", "ccc"]
+
+    results = embed_concurrently(batcher, texts)
+
+    assert len(embedder.calls) == 1
+    assert all(isinstance(results[text], RuntimeError) for text in texts)
+
+
+def test_a_short_response_raises_to_every_waiter(make_batcher):
+    batcher = make_batcher(lambda texts: [[0.0]], window_ms=100, max_batch_size=64)
+
+    results = embed_concurrently(batcher, ["a", "bb"])
+
+    assert all(isinstance(result, ValueError) for result in results.values())
+
+
+def test_close_sends_pending_texts_and_rejects_new_ones():
+    embedder = RecordingEmbedder()
+    batcher = EmbeddingMicroBatcher(embedder, window_ms=10000, max_batch_size=64)
+    future = batcher.submit("pending")
+
+    batcher.close()
+
+    assert future.result(5) == [7.0]
+    with pytest.raises(RuntimeError):
+        batcher.submit("late")
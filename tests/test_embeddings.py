@@ -0,0 +1,122 @@
+"""
+Tests for the embeddings manager
+"""
+
+import pytest
+
+
+def failing_batch(texts):
+    raise RuntimeError("API down") # As if tenacity had already given up
+
+
+def test_batch_failure_fails_fast(embeddings_manager, monkeypatch):
+    single_calls = []
+    monkeypatch.setattr(embeddings_manager, '_get_embeddings_from_api', failing_batch)
+    monkeypatch.setattr(embeddings_manager, '_get_embedding_from_api', lambda text: single_calls.append(text))
+
+    texts = [f"passage number {i} about building things" for i in range(5)]
+    results = embeddings_manager.get_embeddings_batch(texts)
+
+    assert results == {text: None for text in texts}
+    assert single_calls == [] # No per-text retry storm against a failing API
+
+
+def test_batch_embeds_each_canonical_text_once(embeddings_manager, fake_client):
+    texts = ["We ship fast", "We  ship fast", "We ship fast", "Holding space today"]
+    results = embeddings_manager.get_embeddings_batch(texts)
+    assert fake_client.calls == 1
+    assert fake_client.inputs == 2
+    assert results["We ship fast"] == results["We  ship fast"]
+
+    embeddings_manager.get_embeddings_batch(texts)
+    assert fake_client.calls == 1 # Second round is served from the cache
+
+
+def test_micro_batch_failure_reaches_every_waiter_without_retries(embeddings_manager, monkeypatch):
+    import threading
+    from src.analyzer.embedding_batcher import EmbeddingMicroBatcher
+    from src.analyzer.embeddings import EMBEDDING_FAILURES
+
+    batch_calls, single_calls = [], []
+    embeddings_manager.batcher = EmbeddingMicroBatcher(
+        lambda texts: batch_calls.append(texts) or failing_batch(texts), window_ms=100
+    )
+    monkeypatch.setattr(embeddings_manager, '_get_embedding_from_api', lambda text: single_calls.append(text))
+    failures_before = EMBEDDING_FAILURES.value()
+
+    texts = [f"concurrent request {i} about building things" for i in range(4)]
+    results = {}
+    threads = [threading.Thread(target=lambda t=text: results.update({t: embeddings_manager.get_embedding(t)}))
+               for text in texts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    embeddings_manager.batcher.close()
+
+    assert results == {text: None for text in texts}
+    assert len(batch_calls) == 1
+    assert single_calls == []
+    assert EMBEDDING_FAILURES.value() - failures_before == len(texts)
+
+
+PASSAGE = ("Growth comes from iterating with real customers every week, learning what they value "
+           "and shipping the improvements they ask for without waiting for a perfect plan.")
+NEAR_DUPLICATE = PASSAGE.replace(",", "") # Different cache key, same SimHash
+
+
+@pytest.fixture
+def near_duplicate_manager(workdir, fake_client):
+    from tests.benchmarks.harness import make_embeddings_manager
+    return make_embeddings_manager(fake_client, near_duplicate_distance=3)
+
+
+def test_near_duplicate_reuse_is_labelled(near_duplicate_manager, fake_client):
+    original = near_duplicate_manager.get_embedding(PASSAGE)
+
+    cached = near_duplicate_manager.lookup_cached_embedding(NEAR_DUPLICATE)
+    assert cached.near_duplicate and cached.embedding == original
+    assert cached.reuse_info()['hamming_distance'] == 0
+
+    trace = {}
+    results = near_duplicate_manager.get_embeddings_batch([NEAR_DUPLICATE], trace=trace)
+    assert results[NEAR_DUPLICATE] == original
+    assert set(trace['near_duplicates']) == {NEAR_DUPLICATE}
+    assert fake_client.inputs == 1
+
+
+def test_distance_zero_disables_near_duplicate_reuse(embeddings_manager, fake_client):
+    assert embeddings_manager.near_duplicate_distance == 0 # Opt-in
+    embeddings_manager.get_embedding(PASSAGE)
+
+    assert embeddings_manager.lookup_cached_embedding(NEAR_DUPLICATE) is None
+    trace = {}
+    embeddings_manager.get_embeddings_batch([NEAR_DUPLICATE], trace=trace)
+    assert trace['near_duplicates'] == {} and trace['embedded'] == 1
+    assert fake_client.inputs == 2
+
+
+def test_simhash_index_file_is_appended_once_per_text_and_compacted(near_duplicate_manager, fake_client):
+    import json
+    import os
+    from tests.benchmarks.harness import make_embeddings_manager
+
+    index_path = os.path.join(near_duplicate_manager.cache_dir, near_duplicate_manager.SIMHASH_INDEX_FILE)
+    other = "Holding space for the universe and trusting my vibration to guide this authentic journey today."
+    for _ in range(3):
+        near_duplicate_manager.get_embedding(PASSAGE, use_cache=False)
+        near_duplicate_manager._save_to_cache(PASSAGE, [1.0])
+    near_duplicate_manager.get_embedding(other)
+    with open(index_path) as f:
+        entries = [json.loads(line) for line in f]
+    assert len(entries) == 2
+
+    # Duplicates from older versions, a torn line, and an entry whose cache file is gone
+    with open(index_path, 'a') as f:
+        f.write(json.dumps(entries[0]) + "\n" + '{"key": "trunc')
+    os.remove(near_duplicate_manager._get_cache_path(entries[1]['key']))
+
+    reloaded = make_embeddings_manager(fake_client, near_duplicate_distance=3)
+    assert reloaded.lookup_cached_embedding(NEAR_DUPLICATE).near_duplicate
+    with open(index_path) as f:
+        assert [json.loads(line) for line in f] == [entries[0]]
@@ -0,0 +1,87 @@
+"""
+Tests for multi-passage dialect profiles and the exemplar scorer
+"""
+
+import numpy as np
+import pytest
+from src.analyzer.exemplars import DialectProfile, ExemplarScorer
+from src.dialects.loader import load_dialect_exemplars
+
+
+def test_scorer_packs_exemplars_without_touching_the_profiles():
+    profiles = {
+        'A': DialectProfile('A', [[1.0, 0.0, 0.0], [0.8, 0.6, 0.0]]),
+        'B': DialectProfile('B', [[0.0, 0.0, 1.0]]),
+    }
+    originals = {name: profile.exemplars for name, profile in profiles.items()}
+
+    scorer = ExemplarScorer(profiles, top_k=1)
+    scorer.exemplars[:] = 0 # The packed matrix is the scorer's own
+
+    for name, profile in profiles.items():
+        assert profile.exemplars is originals[name]
+        assert profile.exemplars.any()
+    assert list(scorer.offsets) == [0, 2, 3]
+
+
+def test_scores_blend_centroid_and_nearest_exemplar():
+    profiles = {
+        'A': DialectProfile('A', [[1.0, 0.0], [0.0, 1.0]]),
+        'B': DialectProfile('B', [[-1.0, 0.0]]),
+    }
+    components = ExemplarScorer(profiles, top_k=1).score_components([1.0, 0.0])
+
+    assert components['A']['max'] == pytest.approx(1.0)
+    assert components['A']['centroid'] == pytest.approx(np.sqrt(0.5))
+    assert components['B']['combined'] == pytest.approx(-1.0)
+
+
+def test_loader_reads_each_file_of_a_dialect_directory_as_a_passage(tmp_path):
+    (tmp_path / 'startup_techie').mkdir()
+    (tmp_path / 'startup_techie' / 'b.txt').write_text("Ship it.")
+    (tmp_path / 'startup_techie' / 'a.txt').write_text("Move fast.\n")
+    (tmp_path / 'startup_techie' / 'notes.md').write_text("Not a passage")
+
+    assert load_dialect_exemplars(str(tmp_path)) == {'Startup Techie': ["Move fast.", "Ship it."]}
+
+
+def test_loader_merges_single_files_with_directories_of_the_same_dialect(tmp_path):
+    (tmp_path / 'crossfit_bro.txt').write_text("Crushing the WOD.")
+    (tmp_path / 'crossfit_bro').mkdir()
+    (tmp_path / 'crossfit_bro' / 'pr.txt').write_text("New PR today.")
+    (tmp_path / 'la_hippie.txt').write_text("Holding space.")
+
+    assert load_dialect_exemplars(str(tmp_path)) == {
+        'Crossfit Bro': ["New PR today.", "Crushing the WOD."],
+        'La Hippie': ["Holding space."],
+    }
+
+
+def test_loader_skips_empty_and_unreadable_passages(tmp_path):
+    (tmp_path / 'empty_dir').mkdir()
+    (tmp_path / 'blank.txt').write_text("   \n")
+    (tmp_path / 'mixed').mkdir()
+    (tmp_path / 'mixed' / 'good.txt').write_text("Kept.")
+    (tmp_path / 'mixed' / 'blank.txt').write_text("")
+    (tmp_path / 'mixed' / 'binary.txt').write_bytes(b"\xff\xfe\x00bad")
+
+    assert load_dialect_exemplars(str(tmp_path)) == {'Mixed': ["Kept."]}
+    assert load_dialect_exemplars(str(tmp_path / 'missing')) == {}
+
+
+def test_vectorised_top_k_matches_a_per_dialect_reference():
+    rng = np.random.default_rng(5)
+    profiles = {f"D{i}": DialectProfile(f"D{i}", rng.standard_normal((size, 8)))
+                for i, size in enumerate([1, 3, 7, 2, 12])}
+    query = rng.standard_normal(8)
+    scorer = ExemplarScorer(profiles, top_k=3, centroid_weight=0.4)
+
+    for names in (None, ['D4', 'D0', 'missing']):
+        components = scorer.score_components(query, names)
+        assert set(components) == set(names or profiles) - {'missing'}
+        for name, parts in components.items():
+            sims = np.sort(profiles[name].exemplars @ (query / np.linalg.norm(query)))[::-1]
+            centroid = profiles[name].centroid @ (query / np.linalg.norm(query))
+            assert parts['max'] == pytest.approx(sims[0], abs=1e-5)
+            assert parts['top_k'] == pytest.approx(sims[:3].mean(), abs=1e-5)
+            assert parts['combined'] == pytest.approx(0.4 * centroid + 0.6 * sims[:3].mean(), abs=1e-5)
@@ -0,0 +1,85 @@
+"""
+Tests for incremental (segment-cached) analysis
+"""
+
+import pytest
+from src.analyzer.incremental import IncrementalAnalyzer, split_segments
+from src.analyzer.timing import StageTimer
+from tests.benchmarks.harness import make_pattern_analyzer
+
+DIALECTS = {
+    "Startup Techie": "We move fast, ship the product and disrupt the market with scalable growth.",
+    "La Hippie": "Holding space for the universe, my vibration and my authentic self on this journey.",
+}
+DRAFT = (
+    "We need to move fast and ship the product this quarter. "
+    "The market will not wait for us to polish every detail. "
+    "Growth comes from iterating with real customers every week."
+)
+
+
+@pytest.fixture
+def incremental(embeddings_manager):
+    return IncrementalAnalyzer(make_pattern_analyzer(DIALECTS, embeddings_manager))
+
+
+def test_only_changed_segments_are_embedded(incremental, fake_client):
+    scores, method = incremental.analyze_text(DRAFT)
+    assert method == "embeddings" and set(scores) == set(DIALECTS)
+    segments = len(split_segments(DRAFT))
+    assert incremental.last_stats['embedded_segments'] == segments
+
+    inputs_before = fake_client.inputs
+    edited = DRAFT.replace("every week", "every single day")
+    incremental.analyze_text(edited)
+    assert fake_client.inputs - inputs_before == 1
+    assert incremental.last_stats['embedded_segments'] == 1
+    assert incremental.last_stats['reused_segments'] == segments - 1
+
+
+def test_persistent_cache_hits_are_not_counted_as_embedded(embeddings_manager, incremental):
+    incremental.analyze_text(DRAFT)
+
+    fresh_session = IncrementalAnalyzer(incremental.analyzer)
+    timer = StageTimer()
+    fresh_session.analyze_text(DRAFT, timer=timer)
+    stats = fresh_session.last_stats
+    assert stats['embedded_segments'] == 0
+    assert stats['cached_segments'] == stats['segments']
+    assert timer.cache_hits['segment_embeddings'] is True
+
+
+def test_segment_embedding_failure_falls_back_to_local_scorers(incremental, monkeypatch):
+    def failing_batch(texts):
+        raise RuntimeError("API down")
+    monkeypatch.setattr(incremental.analyzer.embeddings_manager, '_get_embeddings_from_api', failing_batch)
+
+    scores, method = incremental.analyze_text(DRAFT)
+    assert method != "embeddings"
+    assert incremental.last_stats['failed_segments'] == len(split_segments(DRAFT))
+
+
+def test_near_duplicate_segments_are_reported(workdir, fake_client):
+    from tests.benchmarks.harness import make_embeddings_manager
+    manager = make_embeddings_manager(fake_client, near_duplicate_distance=3)
+    passage = ("Growth comes from iterating with real customers every week, learning what they value "
+               "and shipping the improvements they ask for without waiting for a perfect plan.")
+    manager.get_embedding(passage)
+
+    session = IncrementalAnalyzer(make_pattern_analyzer(DIALECTS, manager))
+    scores, method, detailed = session.analyze_with_details(passage.replace(",", ""))
+    assert method == "embeddings"
+    assert session.last_stats['near_duplicate_segments'] == 1
+    assert detailed['embedding_reuse'] == {'near_duplicate': True, 'segments': 1, 'hamming_distance': 0}
+
+    # Still reported when the segment comes from this session's cache
+    trace = {}
+    session.analyze_text(passage.replace(",", "") + "\n\nA brand new closing paragraph for the draft.", trace=trace)
+    assert trace['embedding_reuse']['segments'] == 1
+
+
+def test_exact_segments_report_no_reuse(incremental):
+    trace = {}
+    incremental.analyze_text(DRAFT, trace=trace)
+    assert 'embedding_reuse' not in trace
+    assert incremental.last_stats['near_duplicate_segments'] == 0
@@ -0,0 +1,189 @@
+"""
+Tests for the metrics registry and the counts the analyzer reports to it
+"""
+
+import urllib.error
+import urllib.request
+import pytest
+from src.analyzer.embeddings import API_REQUESTS, CACHE_LOOKUPS
+from src.analyzer.incremental import IncrementalAnalyzer
+from src.analyzer.metrics import MetricsRegistry, start_metrics_server
+from src.analyzer.pattern_analyzer import (
+    ANALYSES, ANALYSIS_DURATION, ANALYSIS_FALLBACKS, RESULT_CACHE_LOOKUPS
+)
+from src.analyzer.result_cache import ResultCache
+from tests.benchmarks.harness import make_pattern_analyzer
+
+DIALECTS = {
+    "Startup Techie": "We move fast, ship the product and disrupt the market with scalable growth.",
+    "La Hippie": "Holding space for the universe, my vibration and my authentic self on this journey.",
+}
+TEXT = "We should ship the product fast and grow the market before anyone else does."
+
+
+class Deltas:
+    """Changes of process-wide counter series since construction"""
+
+    def __init__(self, *series):
+        self._start = {(counter, tuple(sorted(labels.items()))): counter.value(**labels) for counter, labels in series}
+
+    def __getitem__(self, series) -> float:
+        counter, labels = series
+        return counter.value(**labels) - self._start[(counter, tuple(sorted(labels.items())))]
+
+
+def lookups(result: str):
+    return CACHE_LOOKUPS, {'result': result}
+
+
+API_SUCCESS = (API_REQUESTS, {'outcome': 'success'})
+EMBEDDING_ANALYSES = (ANALYSES, {'method': 'embeddings'})
+
+
+def observations(histogram, **labels) -> int:
+    """Number of values observed in one histogram series"""
+    return next((sample['count'] for sample in histogram.samples() if sample['labels'] == labels), 0)
+
+
+# Registry
+
+def test_counters_and_histograms_render_as_prometheus_text():
+    registry = MetricsRegistry()
+    requests = registry.counter('app_requests_total', "Requests by path", ['path'])
+    latency = registry.histogram('app_latency_seconds', "Latency", buckets=(0.1, 1.0))
+    requests.inc(path='/a')
+    requests.inc(2, path='/b "quoted"')
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(3)
+
+    lines = registry.render_prometheus().splitlines()
+    assert lines[:2] == ["# HELP app_latency_seconds Latency", "# TYPE app_latency_seconds histogram"]
+    assert 'app_latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'app_latency_seconds_bucket{le="1"} 2' in lines
+    assert 'app_latency_seconds_bucket{le="+Inf"} 3' in lines
+    assert 'app_latency_seconds_sum 3.55' in lines
+    assert 'app_latency_seconds_count 3' in lines
+    assert "# TYPE app_requests_total counter" in lines
+    assert 'app_requests_total{path="/a"} 1' in lines
+    assert 'app_requests_total{path="/b \\"quoted\\""} 2' in lines
+
+
+def test_snapshot_and_reset():
+    registry = MetricsRegistry()
+    hits = registry.counter('hits_total', "Hits", ['result'])
+    hits.inc(result='hit')
+    hits.inc(result='hit')
+
+    snapshot = registry.snapshot()
+    assert snapshot['hits_total']['type'] == 'counter'
+    assert snapshot['hits_total']['samples'] == [{'labels': {'result': 'hit'}, 'value': 2}]
+    assert hits.value(result='miss') == 0
+
+    registry.reset()
+    assert hits.value(result='hit') == 0
+    assert registry.get('hits_total') is hits
+
+
+def test_registration_is_idempotent_but_checked():
+    registry = MetricsRegistry()
+    counter = registry.counter('calls_total', "Calls", ['kind'])
+    assert registry.counter('calls_total', "Calls", ['kind']) is counter
+    with pytest.raises(ValueError):
+        registry.histogram('calls_total', "Calls", ['kind'])
+    with pytest.raises(ValueError):
+        registry.counter('calls_total', "Calls", ['other'])
+    with pytest.raises(ValueError):
+        counter.inc(wrong='label')
+
+
+def test_metrics_server_serves_the_registry():
+    registry = MetricsRegistry()
+    registry.counter('served_total', "Served").inc()
+    server = start_metrics_server(0, registry=registry)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(f"{url}/metrics") as response:
+            assert response.headers['Content-Type'].startswith('text/plain')
+            assert "served_total 1" in response.read().decode()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{url}/other")
+    finally:
+        server.shutdown()
+
+
+# Analyzer instrumentation
+
+@pytest.fixture
+def analyzer(embeddings_manager):
+    analyzer = make_pattern_analyzer(DIALECTS, embeddings_manager)
+    analyzer.analyze_with_embeddings("Warm up the dialect profiles first", DIALECTS)
+    return analyzer
+
+
+def test_embedding_cache_miss_is_looked_up_once(analyzer, fake_client):
+    deltas = Deltas(lookups('miss'), lookups('hit'), API_SUCCESS)
+    calls_before = fake_client.calls
+
+    _, method = analyzer.analyze_with_embeddings(TEXT, DIALECTS)
+    assert method == "embeddings"
+    assert deltas[lookups('miss')] == 1
+    assert deltas[lookups('hit')] == 0
+    assert deltas[API_SUCCESS] == fake_client.calls - calls_before == 1
+
+    analyzer.analyze_with_embeddings(TEXT, DIALECTS)
+    assert deltas[lookups('hit')] == 1
+    assert deltas[lookups('miss')] == 1
+    assert deltas[API_SUCCESS] == 1
+
+
+def test_batch_lookups_count_each_distinct_text(embeddings_manager):
+    deltas = Deltas(lookups('miss'), lookups('hit'))
+    texts = ["first text to embed", "second text to embed", "first text to embed"]
+
+    embeddings_manager.get_embeddings_batch(texts)
+    embeddings_manager.get_embeddings_batch(texts)
+    assert deltas[lookups('miss')] == 2
+    assert deltas[lookups('hit')] == 2
+
+
+def test_failed_embeddings_count_one_fallback(analyzer, monkeypatch):
+    def failing_batch(texts):
+        raise RuntimeError("API down")
+    monkeypatch.setattr(analyzer.embeddings_manager, 'batcher', None)
+    monkeypatch.setattr(analyzer.embeddings_manager, '_get_embedding_from_api', failing_batch)
+    deltas = Deltas((ANALYSIS_FALLBACKS, {'requested': 'embeddings', 'method': 'tfidf'}))
+
+    _, method = analyzer.analyze_text(TEXT, method="embeddings")
+    assert method == "tfidf"
+    assert deltas[(ANALYSIS_FALLBACKS, {'requested': 'embeddings', 'method': 'tfidf'})] == 1
+
+
+def test_incremental_fallback_is_counted(analyzer, monkeypatch):
+    def failing_batch(texts):
+        raise RuntimeError("API down")
+    monkeypatch.setattr(analyzer.embeddings_manager, '_get_embeddings_from_api', failing_batch)
+    fallback = (ANALYSIS_FALLBACKS, {'requested': 'embeddings', 'method': 'tfidf'})
+    deltas = Deltas(fallback)
+
+    _, method = IncrementalAnalyzer(analyzer).analyze_text(TEXT)
+    assert method == "tfidf"
+    assert deltas[fallback] == 1
+
+
+def test_incremental_analyses_and_result_lookups_are_counted(embeddings_manager):
+    analyzer = make_pattern_analyzer(DIALECTS, embeddings_manager, result_cache=ResultCache(persist=False))
+    incremental = IncrementalAnalyzer(analyzer)
+    deltas = Deltas(EMBEDDING_ANALYSES, (RESULT_CACHE_LOOKUPS, {'result': 'miss'}),
+                    (RESULT_CACHE_LOOKUPS, {'result': 'hit'}))
+    observed_before = observations(ANALYSIS_DURATION, method='embeddings')
+
+    _, method, _ = incremental.analyze_with_details(TEXT)
+    assert method == "embeddings"
+    assert deltas[EMBEDDING_ANALYSES] == 1
+    assert observations(ANALYSIS_DURATION, method='embeddings') - observed_before == 1
+    assert deltas[(RESULT_CACHE_LOOKUPS, {'result': 'miss'})] == 1
+
+    incremental.analyze_with_details(TEXT)
+    assert deltas[(RESULT_CACHE_LOOKUPS, {'result': 'hit'})] == 1
+    assert deltas[EMBEDDING_ANALYSES] == 1
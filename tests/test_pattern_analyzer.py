@@ -0,0 +1,151 @@
+"""
+Tests for PatternAnalyzer dialect loading and scoring
+"""
+
+import os
+from types import SimpleNamespace
+import pytest
+from src.analyzer import pattern_analyzer
+from src.analyzer.cascade import CascadePlanner
+from src.analyzer.pattern_analyzer import PatternAnalyzer
+from src.analyzer.result_cache import ResultCache
+from src.dialects import loader
+from tests.benchmarks.harness import make_dialects
+
+SAMPLES = {
+    'startup_techie.txt': "We move fast, ship the product and disrupt the market with scalable growth.",
+    'la_hippie.txt': "Holding space for the universe, my vibration and my authentic self on this journey.",
+    'crossfit_bro.txt': "Crushing the WOD, hitting a new PR and dialing in my macros, bro.",
+}
+
+
+@pytest.fixture
+def samples_dir(workdir):
+    path = workdir / 'data' / 'dialects' / 'samples'
+    path.mkdir(parents=True)
+    for filename, text in SAMPLES.items():
+        (path / filename).write_text(text)
+    return path
+
+
+def test_exemplars_are_only_reread_when_the_corpus_changes(samples_dir, monkeypatch):
+    monkeypatch.setattr(loader, 'CORPUS_VERSION_TTL', 0) # Notice the edit below right away
+    loads = []
+    original = pattern_analyzer.load_dialect_exemplars
+    monkeypatch.setattr(pattern_analyzer, 'load_dialect_exemplars', lambda: loads.append(1) or original())
+    analyzer = PatternAnalyzer()
+
+    first = analyzer.load_dialect_exemplars()
+    assert analyzer.load_dialect_exemplars() is first
+    assert len(loads) == 1
+
+    (samples_dir / 'startup_techie.txt').write_text(SAMPLES['startup_techie.txt'] + " Let's iterate.")
+    changed = analyzer.load_dialect_exemplars()
+    assert len(loads) == 2
+    assert changed['Startup Techie'][0].endswith("Let's iterate.")
+
+
+def test_corpus_version_is_reused_until_it_expires(samples_dir, monkeypatch):
+    clock = [1000.0]
+    walks = []
+    original_walk = os.walk
+    monkeypatch.setattr(loader.time, 'monotonic', lambda: clock[0])
+    monkeypatch.setattr(loader.os, 'walk', lambda path: walks.append(path) or original_walk(path))
+
+    version = loader.dialect_corpus_version()
+    (samples_dir / 'new_dialect.txt').write_text("A brand new way of talking.")
+    assert loader.dialect_corpus_version() == version
+    assert len(walks) == 1
+
+    clock[0] += loader.CORPUS_VERSION_TTL
+    assert loader.dialect_corpus_version() != version
+    assert len(walks) == 2
+
+
+def test_profiles_are_fingerprinted_once_per_loaded_corpus(samples_dir, embeddings_manager, monkeypatch):
+    hashed = []
+    original = pattern_analyzer.exemplars_fingerprint
+    monkeypatch.setattr(pattern_analyzer, 'exemplars_fingerprint', lambda passages: hashed.append(1) or original(passages))
+    analyzer = PatternAnalyzer(embeddings_manager)
+
+    for _ in range(3):
+        _, method = analyzer.analyze_text("We should ship the product fast and grow the market", method="embeddings")
+        assert method == "embeddings"
+    assert len(hashed) == len(SAMPLES)
+
+
+def test_cascade_cache_keys_follow_the_model_and_planner(samples_dir):
+    def key(method, model="text-embedding-3-small", **planner):
+        analyzer = PatternAnalyzer(result_cache=ResultCache(persist=False),
+                                   cascade_planner=CascadePlanner(**planner))
+        analyzer.embeddings_manager = SimpleNamespace(model=model)
+        return analyzer.result_cache_key("Some text to analyze", method)
+
+    assert key("cascade") == key("cascade")
+    assert key("cascade", model="text-embedding-3-large") != key("cascade")
+    assert key("cascade", min_gap=0.1) != key("cascade")
+    assert key("cascade", stage_thresholds={'tfidf': 0.5}) != key("cascade")
+    # Methods that never reach embeddings don't depend on the model or the planner
+    assert key("word_similarity", model="text-embedding-3-large", min_gap=0.1) == key("word_similarity")
+
+
+def test_texts_sharing_an_embedding_share_a_result_key(samples_dir, embeddings_manager):
+    analyzer = PatternAnalyzer(embeddings_manager, result_cache=ResultCache(persist=False))
+    straight = "It's a \"bold\" move - let's  ship it"
+    curly = "It’s a “bold” move — let’s ship it"
+
+    assert embeddings_manager._get_cache_key(straight) == embeddings_manager._get_cache_key(curly)
+    assert analyzer.result_cache_key(straight, "embeddings") == analyzer.result_cache_key(curly, "embeddings")
+
+
+def test_every_dialect_is_scored_past_the_index_training_size(workdir, embeddings_manager):
+    from src.analyzer.vector_index import IVFIndex
+    dialects = make_dialects(IVFIndex().min_train_size + 200)
+    analyzer = PatternAnalyzer(embeddings_manager)
+
+    scores, method = analyzer.analyze_with_embeddings("We should ship the product fast", dialects)
+    assert method == "embeddings"
+    assert set(scores) == set(dialects)
+
+    # With top_k the trained approximate index picks the candidates
+    analyzer.top_k = 5
+    scores, _ = analyzer.analyze_with_embeddings("We should ship the product fast", dialects)
+    assert analyzer.dialect_index.is_trained
+    assert len(scores) == 5
+
+
+def test_only_embedding_keys_are_canonicalized(samples_dir):
+    analyzer = PatternAnalyzer(result_cache=ResultCache(persist=False))
+    straight = "It's a \"bold\" move - let's  ship it"
+    curly = "It’s a “bold” move — let’s ship it"
+
+    # Stylometry measures punctuation and whitespace, so these variants score differently
+    for method in ("stylometry", "word_similarity", "tfidf", "cascade"):
+        assert analyzer.result_cache_key(straight, method) != analyzer.result_cache_key(curly, method)
+
+
+def test_exemplar_and_index_settings_are_part_of_embedding_keys(samples_dir):
+    def key(method="embeddings", **settings):
+        analyzer = PatternAnalyzer(result_cache=ResultCache(persist=False), **settings)
+        analyzer.embeddings_manager = SimpleNamespace(model="text-embedding-3-small")
+        return analyzer.result_cache_key("Some text to analyze", method)
+
+    assert key() == key()
+    for settings in ({'centroid_weight': 0.7}, {'exemplar_top_k': 2}, {'top_k': 10},
+                     {'index_kind': 'brute_force', 'top_k': 10}):
+        assert key(**settings) != key(**({'top_k': 10} if 'index_kind' in settings else {}))
+    assert key("cascade", centroid_weight=0.7) != key("cascade")
+    assert key("stylometry", centroid_weight=0.7) == key("stylometry")
+
+
+def test_changing_centroid_weight_misses_the_persistent_cache(samples_dir, embeddings_manager):
+    text = "We should ship the product fast and grow the market"
+    first = PatternAnalyzer(embeddings_manager, result_cache=ResultCache())
+    first.analyze_with_details(text, method="embeddings")
+
+    reweighted = PatternAnalyzer(embeddings_manager, result_cache=ResultCache(), centroid_weight=0.9)
+    reweighted.analyze_with_details(text, method="embeddings")
+    assert reweighted.result_cache.misses == 1 and reweighted.result_cache.hits == 0
+    same = PatternAnalyzer(embeddings_manager, result_cache=ResultCache())
+    same.analyze_with_details(text, method="embeddings")
+    assert same.result_cache.hits == 1
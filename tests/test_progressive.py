@@ -0,0 +1,76 @@
+"""
+Tests for progressive (quick, then refined) analysis
+"""
+
+import threading
+import pytest
+from src.analyzer.progressive import start_progressive_analysis
+from tests.benchmarks.harness import FakeEmbeddingsClient, make_embeddings_manager, make_pattern_analyzer
+
+DIALECTS = {
+    'startup': "We move fast, ship the product and disrupt the market with scalable growth.",
+    'wellness': "Holding space for the universe, my vibration and my authentic self on this journey.",
+}
+TEXT = "We should ship the product fast and grow the market before anyone else does."
+
+
+class GatedEmbeddingsClient(FakeEmbeddingsClient):
+    """Fake client whose API calls block until the test opens the gate"""
+
+    def __init__(self):
+        super().__init__(dim=64)
+        self.gate = threading.Event()
+
+    def create(self, input, model):
+        assert self.gate.wait(timeout=10), "gate never opened"
+        return super().create(input, model)
+
+
+@pytest.fixture
+def gated(workdir):
+    client = GatedEmbeddingsClient()
+    yield client, make_pattern_analyzer(DIALECTS, make_embeddings_manager(client))
+    client.gate.set() # Never leave a background worker blocked
+
+
+def test_quick_result_is_available_before_refinement_finishes(gated):
+    client, analyzer = gated
+    job = start_progressive_analysis(analyzer, TEXT)
+
+    assert not job.done
+    scores, method, _ = job.result()
+    assert method != "embeddings" and set(scores) == set(DIALECTS)
+    assert [stage['status'] for stage in job.stages] == ['complete', 'running']
+    assert client.calls == 0
+
+
+def test_wait_returns_once_the_refined_result_is_in(gated):
+    client, analyzer = gated
+    job = start_progressive_analysis(analyzer, TEXT)
+    assert not job.wait(timeout=0.01)
+
+    client.gate.set()
+    assert job.wait(timeout=10)
+    scores, method, _ = job.result()
+    assert method == "embeddings" and set(scores) == set(DIALECTS)
+    assert job.stages[-1]['status'] == 'complete' and job.stages[-1]['method'] == "embeddings"
+
+
+def failing_refine():
+    raise RuntimeError("embedding API down")
+
+
+@pytest.mark.parametrize('refine', [failing_refine, lambda: ({}, "not_analyzed (too short)", {})])
+def test_failed_refinement_falls_back_to_the_quick_result(workdir, refine):
+    analyzer = make_pattern_analyzer(DIALECTS, make_embeddings_manager(FakeEmbeddingsClient(dim=64)))
+    job = start_progressive_analysis(analyzer, TEXT, refine=refine)
+
+    assert job.wait(timeout=10)
+    assert job.result() is job.quick
+    assert job.stages[-1]['status'] == 'failed'
+
+
+def test_without_embeddings_there_is_nothing_to_refine(workdir):
+    job = start_progressive_analysis(make_pattern_analyzer(DIALECTS), TEXT)
+    assert job.done and job.future is None
+    assert job.result() is job.quick
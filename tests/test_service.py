@@ -0,0 +1,139 @@
+"""
+Tests for the headless analysis service
+"""
+
+import asyncio
+import json
+import threading
+from typing import Any, Dict, Optional, Tuple
+from src.service.server import RETRY_AFTER_SECONDS, AnalysisService
+
+
+class BlockingAnalyzer:
+    """Stand-in analyzer whose analyses wait until `release` is set"""
+
+    embeddings_manager = None
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.analyzed = []
+
+    def analyze_with_details(self, text, use_embeddings=True, method=None, collect_timings=False):
+        self.release.wait(10)
+        self.analyzed.append(text)
+        return {'A': 1.0}, 'word_similarity', {'top_dialect': 'A', 'top_score': 1.0}
+
+
+async def request(port: int, method: str, path: str,
+                  body: Optional[bytes] = None) -> Tuple[int, Dict[str, str], Any]:
+    """One request on its own connection: (status, headers, decoded JSON body)"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    body = body or b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, payload = raw.partition(b'\r\n\r\n')
+    status_line, *header_lines = head.decode('latin-1').split('\r\n')
+    headers = {name.lower(): value.strip() for name, _, value in (line.partition(':') for line in header_lines)}
+    return int(status_line.split()[1]), headers, json.loads(payload)
+
+
+def analyze_body(text: str = "hello there", **options) -> bytes:
+    return json.dumps({'text': text, **options}).encode()
+
+
+def run_service(test, workers: int = 1, queue_size: int = 2):
+    """Run `test(service, analyzer)` against a service on an ephemeral port"""
+    async def main():
+        analyzer = BlockingAnalyzer()
+        service = AnalysisService(analyzer, workers=workers, queue_size=queue_size)
+        await service.start('127.0.0.1', 0)
+        try:
+            return await test(service, analyzer)
+        finally:
+            analyzer.release.set()
+            await service.shutdown(grace=5)
+    return asyncio.run(main())
+
+
+def test_accepts_workers_plus_queue_size_and_rejects_the_rest():
+    async def test(service, analyzer):
+        requests = [asyncio.create_task(request(service.port, 'POST', '/analyze', analyze_body(f"text {i}")))
+                    for i in range(6)]
+        await asyncio.sleep(0.5)
+        analyzer.release.set()
+        return await asyncio.gather(*requests)
+
+    responses = run_service(test, workers=1, queue_size=2)
+    statuses = sorted(status for status, _, _ in responses)
+    assert statuses == [200, 200, 200, 429, 429, 429]
+    for status, headers, body in responses:
+        if status == 429:
+            assert headers['retry-after'] == str(RETRY_AFTER_SECONDS)
+            assert 'error' in body
+
+
+def test_capacity_frees_up_as_analyses_finish():
+    async def test(service, analyzer):
+        analyzer.release.set()
+        return [await request(service.port, 'POST', '/analyze', analyze_body()) for _ in range(5)]
+
+    assert [status for status, _, _ in run_service(test)] == [200] * 5
+
+
+def test_bad_requests_are_rejected_without_queueing():
+    async def test(service, analyzer):
+        analyzer.release.set()
+        cases = [
+            ('POST', '/analyze', b'{not json'),
+            ('POST', '/analyze', b'["a list"]'),
+            ('POST', '/analyze', json.dumps({'text': 42}).encode()),
+            ('POST', '/analyze', analyze_body(method='no_such_scorer')),
+            ('POST', '/analyze', analyze_body(use_embeddings='yes')),
+            ('POST', '/analyze_batch', json.dumps({'texts': []}).encode()),
+            ('GET', '/analyze', None),
+            ('GET', '/nowhere', None),
+        ]
+        responses = [await request(service.port, method, path, body) for method, path, body in cases]
+        return responses, analyzer.analyzed
+
+    responses, analyzed = run_service(test)
+    assert [status for status, _, _ in responses] == [400, 400, 400, 400, 400, 400, 405, 404]
+    assert all('error' in body for _, _, body in responses)
+    assert analyzed == []
+
+
+def test_shutdown_drains_accepted_work_and_refuses_new_connections():
+    async def test(service, analyzer):
+        requests = [asyncio.create_task(request(service.port, 'POST', '/analyze', analyze_body(f"text {i}")))
+                    for i in range(3)]
+        await asyncio.sleep(0.3)
+        port = service.port
+        shutdown = asyncio.create_task(service.shutdown(grace=5))
+        await asyncio.sleep(0.1)
+        assert service.health()['status'] == 'stopping'
+        try:
+            await request(port, 'GET', '/health')
+            refused = False
+        except (ConnectionError, OSError, IndexError):
+            refused = True
+        analyzer.release.set()
+        responses = await asyncio.gather(*requests)
+        await shutdown
+        return responses, refused, analyzer.analyzed
+
+    responses, refused, analyzed = run_service(test)
+    assert [status for status, _, _ in responses] == [200, 200, 200]
+    assert sorted(analyzed) == ["text 0", "text 1", "text 2"]
+    assert refused
+
+
+def test_health_reports_configuration():
+    async def test(service, analyzer):
+        return await request(service.port, 'GET', '/health')
+
+    status, _, body = run_service(test, workers=2, queue_size=4)
+    assert status == 200
+    assert body == {'status': 'ok', 'embeddings': False, 'workers': 2, 'queue_depth': 0, 'queue_size': 4}
@@ -0,0 +1,122 @@
+"""
+Tests for the TF-IDF similarity analyzers
+"""
+
+import os
+import numpy as np
+import pytest
+from src.analyzer import similarity_analyzer
+from src.analyzer.similarity_analyzer import (
+    HashingSimilarityAnalyzer, SimilarityAnalyzer, get_shared_analyzer
+)
+from tests.benchmarks.harness import make_pattern_analyzer
+
+DIALECTS = {
+    'stoic': "virtue reason nature control acceptance duty discipline calm",
+    'romantic': "passion longing beauty nature heart sublime emotion yearning",
+    'corporate': "synergy leverage stakeholder deliverable roadmap alignment metrics",
+}
+TEXT = "I try to accept what I cannot control and keep my discipline, even when passion pulls at my heart"
+
+
+def test_persisted_fit_scores_like_a_fresh_fit(workdir):
+    fresh = SimilarityAnalyzer(DIALECTS)
+    SimilarityAnalyzer.load_or_fit(DIALECTS, cache_dir='fits')
+    files = os.listdir('fits')
+    assert files == [f"tfidf_{fresh.fingerprint}.npz"]
+
+    loaded = SimilarityAnalyzer.load_or_fit(DIALECTS, cache_dir='fits')
+    scores, terms = loaded.analyze(TEXT)
+    expected_scores, expected_terms = fresh.analyze(TEXT)
+    assert scores == pytest.approx(expected_scores)
+    assert [t.term for t in terms] == [t.term for t in expected_terms]
+
+
+def test_persisted_fit_holds_no_pickled_objects(workdir):
+    analyzer = SimilarityAnalyzer.load_or_fit(DIALECTS, cache_dir='fits')
+    path = os.path.join('fits', f"tfidf_{analyzer.fingerprint}.npz")
+    with np.load(path, allow_pickle=False) as state:
+        assert set(state.files) == {'fingerprint', 'terms', 'idf'}
+
+
+def test_fit_for_another_corpus_is_refitted_alongside_the_old_one(workdir):
+    old = SimilarityAnalyzer.load_or_fit(DIALECTS, cache_dir='fits')
+    with open(os.path.join('fits', 'tfidf_0123abcd.pkl'), 'wb') as f:
+        f.write(b'legacy pickle')
+
+    changed = dict(DIALECTS, stoic=DIALECTS['stoic'] + " fortitude")
+    new = SimilarityAnalyzer.load_or_fit(changed, cache_dir='fits')
+    assert new.fingerprint != old.fingerprint
+    # Another analyzer may still use the old corpus; only the legacy pickle goes
+    assert sorted(os.listdir('fits')) == sorted([f"tfidf_{old.fingerprint}.npz", f"tfidf_{new.fingerprint}.npz"])
+
+
+def test_least_recently_used_fits_are_pruned(workdir, monkeypatch):
+    monkeypatch.setattr(similarity_analyzer, 'TFIDF_FITS_MAX', 2)
+    corpora = [dict(DIALECTS, extra=f"corpus number {i}") for i in range(3)]
+    first, second = (SimilarityAnalyzer.load_or_fit(corpus, cache_dir='fits') for corpus in corpora[:2])
+    paths = {a.fingerprint: os.path.join('fits', f"tfidf_{a.fingerprint}.npz") for a in (first, second)}
+    os.utime(paths[first.fingerprint], (1, 1))
+    os.utime(paths[second.fingerprint], (2, 2))
+
+    SimilarityAnalyzer.load_or_fit(corpora[0], cache_dir='fits') # Loading refreshes the first fit
+    third = SimilarityAnalyzer.load_or_fit(corpora[2], cache_dir='fits')
+    assert sorted(os.listdir('fits')) == sorted([f"tfidf_{first.fingerprint}.npz", f"tfidf_{third.fingerprint}.npz"])
+
+
+def test_mismatched_fit_file_is_not_trusted(workdir):
+    analyzer = SimilarityAnalyzer.load_or_fit(DIALECTS, cache_dir='fits')
+    changed = dict(DIALECTS, corporate="quarterly synergy")
+    # A file named for one corpus but holding another's fit
+    os.replace(os.path.join('fits', f"tfidf_{analyzer.fingerprint}.npz"),
+               os.path.join('fits', f"tfidf_{SimilarityAnalyzer(changed, fit=False).fingerprint}.npz"))
+
+    loaded = SimilarityAnalyzer.load_or_fit(changed, cache_dir='fits')
+    assert loaded.analyze(TEXT)[0] == pytest.approx(SimilarityAnalyzer(changed).analyze(TEXT)[0])
+
+
+def test_shared_analyzer_mode_selects_the_backend(workdir):
+    hashed = get_shared_analyzer(DIALECTS, mode='hashing')
+    assert isinstance(hashed, HashingSimilarityAnalyzer)
+    assert get_shared_analyzer(DIALECTS, mode='hashing') is hashed
+    assert isinstance(get_shared_analyzer(DIALECTS), SimilarityAnalyzer)
+    with pytest.raises(ValueError):
+        get_shared_analyzer(DIALECTS, mode='dense')
+
+
+def test_tfidf_scorer_uses_the_hashing_backend(workdir):
+    analyzer = make_pattern_analyzer(DIALECTS, tfidf_mode='hashing')
+    scores, method = analyzer.analyze_text(TEXT, method='tfidf')
+    assert method == 'tfidf'
+    assert scores == pytest.approx(HashingSimilarityAnalyzer(DIALECTS).analyze(TEXT)[0])
+    assert not os.path.exists(os.path.join('data', 'dialects', 'embeddings'))
+
+
+def test_shared_hashing_analyzer_follows_corpus_changes_in_place(workdir):
+    hashed = get_shared_analyzer(DIALECTS, mode='hashing')
+    grown = dict(DIALECTS, nautical="starboard keel mast anchor harbor tide sail")
+
+    assert get_shared_analyzer(grown, mode='hashing') is hashed
+    scores, _ = hashed.analyze("we raised the sail and dropped anchor in the harbor")
+    assert max(scores, key=scores.get) == 'nautical'
+    assert scores == pytest.approx(HashingSimilarityAnalyzer(grown).analyze(
+        "we raised the sail and dropped anchor in the harbor")[0])
+
+    shrunk = {name: text for name, text in grown.items() if name != 'corporate'}
+    assert get_shared_analyzer(shrunk, mode='hashing') is hashed
+    assert sorted(hashed.dialect_names) == sorted(shrunk)
+    assert hashed.analyze(TEXT)[0] == pytest.approx(HashingSimilarityAnalyzer(shrunk).analyze(TEXT)[0])
+
+
+@pytest.mark.parametrize('analyzer_cls', [SimilarityAnalyzer, HashingSimilarityAnalyzer])
+def test_zero_top_terms_still_scores(analyzer_cls):
+    analyzer = analyzer_cls(DIALECTS)
+    scores, terms = analyzer.analyze(TEXT, top_n_terms=0)
+    assert terms == []
+    assert scores == pytest.approx(analyzer.analyze(TEXT)[0])
+
+
+def test_hashing_top_terms_without_weighted_terms_is_empty():
+    analyzer = HashingSimilarityAnalyzer(DIALECTS)
+    empty_row = analyzer.vectorizer.transform([""]).tocsr()
+    assert analyzer._top_terms(TEXT, empty_row, 0, norm=1.0, top_n_terms=10) == []
@@ -0,0 +1,78 @@
+"""
+Tests for the stylometric features and scorer
+"""
+
+import numpy as np
+import pytest
+from src.analyzer.scorers import COST_LOCAL_VECTORS, SCORER_REGISTRY, scorers_by_cost
+from src.analyzer.stylometry import (
+    FEATURE_DIM, PUNCTUATION, SHAPE_FEATURES, StylometryModel, extract_features
+)
+from tests.benchmarks.harness import make_pattern_analyzer
+
+DIALECTS = {
+    'terse': "Go. Now. Run fast. Stop here.",
+    'ornate': "Whereupon, having considered the matter at considerable length, we resolved; "
+              "and yet, curiously, nothing whatsoever changed (as expected).",
+}
+
+
+def shape(features, name):
+    return features[SHAPE_FEATURES.index(name)]
+
+
+def punctuation(features, mark):
+    return features[len(SHAPE_FEATURES) + PUNCTUATION.index(mark)]
+
+
+def test_rates_and_sentence_shape_of_a_small_text():
+    features = extract_features("Hi. Go now!") # 11 characters, 3 words in sentences of 1 and 2
+
+    assert features.shape == (FEATURE_DIM,)
+    assert shape(features, 'whitespace_rate') == pytest.approx(2 / 11)
+    assert shape(features, 'uppercase_rate') == pytest.approx(2 / 11)
+    assert shape(features, 'digit_rate') == 0
+    assert punctuation(features, '.') == pytest.approx(1 / 11)
+    assert punctuation(features, '!') == pytest.approx(1 / 11)
+    assert punctuation(features, ',') == 0
+    assert shape(features, 'mean_sentence_words') == pytest.approx(np.log1p(1.5))
+    assert shape(features, 'sentence_words_cv') == pytest.approx(0.5 / 1.5)
+    assert shape(features, 'mean_word_chars') == pytest.approx(np.log1p(7 / 3))
+    assert shape(features, 'long_word_rate') == 0
+
+
+def test_whitespace_and_punctuation_variants_have_different_features():
+    straight = extract_features("It's a bold move - ship it")
+    spaced = extract_features("It's a bold  move -  ship it")
+    assert shape(straight, 'whitespace_rate') != shape(spaced, 'whitespace_rate')
+    assert punctuation(straight, '-') != punctuation(spaced, '-')
+
+
+def test_empty_text_has_all_zero_features():
+    assert not extract_features("").any()
+
+
+def test_zero_norm_vectors_stay_finite():
+    model = StylometryModel({'only': ["A single dialect has no spread to scale by."]})
+    assert not model.transform(model.mean.copy()).any()
+    assert model.score("Anything at all.") == {'only': pytest.approx(0.5)}
+    assert all(np.isfinite(score) for score in StylometryModel(DIALECTS).score("").values())
+
+
+def test_scores_favour_the_matching_style():
+    scores = StylometryModel({name: [text] for name, text in DIALECTS.items()}).score("Sit. Stay. Eat now.")
+    assert set(scores) == set(DIALECTS)
+    assert all(0.0 <= score <= 1.0 for score in scores.values())
+    assert scores['terse'] > scores['ornate']
+
+
+def test_stylometry_is_a_registered_local_scorer():
+    scorer = SCORER_REGISTRY['stylometry']
+    assert scorer.cost == COST_LOCAL_VECTORS
+    assert 'stylometry' in [s.name for s in scorers_by_cost()]
+
+    analyzer = make_pattern_analyzer(DIALECTS)
+    scores, method = analyzer.analyze_text("Sit. Stay. Eat now.", method='stylometry')
+    assert method == 'stylometry'
+    assert scores == pytest.approx(StylometryModel({name: [text] for name, text in DIALECTS.items()})
+                                   .score("Sit. Stay. Eat now."))
@@ -0,0 +1,45 @@
+"""
+Tests for the sparse dialect x term matrix and its shared-term explanations
+"""
+
+import numpy as np
+import pytest
+from src.analyzer.similarity_analyzer import SimilarityAnalyzer
+from src.analyzer.term_matrix import DialectTermMatrix
+
+DIALECTS = {
+    'sailor': "sail sail boat harbor",
+    'mechanic': "boat engine",
+}
+TEXT = "Sail the boat, the boat!"
+
+
+def test_explain_weights_shared_terms_by_dialect_and_user_frequency():
+    explanations = DialectTermMatrix(DIALECTS).explain(TEXT)
+    # Sublinear tf (1 + log tf) times smoothed idf (log((1 + n) / (1 + df)) + 1) over 2 dialects
+    idf_sail, idf_boat = np.log(3 / 2) + 1, 1.0
+    sail = (1 + np.log(2)) * idf_sail * 1
+    boat = 1 * idf_boat * (1 + np.log(2))
+
+    sailor = explanations['sailor']
+    assert sailor['shared_terms'] == ['boat', 'sail']
+    assert [term for term, _ in sailor['term_weights']] == ['sail', 'boat']
+    assert [weight for _, weight in sailor['term_weights']] == pytest.approx([sail, boat])
+    assert sailor['shared_weight'] == pytest.approx(sail + boat)
+
+    assert explanations['mechanic']['term_weights'] == [('boat', pytest.approx(boat))]
+
+
+def test_explain_covers_every_dialect_and_respects_top_n():
+    explanations = DialectTermMatrix(DIALECTS).explain("nothing in common here", top_n=1)
+    assert set(explanations) == set(DIALECTS)
+    assert all(entry['shared_terms'] == [] and entry['shared_weight'] == 0 for entry in explanations.values())
+    assert len(DialectTermMatrix(DIALECTS).explain(TEXT, top_n=1)['sailor']['term_weights']) == 1
+
+
+def test_shared_terms_agree_with_the_tfidf_top_terms():
+    explanations = DialectTermMatrix(DIALECTS).explain(TEXT)
+    _, top_terms = SimilarityAnalyzer(DIALECTS, ngram_range=(1, 1)).analyze(TEXT)
+
+    shared = {term for entry in explanations.values() for term in entry['shared_terms']}
+    assert shared == {term.term for term in top_terms}
@@ -0,0 +1,26 @@
+"""
+Tests for the shared tokenizer and its caches
+"""
+
+from src.analyzer import tokenizer
+from src.analyzer.tokenizer import clear_token_cache, token_set, tokenize
+
+
+def test_cached_tokenizations_match_and_do_not_hold_the_text(monkeypatch):
+    monkeypatch.setattr(tokenizer, '_tokenize_cache', tokenizer._DigestCache(2))
+    text = "Don’t stop — we’re shipping the state-of-the-art build " * 500
+
+    assert tokenize(text) is tokenize(text)
+    assert tokenize(text)[:3] == ("don't", 'stop', "we're")
+    assert token_set(text) == frozenset(tokenize(text))
+    assert all(len(key) == 16 for key in tokenizer._tokenize_cache._entries)
+
+    tokenize("second text")
+    tokenize("third text")
+    assert len(tokenizer._tokenize_cache._entries) == 2
+
+
+def test_clear_token_cache():
+    tokenize("something to remember")
+    clear_token_cache()
+    assert not tokenizer._tokenize_cache._entries and not tokenizer._token_set_cache._entries
@@ -0,0 +1,112 @@
+"""
+Tests for the dialect vector indexes
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+from src.analyzer.vector_index import (
+    BruteForceIndex, IVFIndex, create_vector_index, load_vector_index, recall_at_k
+)
+
+DIM = 32
+
+
+def clustered_corpus(n: int = 2000, clusters: int = 40, seed: int = 3):
+    """Seeded vectors scattered around `clusters` random directions, plus queries drawn the same way"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, DIM))
+    vectors = centers[rng.integers(clusters, size=n)] + 0.3 * rng.standard_normal((n, DIM))
+    queries = centers[rng.integers(clusters, size=50)] + 0.3 * rng.standard_normal((50, DIM))
+    return [f"dialect-{i:05d}" for i in range(n)], vectors, queries
+
+
+def build(index_cls, keys, vectors, **kwargs):
+    index = index_cls(**kwargs)
+    index.add(keys, vectors)
+    return index
+
+
+def test_ivf_probing_every_list_matches_brute_force():
+    keys, vectors, queries = clustered_corpus()
+    exact = build(BruteForceIndex, keys, vectors)
+    ivf = build(IVFIndex, keys, vectors, n_lists=20, n_probe=20, min_train_size=256)
+    assert ivf.is_trained
+    for query in queries:
+        expected = exact.query(query, k=10)
+        actual = ivf.query(query, k=10)
+        assert [key for key, _ in actual] == [key for key, _ in expected]
+        assert np.allclose([score for _, score in actual], [score for _, score in expected], atol=1e-5)
+
+
+def test_ivf_partial_probe_keeps_high_recall():
+    keys, vectors, queries = clustered_corpus()
+    ivf = build(IVFIndex, keys, vectors, n_lists=40, n_probe=8, min_train_size=256)
+    assert ivf.is_trained
+    assert len(ivf._search(ivf._prepare_query(queries[0]))) < len(keys) # Really approximate
+    assert recall_at_k(ivf, queries, k=10) >= 0.95
+
+
+def test_ivf_scores_are_exact_for_returned_keys():
+    keys, vectors, queries = clustered_corpus()
+    ivf = build(IVFIndex, keys, vectors, n_lists=40, n_probe=8, min_train_size=256)
+    exact = dict(ivf.search_exact(queries[0]))
+    for key, score in ivf.query(queries[0], k=10):
+        assert score == pytest.approx(exact[key], abs=1e-5)
+
+
+@pytest.mark.parametrize('kind', ['brute_force', 'ivf'])
+def test_empty_index_returns_nothing(kind):
+    index = create_vector_index(kind)
+    assert len(index) == 0
+    assert index.query(np.ones(DIM), k=5) == []
+    assert index.search_exact(np.ones(DIM), k=5) == []
+
+
+@pytest.mark.parametrize('kind', ['brute_force', 'ivf'])
+def test_k_larger_than_index_returns_everything_sorted(kind):
+    keys, vectors, queries = clustered_corpus(n=7)
+    index = build(type(create_vector_index(kind)), keys, vectors)
+    results = index.query(queries[0], k=50)
+    assert sorted(key for key, _ in results) == sorted(keys)
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_add_replaces_existing_keys():
+    keys, vectors, queries = clustered_corpus(n=10)
+    index = build(BruteForceIndex, keys, vectors)
+    index.add([keys[0]], [queries[0]], fingerprints=["v2"])
+    assert len(index) == 10
+    assert index.fingerprint(keys[0]) == "v2"
+    assert index.query(queries[0], k=1)[0] == (keys[0], pytest.approx(1.0, abs=1e-5))
+
+
+def test_mismatched_dimension_is_rejected():
+    index = build(BruteForceIndex, ["a"], [np.ones(DIM)])
+    with pytest.raises(ValueError):
+        index.add(["b"], [np.ones(DIM + 1)])
+
+
+def test_save_and_load_round_trip(tmp_path):
+    keys, vectors, queries = clustered_corpus()
+    ivf = build(IVFIndex, keys, vectors, n_lists=40, n_probe=8, min_train_size=256)
+    path = str(tmp_path / "index.npz")
+    ivf.save(path)
+    loaded = load_vector_index(path)
+    assert isinstance(loaded, IVFIndex) and loaded.is_trained
+    assert loaded.query(queries[0], k=10) == ivf.query(queries[0], k=10)
+    assert load_vector_index(str(tmp_path / "missing.npz")) is None
+
+
+def test_concurrent_saves_leave_one_complete_index(tmp_path):
+    keys, vectors, _ = clustered_corpus(n=300)
+    indexes = [build(BruteForceIndex, keys[:n], vectors[:n]) for n in (100, 200, 300)]
+    path = str(tmp_path / "index.npz")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        list(pool.map(lambda i: [indexes[i].save(path) for _ in range(5)], range(3)))
+
+    assert os.listdir(tmp_path) == ["index.npz"] # No temp files left behind
+    assert len(load_vector_index(path)) in (100, 200, 300)